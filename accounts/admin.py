@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import CustomUser
 from .forms import CustomUserCreationForm, CustomUserChangeForm
+from config.pagination import EstimatedCountPaginator
 
 class CustomUserAdmin(UserAdmin):
     add_form = CustomUserCreationForm
@@ -24,6 +25,9 @@ class CustomUserAdmin(UserAdmin):
     )
     search_fields = ('email',)
     ordering = ('email',)
+    date_hierarchy = 'date_joined'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 admin.site.register(CustomUser, CustomUserAdmin)
 
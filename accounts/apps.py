@@ -7,3 +7,7 @@ class AccountsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        """Connect the signal handlers."""
+        from . import signals  # noqa: F401
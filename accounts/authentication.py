@@ -0,0 +1,65 @@
+"""JWT authentication that avoids loading the user row on every request."""
+import time
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import (MISSING, SNAPSHOT_FIELDS, build_user, get_cached_snapshot,
+                    get_user_snapshot)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that builds the user from a cached snapshot.
+
+    The user fields come from, in order:
+
+    1. the per-process snapshot cache (``accounts.cache``);
+    2. the token's own claims, when it was issued less than
+       ``JWT_USER_CACHE_TIMEOUT`` seconds ago and so is no staler than a cached
+       snapshot would be (the refresh endpoint re-reads the user);
+    3. the database, after which the snapshot is cached.
+
+    The returned user has only the snapshot fields loaded; anything else is
+    fetched on first access.
+    """
+
+    def get_user(self, validated_token):
+        """Return the user the token was issued for."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        snapshot = self.get_known_snapshot(user_id, validated_token)
+        if snapshot is None:
+            snapshot = get_user_snapshot(user_id)
+        return self.user_from_snapshot(user_id, snapshot)
+
+    def get_known_snapshot(self, user_id, validated_token):
+        """Return the snapshot from the cache or the token's claims, or None if the database is needed."""
+        snapshot = get_cached_snapshot(user_id) or self.snapshot_from_claims(validated_token)
+        return {} if snapshot == MISSING else snapshot
+
+    @staticmethod
+    def user_from_snapshot(user_id, snapshot):
+        """Return the user for ``snapshot`` (falsy for unknown users) if it may authenticate."""
+        if not snapshot:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not snapshot["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return build_user(user_id, snapshot)
+
+    @staticmethod
+    def snapshot_from_claims(validated_token):
+        """Return the snapshot carried by a recently issued token, or None."""
+        if any(field not in validated_token for field in SNAPSHOT_FIELDS):
+            return None
+        issued_at = validated_token.get("iat")
+        if issued_at is None or time.time() - issued_at > settings.JWT_USER_CACHE_TIMEOUT:
+            return None
+        return {field: validated_token[field] for field in SNAPSHOT_FIELDS}
@@ -0,0 +1,178 @@
+"""Refresh-token blacklist backed by the shared cache.
+
+Revoking a token (logout, or rotation on refresh) marks its ``jti`` in the
+shared cache until the token expires and queues a ``RevokedToken`` row, which
+is written in batches of ``TOKEN_BLACKLIST_BATCH_SIZE`` or after
+``TOKEN_BLACKLIST_FLUSH_INTERVAL`` seconds, whichever comes first; a timer
+thread flushes a batch that is not filled in time.
+
+Checking a token asks, in order:
+
+1. the shared cache, which holds every revocation until the token expires;
+2. an in-process Bloom filter of the persisted revocations, which answers the
+   common "not revoked" case without a query;
+3. the database, only when the Bloom filter says "maybe".
+
+The Bloom filter is rebuilt from the table every
+``TOKEN_BLACKLIST_BLOOM_REFRESH`` seconds. Revocations made since then are
+covered by the cache, so none of the checks grow with the table size.
+
+When ``TOKEN_BLACKLIST_CACHE_ALIAS`` is a per-process cache (LocMem, the
+default outside production), other workers cannot see its marks, so
+revocations are written to the table at once and every check queries it.
+"""
+import atexit
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DatabaseError, connections
+from django.utils import timezone as django_timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from config.bloom import BloomFilter
+
+from .models import RevokedToken
+
+KEY_PREFIX = "blacklist:"
+
+_lock = threading.Lock()
+_pending = []
+_last_flush = time.monotonic()
+_timer = None
+_bloom_lock = threading.Lock()
+_bloom = None
+_bloom_built_at = 0.0
+
+
+def get_cache():
+    """Return the cache backend holding revoked token ids."""
+    return caches[settings.TOKEN_BLACKLIST_CACHE_ALIAS]
+
+
+def make_key(jti):
+    """Return the cache key for ``jti``."""
+    return f"{KEY_PREFIX}{jti}"
+
+
+def cache_is_shared():
+    """Return True when the blacklist cache is visible to every worker."""
+    return not isinstance(get_cache(), (LocMemCache, DummyCache))
+
+
+def revoke(token):
+    """Blacklist ``token`` (a refresh token) until it expires."""
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = datetime.fromtimestamp(token["exp"], tz=timezone.utc)
+    timeout = max(int(token["exp"] - time.time()), 1)
+    get_cache().set(make_key(jti), True, timeout)
+    revoked = RevokedToken(jti=jti, expires_at=expires_at)
+    if not cache_is_shared():
+        RevokedToken.objects.bulk_create([revoked], ignore_conflicts=True)
+        return
+
+    with _lock:
+        _pending.append(revoked)
+        due = (
+            len(_pending) >= settings.TOKEN_BLACKLIST_BATCH_SIZE
+            or time.monotonic() - _last_flush >= settings.TOKEN_BLACKLIST_FLUSH_INTERVAL
+        )
+        if not due:
+            _schedule_flush()
+    if due:
+        flush()
+
+
+def is_revoked(jti):
+    """Return True if the token ``jti`` has been blacklisted."""
+    if get_cache().get(make_key(jti)):
+        return True
+    if cache_is_shared() and jti not in _get_bloom():
+        return False
+    return RevokedToken.objects.filter(jti=jti).exists()
+
+
+def flush():
+    """Write the queued revocations to the database in one batch."""
+    global _last_flush
+    with _lock:
+        batch = _pending[:]
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if batch:
+        RevokedToken.objects.bulk_create(batch, ignore_conflicts=True)
+    return len(batch)
+
+
+def _schedule_flush():
+    """Start a timer flushing the queue in TOKEN_BLACKLIST_FLUSH_INTERVAL seconds, unless one is running; hold _lock."""
+    global _timer
+    if _timer is None or not _timer.is_alive():
+        _timer = threading.Timer(settings.TOKEN_BLACKLIST_FLUSH_INTERVAL, _flush_in_background)
+        _timer.daemon = True
+        _timer.start()
+
+
+def _flush_in_background():
+    """Flush from the timer thread, then close the connection it opened."""
+    try:
+        _flush_at_exit()
+    finally:
+        connections.close_all()
+
+
+def prune(batch_size=10000):
+    """Delete revocations of tokens that have expired; return how many were deleted."""
+    deleted = 0
+    expired = RevokedToken.objects.filter(expires_at__lt=django_timezone.now())
+    while True:
+        ids = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += RevokedToken.objects.filter(pk__in=ids).delete()[0]
+
+
+def _get_bloom():
+    """Return the Bloom filter of persisted revocations, rebuilding it when due."""
+    global _bloom, _bloom_built_at
+    if _bloom is not None and time.monotonic() - _bloom_built_at < settings.TOKEN_BLACKLIST_BLOOM_REFRESH:
+        return _bloom
+    # One thread rebuilds; the others keep using the previous filter meanwhile.
+    if not _bloom_lock.acquire(blocking=_bloom is None):
+        return _bloom
+    try:
+        if _bloom is None or time.monotonic() - _bloom_built_at >= settings.TOKEN_BLACKLIST_BLOOM_REFRESH:
+            live = RevokedToken.objects.filter(expires_at__gte=django_timezone.now())
+            jtis = list(live.values_list("jti", flat=True).iterator())
+            bloom = BloomFilter(max(2 * len(jtis), 10000), settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE)
+            bloom.update(jtis)
+            _bloom, _bloom_built_at = bloom, time.monotonic()
+    finally:
+        _bloom_lock.release()
+    return _bloom
+
+
+def _flush_at_exit():
+    """Write what is still queued when the process exits, if the database is reachable."""
+    try:
+        flush()
+    except DatabaseError:
+        pass
+
+
+def reset():
+    """Forget the queued revocations, the flush timer and the Bloom filter in this process."""
+    global _bloom, _timer
+    with _lock:
+        _pending.clear()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    _bloom = None
+
+
+atexit.register(_flush_at_exit)
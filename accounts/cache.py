@@ -0,0 +1,74 @@
+"""Per-process cache of the user fields checked on every API call.
+
+Authenticating a JWT used to load the whole user row on every request. The
+fields authentication and permission checks need are small and rarely change,
+so they are kept in a bounded, short-TTL cache in each process. A user is read
+from the database at most once per ``JWT_USER_CACHE_TIMEOUT`` seconds per
+process.
+
+Saving or deleting a user replaces its entry in the current process right
+away. Other processes pick up the change when their entry expires, so the TTL
+bounds how long a deactivated or demoted user keeps their old access there.
+"""
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+
+# Fields kept per user, next to the primary key. The rest are deferred on
+# users built from a snapshot and loaded on first access.
+SNAPSHOT_FIELDS = ("email", "is_active", "is_staff", "is_superuser")
+
+# Stored in place of a snapshot when the user has been deleted.
+MISSING = "__missing__"
+
+_snapshots = TTLCache(maxsize=settings.JWT_USER_CACHE_MAX_ENTRIES, ttl=settings.JWT_USER_CACHE_TIMEOUT)
+_lock = threading.Lock()
+
+
+def snapshot_from_instance(user):
+    """Return the cacheable snapshot of a user instance."""
+    return {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+
+
+def build_user(user_id, snapshot):
+    """Return a user instance holding ``snapshot``, with every other field deferred."""
+    User = get_user_model()
+    field_names = [User._meta.pk.attname, *SNAPSHOT_FIELDS]
+    values = [user_id, *(snapshot[field] for field in SNAPSHOT_FIELDS)]
+    return User.from_db(DEFAULT_DB_ALIAS, field_names, values)
+
+
+def get_cached_snapshot(user_id):
+    """Return the cached snapshot of ``user_id``, ``MISSING``, or None when not cached."""
+    with _lock:
+        return _snapshots.get(user_id)
+
+
+def get_user_snapshot(user_id):
+    """Return the snapshot of ``user_id``, reading it from the database on a miss; None if no such user."""
+    snapshot = get_cached_snapshot(user_id)
+    if snapshot is None:
+        snapshot = get_user_model().objects.filter(pk=user_id).values(*SNAPSHOT_FIELDS).first() or MISSING
+        store_snapshot(user_id, snapshot)
+    return None if snapshot == MISSING else snapshot
+
+
+def store_snapshot(user_id, snapshot):
+    """Cache ``snapshot`` (or ``MISSING``) for ``user_id``."""
+    with _lock:
+        _snapshots[user_id] = snapshot
+
+
+def invalidate_user(user_id):
+    """Drop the cached snapshot of ``user_id``."""
+    with _lock:
+        _snapshots.pop(user_id, None)
+
+
+def clear():
+    """Drop every cached snapshot in this process."""
+    with _lock:
+        _snapshots.clear()
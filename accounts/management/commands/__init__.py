@@ -0,0 +1 @@
+"""Accounts management commands."""
@@ -0,0 +1,22 @@
+"""Delete blacklist entries of refresh tokens that have expired."""
+from django.core.management.base import BaseCommand
+
+from accounts import blacklist
+
+
+class Command(BaseCommand):
+    """Prune expired refresh-token revocations."""
+
+    help = (
+        "Delete RevokedToken rows whose tokens have expired and would be refused anyway. "
+        "Schedule it (e.g. hourly from cron) to keep the blacklist table small."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("--batch-size", type=int, default=10000, help="Rows deleted per statement.")
+
+    def handle(self, *args, **options):
+        """Prune the table."""
+        deleted = blacklist.prune(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired revocations."))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='date_joined',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser,PermissionsMixin
 from .managers import CustomUserManager
 
@@ -13,7 +14,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     last_name = models.CharField(max_length=30, blank=True)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
-    date_joined = models.DateTimeField(auto_now_add=True)
+    date_joined = models.DateTimeField(auto_now_add=True, db_index=True)
     is_superuser = models.BooleanField(default=False)
 
     objects = CustomUserManager()
@@ -36,3 +37,19 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         """
         return self.is_superuser
 
+
+
+class RevokedToken(models.Model):
+    """
+    A refresh token revoked before it expired, identified by its ``jti``.
+
+    Rows are written in batches by ``accounts.blacklist`` and pruned once the
+    token would have expired anyway.
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.jti
@@ -1,7 +1,13 @@
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.settings import api_settings
+from config.middleware import TimedSerializerMixin
 from .models import CustomUser
+from .tokens import RefreshToken, add_user_claims
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for CustomUser model.
     """
@@ -25,3 +31,43 @@ class CustomUserSerializer(serializers.ModelSerializer):
             instance.set_password(password)
         return super().update(instance, validated_data)
 
+
+
+class TokenObtainPairSerializer(TimedSerializerMixin, jwt_serializers.TokenObtainPairSerializer):
+    """Token pair serializer issuing tokens with the user claims."""
+
+    token_class = RefreshToken
+
+
+class TokenRefreshSerializer(TimedSerializerMixin, jwt_serializers.TokenRefreshSerializer):
+    """
+    Refresh serializer that re-reads the user.
+
+    The new access token carries the user's current claims and a fresh
+    ``iat``, so ``CachedJWTAuthentication`` can trust its claims for a while.
+    Refreshing is refused once the user is deactivated or deleted.
+    """
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}
+        ).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed('No active account found for this token', code='no_active_account')
+
+        add_user_claims(refresh, user)
+        access = refresh.access_token
+        access.set_iat()
+        data = {'access': str(access)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
@@ -0,0 +1,32 @@
+"""Signal handlers for the accounts app."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import (MISSING, invalidate_user, snapshot_from_instance,
+                    store_snapshot)
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+def refresh_user_snapshot(sender, instance, **kwargs):
+    """
+    Replace the cached snapshot when a user is saved.
+
+    The old entry is dropped at once and the new one cached once the
+    transaction commits. Caching it, rather than leaving the slot empty, stops
+    claims in recently issued tokens from outranking a change to
+    ``is_active``/``is_staff``.
+    """
+    user_id = instance.pk
+    snapshot = snapshot_from_instance(instance)
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: store_snapshot(user_id, snapshot))
+
+
+@receiver(post_delete, sender=CustomUser)
+def forget_user_snapshot(sender, instance, **kwargs):
+    """Remember a deleted user as missing so its tokens stop working."""
+    user_id = instance.pk
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: store_snapshot(user_id, MISSING))
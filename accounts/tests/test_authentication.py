@@ -0,0 +1,116 @@
+"""Cached JWT authentication tests."""
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import cache
+from accounts.tokens import RefreshToken
+from license.cache import get_cache as get_license_cache
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty user snapshot and license caches."""
+    cache.clear()
+    get_license_cache().clear()
+    yield
+    cache.clear()
+    get_license_cache().clear()
+
+
+def _client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def _whoami(client):
+    """Hit an authenticated endpoint that runs one query, or none once cached."""
+    return client.get(reverse("license_detail", args=["FAKE-1"]))
+
+
+def test_tokens_carry_user_claims(user):
+    """Test issued tokens carry the user claims."""
+    access = RefreshToken.for_user(user).access_token
+    assert access["email"] == user.email
+    assert access["is_active"] is True
+    assert access["is_staff"] is False
+
+
+def test_fresh_token_claims_skip_database(user, django_assert_num_queries):
+    """Test a just-issued token authenticates without reading the user."""
+    client = _client(RefreshToken.for_user(user).access_token)
+    with django_assert_num_queries(1):  # The license lookup only.
+        assert _whoami(client).status_code == 404
+
+
+def test_snapshot_cached_after_first_lookup(user, django_assert_num_queries):
+    """Test a token without claims reads the user once per process."""
+    client = _client(AccessToken.for_user(user))
+    with django_assert_num_queries(2):
+        _whoami(client)
+    with django_assert_num_queries(0):
+        _whoami(client)
+
+
+def test_user_is_built_with_deferred_fields(user):
+    """Test the snapshot user lazily loads fields outside the snapshot."""
+    snapshot = cache.get_user_snapshot(user.pk)
+    built = cache.build_user(user.pk, snapshot)
+    assert built.email == user.email
+    assert "first_name" in built.get_deferred_fields()
+    assert built.check_password("testpassword")
+
+
+def test_deactivation_overrides_fresh_claims(user, django_capture_on_commit_callbacks):
+    """Test deactivating a user rejects tokens still carrying is_active=True."""
+    client = _client(RefreshToken.for_user(user).access_token)
+    assert _whoami(client).status_code == 404
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.is_active = False
+        user.save()
+    assert _whoami(client).status_code == 401
+
+
+def test_deleted_user_is_rejected(user, django_capture_on_commit_callbacks):
+    """Test tokens of a deleted user stop working."""
+    client = _client(RefreshToken.for_user(user).access_token)
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+    assert _whoami(client).status_code == 401
+
+
+def test_stale_claims_are_not_trusted(user, settings, django_assert_num_queries):
+    """Test claims older than the cache timeout fall back to the database."""
+    access = RefreshToken.for_user(user).access_token
+    access["iat"] = int(time.time()) - settings.JWT_USER_CACHE_TIMEOUT - 1
+    client = _client(access)
+    with django_assert_num_queries(2):
+        assert _whoami(client).status_code == 404
+
+
+def test_refresh_restamps_claims(user, client):
+    """Test the refresh endpoint issues an access token with current claims."""
+    refresh = RefreshToken.for_user(user)
+    user.is_staff = True
+    user.save()
+
+    response = client.post(reverse("token_refresh"), {"refresh": str(refresh)})
+    assert response.status_code == 200
+    assert AccessToken(response.json()["access"])["is_staff"] is True
+
+
+def test_refresh_refused_for_inactive_user(user, client):
+    """Test a deactivated user cannot refresh."""
+    refresh = RefreshToken.for_user(user)
+    user.is_active = False
+    user.save()
+
+    response = client.post(reverse("token_refresh"), {"refresh": str(refresh)})
+    assert response.status_code == 401
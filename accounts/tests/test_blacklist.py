@@ -0,0 +1,119 @@
+"""Refresh-token blacklist tests."""
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts import blacklist
+from accounts.models import RevokedToken
+from accounts.tokens import RefreshToken
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_blacklist():
+    """Start every test with an empty blacklist cache, queue and Bloom filter."""
+    blacklist.reset()
+    blacklist.get_cache().clear()
+    yield
+    blacklist.reset()
+    blacklist.get_cache().clear()
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Keep the blacklist in a cache shared between processes, as in production."""
+    settings.CACHES = {
+        **settings.CACHES,
+        "blacklist": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "blacklist"),
+        },
+    }
+    settings.TOKEN_BLACKLIST_CACHE_ALIAS = "blacklist"
+    blacklist.reset()
+
+
+@pytest.fixture
+def refresh(user):
+    """Return a refresh token for ``user``."""
+    return RefreshToken.for_user(user)
+
+
+def _logout(user, refresh):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client.post(reverse("logout"), {"refresh_token": str(refresh)}, format="json")
+
+
+def test_logout_blocks_refresh(user, refresh):
+    """Test a logged-out refresh token can no longer be used."""
+    assert _logout(user, refresh).status_code == 205
+
+    response = APIClient().post(reverse("token_refresh"), {"refresh": str(refresh)}, format="json")
+    assert response.status_code == 401
+    assert _logout(user, refresh).status_code == 400
+
+
+def test_unrevoked_check_skips_database(shared_cache, refresh, django_assert_num_queries):
+    """Test the Bloom filter answers "not revoked" without a query once built."""
+    blacklist.is_revoked("warm-up")
+    with django_assert_num_queries(0):
+        assert not blacklist.is_revoked(refresh["jti"])
+
+
+def test_revocations_persist_in_batches(shared_cache, settings, user):
+    """Test revocations are queued until a batch is full."""
+    settings.TOKEN_BLACKLIST_BATCH_SIZE = 3
+    settings.TOKEN_BLACKLIST_FLUSH_INTERVAL = 3600
+    blacklist.flush()
+    tokens = [RefreshToken.for_user(user) for _ in range(3)]
+
+    for token in tokens[:2]:
+        token.blacklist()
+    assert RevokedToken.objects.count() == 0
+    tokens[2].blacklist()
+    assert RevokedToken.objects.count() == 3
+
+
+def test_persisted_revocation_found_after_cache_loss(shared_cache, refresh):
+    """Test a revocation evicted from the cache is still found via the Bloom filter and the table."""
+    refresh.blacklist()
+    blacklist.flush()
+    blacklist.get_cache().clear()
+    blacklist.reset()
+    assert blacklist.is_revoked(refresh["jti"])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_lone_revocation_flushed_by_timer(shared_cache, settings, refresh):
+    """Test a revocation that does not fill a batch is written after the flush interval."""
+    settings.TOKEN_BLACKLIST_FLUSH_INTERVAL = 0.5
+    blacklist.flush()
+
+    refresh.blacklist()
+    blacklist._timer.join(timeout=5)
+
+    assert RevokedToken.objects.filter(jti=refresh["jti"]).exists()
+
+
+def test_local_cache_writes_revocations_at_once(refresh, django_assert_num_queries):
+    """Test a per-process cache is not trusted: revocations are stored and checked in the table."""
+    refresh.blacklist()
+    assert RevokedToken.objects.filter(jti=refresh["jti"]).exists()
+
+    blacklist.get_cache().clear()
+    with django_assert_num_queries(1):
+        assert blacklist.is_revoked(refresh["jti"])
+
+
+def test_prune_deletes_expired(refresh):
+    """Test pruning removes only revocations of expired tokens."""
+    RevokedToken.objects.create(jti="expired", expires_at=timezone.now() - timedelta(minutes=1))
+    RevokedToken.objects.create(jti="live", expires_at=timezone.now() + timedelta(days=1))
+    call_command("prune_token_blacklist")
+    assert list(RevokedToken.objects.values_list("jti", flat=True)) == ["live"]
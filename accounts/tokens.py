@@ -0,0 +1,42 @@
+"""JWT tokens carrying the user fields API views need."""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from . import blacklist as token_blacklist
+from .cache import SNAPSHOT_FIELDS
+
+# User fields copied into every token, next to the user id.
+USER_CLAIMS = SNAPSHOT_FIELDS
+
+
+def add_user_claims(token, user):
+    """Copy ``USER_CLAIMS`` from ``user`` into ``token`` and return it."""
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class RefreshToken(tokens.RefreshToken):
+    """
+    Refresh token with the user claims, checked against ``accounts.blacklist``.
+
+    Access tokens derived from it (``refresh.access_token``, including via
+    the refresh endpoint) inherit the claims.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        """Return a refresh token for ``user`` with the user claims added."""
+        return add_user_claims(super().for_user(user), user)
+
+    def verify(self):
+        """Verify the token, refusing it once it has been blacklisted."""
+        super().verify()
+        if token_blacklist.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """Blacklist this token until it expires."""
+        token_blacklist.revoke(self)
@@ -3,8 +3,8 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 from .serializers import CustomUserSerializer
+from .tokens import RefreshToken
 from django.contrib.auth import get_user_model, authenticate
 
 class RegisterView(APIView):
@@ -1,6 +1,47 @@
+"""Admin for driver's license applications and their daily counts."""
 from django.contrib import admin
 
-# Register your models here.
-from .models import DriversLicenseApplication 
+from config.pagination import EstimatedCountPaginator
 
-admin.site.register(DriversLicenseApplication)
+from .models import ApplicationDailyCount, DriversLicenseApplication
+
+
+@admin.register(DriversLicenseApplication)
+class DriversLicenseApplicationAdmin(admin.ModelAdmin):
+    """Applications, with their applicant and license joined in."""
+
+    list_display = (
+        'application_id', 'nationalId', 'license', 'application_type', 'status', 'state', 'center_locations',
+        'applied_at',
+    )
+    list_filter = ('status', 'application_type')
+    list_select_related = ('nationalId', 'license')
+    autocomplete_fields = ('nationalId',)
+    raw_id_fields = ('license', 'claimed_by')
+    # Exact id lookups only; the other text columns are not indexed for search.
+    search_fields = ('=application_id',)
+    date_hierarchy = 'applied_at'
+    ordering = ('-applied_at', '-application_id')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(ApplicationDailyCount)
+class ApplicationDailyCountAdmin(admin.ModelAdmin):
+    """Read-only view of the rollup; the counts are maintained by ``application.stats``."""
+
+    list_display = ('day', 'state', 'center_locations', 'status', 'count')
+    list_filter = ('status',)
+    date_hierarchy = 'day'
+
+    def has_add_permission(self, request):
+        """Refuse to add rows by hand."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Refuse to edit counts by hand."""
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """Refuse to delete rows by hand."""
+        return False
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ApplicationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'application'
+
+    def ready(self):
+        """Keep the application counts up to date as applications are saved and deleted."""
+        from . import stats
+
+        stats.connect()
@@ -0,0 +1,71 @@
+"""
+Claiming applications for processing at a center.
+
+A clerk claims the next applications waiting at their center; each claimed
+application moves from its pending status to the matching processing status
+(``Pending`` -> ``Processing``, ``Renewal Pending`` -> ``Renewal Processing``,
+...) and is leased to the clerk until ``lease_expires_at``. An application
+whose lease ran out while still processing is claimable again, expired leases
+first, so work abandoned by a clerk is picked up by the next one.
+
+Concurrent clerks never claim the same application: locked rows are skipped
+(``SELECT ... FOR UPDATE SKIP LOCKED``) where the database supports it, and
+otherwise each claim is a conditional update that only one clerk can win.
+Moving an application on with :func:`application.transitions.transition` ends
+its lease.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import stats
+from .models import DriversLicenseApplication
+from .services import ApplicationError
+
+# Pending status -> the processing status a claim moves it to.
+CLAIMS = {
+    'Pending': 'Processing',
+    'Renewal Pending': 'Renewal Processing',
+    'Reissue Pending': 'Reissue Processing',
+}
+
+
+def claim(center, user, limit, status='Pending', lease=None):
+    """
+    Lease up to ``limit`` applications in ``status`` at ``center`` to ``user`` and return them.
+
+    Expired leases are reclaimed first, then the oldest pending applications
+    (by ``applied_at``). ``lease`` is in seconds and defaults to
+    ``APPLICATION_CLAIM_LEASE``. Raises ``ApplicationError`` for a status that
+    cannot be claimed.
+    """
+    if status not in CLAIMS:
+        raise ApplicationError(f"Applications in '{status}' cannot be claimed.")
+
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=settings.APPLICATION_CLAIM_LEASE if lease is None else lease)
+    at_center = DriversLicenseApplication.objects.filter(center_locations=center).order_by('applied_at', 'pk')
+    pending = at_center.filter(status=status)
+    candidates = [at_center.filter(status=CLAIMS[status], lease_expires_at__lt=now), pending]
+    claimed = dict(status=CLAIMS[status], claimed_by=user, lease_expires_at=expires_at)
+
+    ids, moved = [], []
+    with transaction.atomic():
+        for queryset in candidates:
+            if connection.features.has_select_for_update_skip_locked:
+                taken = list(
+                    queryset.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit - len(ids)]
+                )
+                DriversLicenseApplication.objects.filter(pk__in=taken).update(**claimed)
+            else:
+                taken = [
+                    pk for pk in queryset.values_list('pk', flat=True)[:limit - len(ids)]
+                    if queryset.filter(pk=pk).update(**claimed)
+                ]
+            ids += taken
+            if queryset is pending:
+                moved = taken
+        stats.record_transition(moved, status, CLAIMS[status])
+    return list(DriversLicenseApplication.objects.filter(pk__in=ids).order_by('applied_at', 'pk'))
@@ -0,0 +1,79 @@
+"""Streaming export of driver's license applications.
+
+Rows are read with ``.values()`` through a server-side cursor
+(``iterator(chunk_size=...)``) and encoded one at a time, so memory use stays
+constant no matter how many applications are exported.
+"""
+import csv
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import DriversLicenseApplication
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+EXPORT_FIELDS = [field.attname for field in DriversLicenseApplication._meta.concrete_fields]
+
+_encoder = DjangoJSONEncoder()
+
+
+def export_queryset(state=None, status=None, application_type=None, applied_after=None, applied_before=None):
+    """Return the filtered ``.values()`` queryset to export."""
+    queryset = DriversLicenseApplication.objects.all()
+    if state:
+        queryset = queryset.filter(state=state)
+    if status:
+        queryset = queryset.filter(status=status)
+    if application_type:
+        queryset = queryset.filter(application_type=application_type)
+    if applied_after:
+        queryset = queryset.filter(applied_at__gte=applied_after)
+    if applied_before:
+        queryset = queryset.filter(applied_at__lt=applied_before)
+    return queryset.order_by().values(*EXPORT_FIELDS)
+
+
+def iter_rows(queryset, chunk_size=None):
+    """Yield rows from ``queryset`` using a server-side cursor."""
+    return queryset.iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+
+def iter_ndjson(rows):
+    """Yield one JSON document per row, newline terminated."""
+    for row in rows:
+        yield _encoder.encode(row) + "\n"
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    """Yield a header line followed by one CSV line per row."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([_csv_value(row[field]) for field in EXPORT_FIELDS])
+
+
+def _csv_value(value):
+    """Render ``value`` the same way the NDJSON export does."""
+    if value is None:
+        return ""
+    if isinstance(value, (str, int, bool)):
+        return value
+    return _encoder.default(value)
+
+
+def stream_export(export_format, rows):
+    """Return the line iterator for ``export_format``."""
+    if export_format == "csv":
+        return iter_csv(rows)
+    return iter_ndjson(rows)
@@ -0,0 +1 @@
+"""Application management."""
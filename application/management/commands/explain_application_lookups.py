@@ -0,0 +1,161 @@
+"""Show query plans and timings for the renewal/reissue lookups."""
+import random
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+
+from application.models import IN_FLIGHT_STATUSES, DriversLicenseApplication
+from license.models import License
+from nationalId.models import NationalId
+
+# Index added for the renewal/reissue lookups; dropped temporarily for the
+# "before" run. The (nationalId, license) lookup is served by the foreign key
+# indexes.
+LOOKUP_INDEXES = ["unique_in_flight_application_per_license"]
+
+STATUSES = [value for value, _ in DriversLicenseApplication.STATUS_CHOICES]
+
+
+class _Rollback(Exception):
+    """Raised to roll back the temporary index drop and the seeded rows."""
+
+
+class Command(BaseCommand):
+    """Explain the renewal/reissue lookups with and without their indexes."""
+
+    help = (
+        "Print the plans and timings of the renewal/reissue lookups, first without and then with the "
+        "in-flight constraint. Use --seed to add rows beforehand. Everything, seeded rows included, is "
+        "rolled back at the end. The index drop locks the applications table, so the command only runs "
+        "with DEBUG on unless --force is given."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("--seed", type=int, default=0, help="Number of applications to add before explaining.")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Rows per bulk insert while seeding.")
+        parser.add_argument("--repeat", type=int, default=200, help="Executions per lookup when timing.")
+        parser.add_argument("--force", action="store_true", help="Run even when DEBUG is off.")
+
+    def handle(self, *args, **options):
+        """Seed if asked, explain before and after, then roll everything back."""
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError(
+                "This command locks the applications table while it runs; use a copy of the database with "
+                "DEBUG on, or pass --force."
+            )
+        try:
+            with transaction.atomic():
+                self._explain(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _explain(self, options):
+        """Seed if asked, then explain before and after."""
+        if options["seed"]:
+            self._seed(options["seed"], options["batch_size"])
+
+        sample = DriversLicenseApplication.objects.filter(license__isnull=False).order_by("?").first()
+        if sample is None:
+            raise CommandError("No applications with a license to sample; run with --seed N.")
+
+        total = DriversLicenseApplication.objects.count()
+        self.stdout.write(f"{total} applications, {connection.vendor} backend\n")
+        lookups = self._lookups(sample.nationalId_id, sample.license_id)
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Before (without lookup indexes)"))
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for name in LOOKUP_INDEXES:
+                        cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+                self._report(lookups, options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(self.style.MIGRATE_HEADING("After (with lookup indexes)"))
+        self._report(lookups, options["repeat"])
+
+    def _lookups(self, national_id, license_id):
+        """Return the querysets the renew and reissue services run."""
+        return {
+            "any application for license": DriversLicenseApplication.objects.filter(
+                nationalId=national_id, license=license_id
+            ),
+            "in-flight for license": DriversLicenseApplication.objects.filter(
+                license=license_id, status__in=IN_FLIGHT_STATUSES
+            ),
+        }
+
+    def _report(self, lookups, repeat):
+        """Print the plan and mean execution time of each lookup."""
+        for name, queryset in lookups.items():
+            started = time.perf_counter()
+            for _ in range(repeat):
+                queryset.exists()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+            self.stdout.write(f"{name}: {elapsed_ms:.3f} ms/query")
+            self.stdout.write(queryset.explain())
+            self.stdout.write("")
+
+    def _seed(self, count, batch_size):
+        """
+        Add ``count`` applications, with one license per four applications.
+
+        The rows bypass model signals (statistics, blob reference counts),
+        which is only safe because the caller rolls them back.
+        """
+        rng = random.Random(0)
+        first_id = (NationalId.objects.aggregate(top=Max("idNo"))["top"] or 0) + 1
+        license_count = max(count // 4, 1)
+        today = date.today()
+        self.stdout.write(f"Seeding {license_count} national ids and licenses and {count} applications...")
+
+        for start in range(0, license_count, batch_size):
+            ids = range(first_id + start, first_id + min(start + batch_size, license_count))
+            NationalId.objects.bulk_create(
+                [NationalId(idNo=id_no, firstName=f"Seed{id_no}", DOB=date(1990, 1, 1)) for id_no in ids]
+            )
+            License.objects.bulk_create([
+                License(
+                    IdNo_id=id_no,
+                    licenseId=f"SEED{id_no}",
+                    issue_date=today - timedelta(days=rng.randint(0, 3650)),
+                    expiry_date=today + timedelta(days=rng.randint(-365, 3650)),
+                    passport_photo="passport_photos/seed.jpg",
+                )
+                for id_no in ids
+            ])
+
+        licenses = dict(
+            License.objects.filter(licenseId__startswith="SEED", IdNo_id__gte=first_id).values_list("IdNo_id", "pk")
+        )
+        id_nos = list(licenses)
+        for start in range(0, count, batch_size):
+            batch = []
+            for _ in range(min(batch_size, count - start)):
+                id_no = rng.choice(id_nos)
+                batch.append(DriversLicenseApplication(
+                    nationalId_id=id_no,
+                    license_id=licenses[id_no],
+                    application_type=rng.choice(["New", "Renewal", "Reissue"]),
+                    # In-flight statuses are left out so seeding never trips the constraint.
+                    status=rng.choice([status for status in STATUSES if status not in IN_FLIGHT_STATUSES]),
+                    certificate_number=rng.randint(1, 10 ** 6),
+                    local_government_area="Seed LGA",
+                    state="Seed State",
+                    center_locations="Seed Center",
+                    email="seed@example.com",
+                    phoneNumber="+0000000000",
+                ))
+            DriversLicenseApplication.objects.bulk_create(batch)
+
+        # Let the planner see the seeded volume.
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(DriversLicenseApplication._meta.db_table)}")
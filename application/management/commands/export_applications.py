@@ -0,0 +1,45 @@
+"""Stream driver's license applications to a file or stdout."""
+from django.core.management.base import BaseCommand, CommandError
+
+from application.exports import export_queryset, iter_rows, stream_export
+from application.serializers import ApplicationExportFilterSerializer
+
+
+class Command(BaseCommand):
+    """Export applications as NDJSON or CSV with constant memory use."""
+
+    help = "Export driver's license applications as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("--format", dest="export_format", default="ndjson", help="ndjson (default) or csv.")
+        parser.add_argument("--output", default="-", help="File to write to, '-' for stdout (default).")
+        parser.add_argument("--state")
+        parser.add_argument("--status")
+        parser.add_argument("--application-type", dest="application_type")
+        parser.add_argument("--applied-after", dest="applied_after", help="ISO date or datetime, inclusive.")
+        parser.add_argument("--applied-before", dest="applied_before", help="ISO date or datetime, exclusive.")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Rows fetched per round trip.")
+
+    def handle(self, *args, **options):
+        """Validate the filters and stream the export."""
+        data = {
+            key: options[key]
+            for key in ("export_format", "state", "status", "application_type", "applied_after", "applied_before")
+            if options[key] is not None
+        }
+        filters = ApplicationExportFilterSerializer(data=data)
+        if not filters.is_valid():
+            raise CommandError(filters.errors)
+        validated = dict(filters.validated_data)
+        export_format = validated.pop("export_format")
+
+        rows = iter_rows(export_queryset(**validated), chunk_size=options["chunk_size"])
+        output = options["output"]
+        stream = self.stdout if output == "-" else open(output, "w", newline="")
+        try:
+            for line in stream_export(export_format, rows):
+                stream.write(line)
+        finally:
+            if stream is not self.stdout:
+                stream.close()
@@ -0,0 +1,22 @@
+"""Recompute the application counts behind the stats endpoint."""
+from django.core.management.base import BaseCommand
+
+from application import stats
+
+
+class Command(BaseCommand):
+    """Rebuild the application daily counts from the applications."""
+
+    help = (
+        "Recompute the application counts by day, state, center and status from the applications, "
+        "--days days per transaction. Run it once after migrating, and after bulk changes that bypass model signals."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("--days", type=int, default=31, help="Days of applications recounted per transaction.")
+
+    def handle(self, *args, **options):
+        """Rebuild the counts."""
+        written = stats.rebuild(days_per_chunk=options["days"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} application counts."))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.8 on 2026-10-18 06:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application', '0004_rename_user_driverslicenseapplication_nationalid'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='driverslicenseapplication',
+            index=models.Index(fields=['nationalId', 'license', 'application_type', 'status'], name='application_lookup_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='driverslicenseapplication',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['Renewal Pending', 'Renewal Processing', 'Reissue Pending', 'Reissue Processing'])), fields=('license',), name='unique_in_flight_application_per_license'),
+        ),
+    ]
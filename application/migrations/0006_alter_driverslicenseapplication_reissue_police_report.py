@@ -0,0 +1,19 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:27
+
+from django.db import migrations, models
+import uploads.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application', '0005_application_lookup_idx_and_in_flight_constraint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='driverslicenseapplication',
+            name='reissue_police_report',
+            field=models.FileField(blank=True, null=True, storage=uploads.storage.get_blob_storage, upload_to='police_reports/'),
+        ),
+    ]
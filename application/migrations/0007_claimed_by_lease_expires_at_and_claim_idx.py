@@ -0,0 +1,30 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('application', '0006_alter_driverslicenseapplication_reissue_police_report'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='driverslicenseapplication',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_applications', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='driverslicenseapplication',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='driverslicenseapplication',
+            index=models.Index(fields=['center_locations', 'status', 'applied_at'], name='application_claim_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application', '0007_claimed_by_lease_expires_at_and_claim_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='driverslicenseapplication',
+            index=models.Index(fields=['applied_at', 'application_id'], name='application_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='driverslicenseapplication',
+            index=models.Index(fields=['state', 'local_government_area', 'applied_at', 'application_id'], name='application_region_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='driverslicenseapplication',
+            index=models.Index(fields=['status', 'application_type', 'applied_at', 'application_id'], name='application_status_keyset_idx'),
+        ),
+    ]
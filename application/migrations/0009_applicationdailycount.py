@@ -0,0 +1,28 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application', '0008_application_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('state', models.CharField(max_length=255)),
+                ('center_locations', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Processing', 'Processing'), ('Approved', 'Approved'), ('Ready for Printing', 'Ready for Printing'), ('Renewal Pending', 'Renewal Pending'), ('Renewal Processing', 'Renewal Processing'), ('Renewed', 'Renewed'), ('Reissue Pending', 'Reissue Pending'), ('Reissue Processing', 'Reissue Processing'), ('Reissued', 'Reissued')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='applicationdailycount',
+            constraint=models.UniqueConstraint(fields=('day', 'state', 'center_locations', 'status'), name='unique_application_daily_count'),
+        ),
+    ]
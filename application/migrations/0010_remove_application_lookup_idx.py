@@ -0,0 +1,17 @@
+# Generated by Django 4.2.8 on 2026-10-18 08:11
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application', '0009_applicationdailycount'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='driverslicenseapplication',
+            name='application_lookup_idx',
+        ),
+    ]
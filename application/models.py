@@ -1,11 +1,23 @@
 # models.py
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from nationalId.models import NationalId
 from license.models import License
+from uploads.storage import get_blob_storage
 import uuid
 
+# Renewal and reissue statuses that count as "in progress"; a license can
+# have at most one application in any of them at a time.
+IN_FLIGHT_STATUSES = [
+    'Renewal Pending',
+    'Renewal Processing',
+    'Reissue Pending',
+    'Reissue Processing',
+]
+
 class DriversLicenseApplication(models.Model):
+
     APPLICATION_TYPE_CHOICES = [
         ('New', 'New Application'),
         ('Renewal', 'Renewal Application'),
@@ -47,8 +59,75 @@ class DriversLicenseApplication(models.Model):
     reissue_applied_at = models.DateTimeField(blank=True, null=True)
     reissue_approved_at = models.DateTimeField(blank=True, null=True)
     reissue_reason = models.TextField(blank=True, null=True)
-    reissue_police_report = models.FileField(upload_to='police_reports/', blank=True, null=True)
+    reissue_police_report = models.FileField(
+        upload_to='police_reports/', storage=get_blob_storage, blank=True, null=True,
+    )
+
+    # Set when a clerk claims the application for processing (see application.claims)
+    claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='claimed_applications'
+    )
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        """Claim and listing indexes, and at most one in-flight application per license."""
+
+        indexes = [
+            models.Index(
+                fields=['center_locations', 'status', 'applied_at'],
+                name='application_claim_idx',
+            ),
+            # Keyset pagination of the staff listing (see ApplicationListView):
+            # unfiltered, by region, and by status and type.
+            models.Index(
+                fields=['applied_at', 'application_id'],
+                name='application_keyset_idx',
+            ),
+            models.Index(
+                fields=['state', 'local_government_area', 'applied_at', 'application_id'],
+                name='application_region_keyset_idx',
+            ),
+            models.Index(
+                fields=['status', 'application_type', 'applied_at', 'application_id'],
+                name='application_status_keyset_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['license'],
+                condition=models.Q(status__in=IN_FLIGHT_STATUSES),
+                name='unique_in_flight_application_per_license',
+            ),
+        ]
 
     def __str__(self):
         return str(self.application_id)
 
+
+class ApplicationDailyCount(models.Model):
+    """
+    Number of applications applied for on ``day`` at a center, by current status.
+
+    Kept up to date by application.stats as applications are created, change
+    status or are deleted; ``manage.py rebuild_application_stats`` recomputes it.
+    """
+
+    day = models.DateField()
+    state = models.CharField(max_length=255)
+    center_locations = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=DriversLicenseApplication.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        """One row per day, center and status."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'state', 'center_locations', 'status'],
+                name='unique_application_daily_count',
+            ),
+        ]
+
+    def __str__(self):
+        """Return the day, center, status and count."""
+        return f'{self.day} {self.center_locations} {self.status}: {self.count}'
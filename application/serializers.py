@@ -1,14 +1,118 @@
+from django.conf import settings
 from rest_framework import serializers
+from config.middleware import TimedSerializerMixin
 from .models import DriversLicenseApplication
 from nationalId.models import NationalId
 
-class DriversLicenseApplicationSerializer(serializers.ModelSerializer):
+class DriversLicenseApplicationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     nationalId = serializers.PrimaryKeyRelatedField(queryset=NationalId.objects.all())  # Adjust queryset as needed
 
     class Meta:
         model = DriversLicenseApplication
         fields = '__all__' 
+        read_only_fields = ['claimed_by', 'lease_expires_at']
 #    def validate(self, data):
 #       if not data.get('is_motor_cycle') and not data.get('is_motor_vehicle'):
 #            raise serializers.ValidationError("At least one of is_motor_cycle or is_motor_vehicle must be True")
 #        return data
+
+
+class ApplicationDetailsSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Applicant-supplied fields of a renewal or reissue.
+
+    The applicant, license, type, status and timestamps are set by the service layer.
+    """
+
+    class Meta:
+        """Serialize everything but the applicant and license, which come from the URL and lookups."""
+
+        model = DriversLicenseApplication
+        exclude = ['nationalId', 'license']
+        read_only_fields = [
+            'application_type',
+            'status',
+            'renewal_applied_at',
+            'renewal_approved_at',
+            'reissue_applied_at',
+            'reissue_approved_at',
+            'claimed_by',
+            'lease_expires_at',
+        ]
+
+
+class ApplicationExportFilterSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Query parameters of an application export."""
+
+    export_format = serializers.ChoiceField(choices=['ndjson', 'csv'], default='ndjson')
+    state = serializers.CharField(required=False)
+    status = serializers.ChoiceField(choices=DriversLicenseApplication.STATUS_CHOICES, required=False)
+    application_type = serializers.ChoiceField(
+        choices=DriversLicenseApplication.APPLICATION_TYPE_CHOICES, required=False,
+    )
+    applied_after = serializers.DateTimeField(required=False)
+    applied_before = serializers.DateTimeField(required=False)
+
+
+class ApplicationTransitionSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Applications to move from one status to another."""
+
+    application_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.APPLICATION_TRANSITION_MAX_IDS,
+    )
+    from_status = serializers.ChoiceField(choices=DriversLicenseApplication.STATUS_CHOICES)
+    to_status = serializers.ChoiceField(choices=DriversLicenseApplication.STATUS_CHOICES)
+
+
+class ApplicationClaimSerializer(TimedSerializerMixin, serializers.Serializer):
+    """The center, status and number of applications to claim."""
+
+    center_locations = serializers.CharField()
+    status = serializers.ChoiceField(choices=DriversLicenseApplication.STATUS_CHOICES, default='Pending')
+    limit = serializers.IntegerField(min_value=1, max_value=settings.APPLICATION_CLAIM_MAX_SIZE, default=10)
+
+
+class ApplicationListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """An application with its applicant's name and license."""
+
+    applicant_name = serializers.SerializerMethodField()
+    licenseId = serializers.CharField(source='license.licenseId', default=None, read_only=True)
+    license_expiry_date = serializers.DateField(source='license.expiry_date', default=None, read_only=True)
+
+    class Meta:
+        """Serialize every application field."""
+
+        model = DriversLicenseApplication
+        fields = '__all__'
+
+    def get_applicant_name(self, application):
+        """Return the applicant's first and last names."""
+        national_id = application.nationalId
+        return ' '.join(name for name in (national_id.firstName, national_id.lastName) if name)
+
+
+class ApplicationListFilterSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Query parameters filtering the application listing."""
+
+    state = serializers.CharField(required=False)
+    local_government_area = serializers.CharField(required=False)
+    center_locations = serializers.CharField(required=False)
+    status = serializers.ChoiceField(choices=DriversLicenseApplication.STATUS_CHOICES, required=False)
+    application_type = serializers.ChoiceField(
+        choices=DriversLicenseApplication.APPLICATION_TYPE_CHOICES, required=False,
+    )
+
+
+class ApplicationStatsFilterSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Grouping and filters of the application counts."""
+
+    group_by = serializers.MultipleChoiceField(
+        choices=['day', 'state', 'center_locations', 'status'], required=False, default=['status']
+    )
+    state = serializers.CharField(required=False)
+    center_locations = serializers.CharField(required=False)
+    status = serializers.ChoiceField(choices=DriversLicenseApplication.STATUS_CHOICES, required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
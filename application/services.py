@@ -0,0 +1,165 @@
+"""Write paths for driver's license applications.
+
+Each operation looks up what it needs exactly once and runs inside a single
+transaction. Renewals and reissues lock the ``License`` row with
+``select_for_update`` so that concurrent submissions for the same license are
+serialized instead of racing the in-flight check.
+"""
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from django.utils import timezone
+
+from license.models import License
+from nationalId.models import NationalId
+from uploads.storage import save_upload
+
+from .models import IN_FLIGHT_STATUSES, DriversLicenseApplication
+from .serializers import (ApplicationDetailsSerializer,
+                          DriversLicenseApplicationSerializer)
+
+IN_PROGRESS_MESSAGE = "A renewal application for this license is already in progress."
+
+
+class ApplicationError(Exception):
+    """A request that cannot be fulfilled, reported to the client as ``{"error": message}``."""
+
+    def __init__(self, message, status_code=400):
+        """Store the client-facing ``message`` and HTTP ``status_code``."""
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def has_in_flight_application(license):
+    """
+    Return True if ``license`` already has a renewal or reissue in progress.
+
+    Used to tell a violation of the in-flight unique constraint apart from
+    other integrity errors.
+    """
+    return DriversLicenseApplication.objects.filter(license=license, status__in=IN_FLIGHT_STATUSES).exists()
+
+
+def _lock_license(license_id):
+    """Return the license with ``license_id``, locked for the current transaction."""
+    try:
+        return License.objects.select_for_update().get(licenseId=license_id)
+    except License.DoesNotExist:
+        raise Http404("No License matches the given query.")
+
+
+def _get_national_id(national_id_no):
+    """Return the ``NationalId`` for ``national_id_no`` or raise ``ApplicationError``."""
+    if not national_id_no:
+        raise ApplicationError("NationalId is required.")
+    try:
+        return NationalId.objects.get(pk=national_id_no)
+    except (NationalId.DoesNotExist, ValueError, TypeError):
+        raise ApplicationError("Invalid NationalId.")
+
+
+def _validate_details(data):
+    """Validate the applicant-supplied fields of a renewal or reissue."""
+    serializer = ApplicationDetailsSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def create_application(data):
+    """Validate ``data`` and create a new application."""
+    serializer = DriversLicenseApplicationSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    with transaction.atomic():
+        serializer.save()
+    return serializer
+
+
+def renew_application(license_id, data):
+    """
+    Create a renewal application for the license ``license_id``.
+
+    Rejected when the applicant already has an application for that license.
+    """
+    license = None
+    try:
+        with transaction.atomic():
+            license = _lock_license(license_id)
+            national_id = _get_national_id(data.get('nationalId'))
+
+            if DriversLicenseApplication.objects.filter(nationalId=national_id, license=license).exists():
+                raise ApplicationError(IN_PROGRESS_MESSAGE)
+
+            details = _validate_details(data)
+            return DriversLicenseApplication.objects.create(
+                license=license,
+                nationalId=national_id,
+                application_type='Renewal',
+                status='Renewal Pending',
+                renewal_applied_at=timezone.now(),
+                **details,
+            )
+    except IntegrityError:
+        if license is None or not has_in_flight_application(license):
+            raise
+        raise ApplicationError(IN_PROGRESS_MESSAGE)
+
+
+def reissue_application(data):
+    """
+    Create a reissue application for the license named by ``data['license_id']``.
+
+    Rejected when the license already has a renewal or reissue in progress.
+    """
+    license_id = data.get('license_id')
+    if not license_id:
+        raise ApplicationError("License ID is required.")
+
+    details = _validate_details(data)
+    police_report = _store_police_report(details)
+
+    license = None
+    try:
+        with transaction.atomic():
+            license = _lock_license(license_id)
+            national_id = _get_national_id(data.get('nationalId'))
+
+            if has_in_flight_application(license):
+                raise ApplicationError(IN_PROGRESS_MESSAGE)
+
+            return DriversLicenseApplication.objects.create(
+                license=license,
+                nationalId=national_id,
+                application_type='Reissue',
+                status='Reissue Pending',
+                reissue_applied_at=timezone.now(),
+                **details,
+            )
+    except IntegrityError:
+        _delete_police_report(police_report)
+        if license is None or not has_in_flight_application(license):
+            raise
+        raise ApplicationError(IN_PROGRESS_MESSAGE)
+    except Exception:
+        _delete_police_report(police_report)
+        raise
+
+
+def _store_police_report(details):
+    """
+    Save the uploaded police report in ``details`` to storage, replacing it with the stored name.
+
+    Runs before the license is locked, so a slow upload to the storage backend
+    does not hold the lock.
+    """
+    upload = details.get('reissue_police_report')
+    if not upload:
+        return None
+    field = DriversLicenseApplication._meta.get_field('reissue_police_report')
+    details['reissue_police_report'] = save_upload(field, upload)
+    return details['reissue_police_report']
+
+
+def _delete_police_report(name):
+    """Release a police report stored for an application that was not created."""
+    if name:
+        DriversLicenseApplication._meta.get_field('reissue_police_report').storage.delete(name)
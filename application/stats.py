@@ -0,0 +1,196 @@
+"""
+Application counts by state, center, status and day, maintained incrementally.
+
+``ApplicationDailyCount`` holds one row per (day applied, state, center,
+status). Every write path keeps it current, in the writing transaction when
+there is one:
+
+- saving or deleting an application (signals connected in
+  :meth:`application.apps.ApplicationConfig.ready`) moves one count;
+- bulk status changes (:mod:`application.transitions`,
+  :mod:`application.claims`) move the counts of the rows they updated with one
+  grouped query per chunk.
+
+Dashboards read only this table (:func:`counts`), so a query costs the same
+however many applications there are. Bulk ``update()``/``delete()`` calls
+elsewhere bypass it; ``manage.py rebuild_application_stats`` recomputes it from
+the applications, a range of days at a time.
+"""
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from .models import ApplicationDailyCount, DriversLicenseApplication
+
+DIMENSIONS = ('day', 'state', 'center_locations', 'status')
+KEY_FIELDS = ('state', 'center_locations', 'status', 'applied_at')
+
+
+def _key(state, center_locations, status, applied_at):
+    """Return the ``DIMENSIONS`` values an application with these fields is counted under."""
+    applied_at = DriversLicenseApplication._meta.get_field('applied_at').to_python(applied_at)
+    day = timezone.localdate(applied_at) if timezone.is_aware(applied_at) else applied_at.date()
+    return day, state, center_locations, status
+
+
+def apply(deltas):
+    """
+    Add each ``{(day, state, center_locations, status): delta}`` to its count.
+
+    Rows are written in key order, so concurrent bulk changes touching the
+    same counts lock them in the same order and cannot deadlock.
+    """
+    deltas = {key: delta for key, delta in sorted(deltas.items()) if delta}
+    if not deltas:
+        return
+    if connection.vendor in ('postgresql', 'sqlite'):
+        _upsert(deltas)
+        return
+    for key, delta in deltas.items():
+        rows = ApplicationDailyCount.objects.filter(**dict(zip(DIMENSIONS, key)))
+        if rows.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                ApplicationDailyCount.objects.create(**dict(zip(DIMENSIONS, key)), count=delta)
+        except IntegrityError:
+            # Created concurrently since the update above.
+            rows.update(count=F('count') + delta)
+
+
+def _upsert(deltas, batch_size=500):
+    """Add ``deltas`` with one ``INSERT ... ON CONFLICT DO UPDATE`` statement per ``batch_size`` counts."""
+    meta = ApplicationDailyCount._meta
+    quote = connection.ops.quote_name
+    fields = [meta.get_field(name) for name in DIMENSIONS]
+    columns = ', '.join(quote(field.column) for field in fields)
+    count = quote(meta.get_field('count').column)
+    items = list(deltas.items())
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        values = ', '.join([f"({', '.join(['%s'] * (len(fields) + 1))})"] * len(batch))
+        sql = (
+            f'INSERT INTO {quote(meta.db_table)} ({columns}, {count}) VALUES {values} '
+            f'ON CONFLICT ({columns}) DO UPDATE SET {count} = {quote(meta.db_table)}.{count} + EXCLUDED.{count}'
+        )
+        params = []
+        for key, delta in batch:
+            params += [field.get_db_prep_save(value, connection) for field, value in zip(fields, key)]
+            params.append(delta)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+
+def record_transition(application_ids, from_status, to_status, chunk_size=5000):
+    """Move the counts of ``application_ids`` from ``from_status`` to ``to_status``."""
+    deltas = Counter()
+    for start in range(0, len(application_ids), chunk_size):
+        groups = (
+            DriversLicenseApplication.objects
+            .filter(pk__in=application_ids[start:start + chunk_size])
+            .values('state', 'center_locations', day=TruncDate('applied_at'))
+            .annotate(moved=Count('pk'))
+            .order_by()
+        )
+        for group in groups:
+            deltas[group['day'], group['state'], group['center_locations'], from_status] -= group['moved']
+            deltas[group['day'], group['state'], group['center_locations'], to_status] += group['moved']
+    apply(deltas)
+
+
+def counts(group_by, state=None, center_locations=None, status=None, date_from=None, date_to=None):
+    """Return ``{**dimensions, 'count': n}`` per combination of ``group_by``, from the rollup only."""
+    rows = ApplicationDailyCount.objects.all()
+    for name, value in (('state', state), ('center_locations', center_locations), ('status', status)):
+        if value:
+            rows = rows.filter(**{name: value})
+    if date_from:
+        rows = rows.filter(day__gte=date_from)
+    if date_to:
+        rows = rows.filter(day__lte=date_to)
+    group_by = [name for name in DIMENSIONS if name in group_by]
+    return list(
+        rows.values(*group_by).annotate(count=Sum('count')).filter(count__gt=0).order_by(*group_by)
+    )
+
+
+def rebuild(days_per_chunk=31):
+    """
+    Recompute every count from the applications, ``days_per_chunk`` days per transaction.
+
+    Each chunk locks its rollup rows, so concurrent increments wait and land
+    on the recomputed counts. Returns the number of rollup rows written.
+    """
+    applied = DriversLicenseApplication.objects.aggregate(first=Min('applied_at'), last=Max('applied_at'))
+    days = ApplicationDailyCount.objects.aggregate(first=Min('day'), last=Max('day'))
+    bounds = [timezone.localdate(value) for value in (applied['first'], applied['last']) if value]
+    bounds += [value for value in (days['first'], days['last']) if value]
+    if not bounds:
+        return 0
+
+    written = 0
+    day, last = min(bounds), max(bounds)
+    while day <= last:
+        end = day + timedelta(days=days_per_chunk)
+        written += _rebuild_days(day, end)
+        day = end
+    return written
+
+
+def _rebuild_days(first, end):
+    """Replace the counts of the days from ``first`` up to (excluding) ``end``."""
+    window = ApplicationDailyCount.objects.filter(day__gte=first, day__lt=end)
+    applied_from, applied_to = (timezone.make_aware(datetime.combine(day, time.min)) for day in (first, end))
+    with transaction.atomic():
+        list(window.select_for_update().values_list('pk', flat=True))
+        groups = (
+            DriversLicenseApplication.objects
+            .filter(applied_at__gte=applied_from, applied_at__lt=applied_to)
+            .values('state', 'center_locations', 'status', day=TruncDate('applied_at'))
+            .annotate(total=Count('pk'))
+            .order_by()
+        )
+        rows = [
+            ApplicationDailyCount(**{name: group[name] for name in DIMENSIONS}, count=group['total'])
+            for group in groups
+        ]
+        window.delete()
+        ApplicationDailyCount.objects.bulk_create(rows)
+    return len(rows)
+
+
+def remember_previous_key(sender, instance, update_fields=None, **kwargs):
+    """Read the fields an existing row is counted under before it is overwritten."""
+    instance._previous_stats_key = None
+    if instance._state.adding or (update_fields is not None and not set(update_fields) & set(KEY_FIELDS)):
+        return
+    previous = sender._base_manager.filter(pk=instance.pk).values_list(*KEY_FIELDS).first()
+    if previous is not None:
+        instance._previous_stats_key = _key(*previous)
+
+
+def count_saved_application(sender, instance, created, **kwargs):
+    """Count a new application, or move an existing one to its new key."""
+    previous = instance.__dict__.pop('_previous_stats_key', None)
+    if not created and previous is None:
+        return
+    current = _key(*(getattr(instance, name) for name in KEY_FIELDS))
+    if current != previous:
+        apply(Counter({current: 1, previous: -1}) if previous else {current: 1})
+
+
+def count_deleted_application(sender, instance, **kwargs):
+    """Stop counting a deleted application."""
+    apply({_key(*(getattr(instance, name) for name in KEY_FIELDS)): -1})
+
+
+def connect():
+    """Connect the handlers keeping the counts of saved and deleted applications."""
+    pre_save.connect(remember_previous_key, sender=DriversLicenseApplication)
+    post_save.connect(count_saved_application, sender=DriversLicenseApplication)
+    post_delete.connect(count_deleted_application, sender=DriversLicenseApplication)
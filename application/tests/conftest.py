@@ -0,0 +1,94 @@
+"""Test fixtures for application app."""
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from application.models import DriversLicenseApplication
+from license.models import License
+from nationalId.models import NationalId
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Return a user."""
+    return User.objects.create_user(email="test@example.com", password="testpassword")
+
+
+@pytest.fixture
+def staff_user():
+    """Return a staff user."""
+    return User.objects.create_user(email="staff@example.com", password="testpassword", is_staff=True)
+
+
+@pytest.fixture
+def api_client(user):
+    """Return an API client authenticated as ``user``."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def staff_client(staff_user):
+    """Return an API client authenticated as ``staff_user``."""
+    client = APIClient()
+    client.force_authenticate(user=staff_user)
+    return client
+
+
+@pytest.fixture
+def national_id():
+    """Return a national id."""
+    return NationalId.objects.create(idNo=12345678, firstName="Jane", lastName="Doe", DOB=date(1990, 1, 1))
+
+
+@pytest.fixture
+def license(national_id):
+    """Return a license that expires in a year."""
+    return License.objects.create(
+        IdNo=national_id,
+        licenseId="DL-0001",
+        issue_date=date.today() - timedelta(days=365),
+        expiry_date=date.today() + timedelta(days=365),
+        passport_photo="passport_photos/jane.jpg",
+    )
+
+
+@pytest.fixture
+def application_data(national_id):
+    """Return the fields of a new application."""
+    return {
+        "nationalId": national_id.idNo,
+        "is_motor_cycle": False,
+        "is_motor_vehicle": True,
+        "certificate_number": 1001,
+        "application_type": "New",
+        "local_government_area": "Ikeja",
+        "state": "Lagos",
+        "center_locations": "Ikeja Center",
+        "email": "jane@example.com",
+        "phoneNumber": "+2348000000000",
+    }
+
+
+@pytest.fixture
+def make_application(national_id):
+    """Return a factory creating applications for ``national_id``."""
+    def _make_application(**overrides):
+        fields = {
+            "nationalId": national_id,
+            "certificate_number": 1001,
+            "application_type": "New",
+            "local_government_area": "Ikeja",
+            "state": "Lagos",
+            "center_locations": "Ikeja Center",
+            "email": "jane@example.com",
+            "phoneNumber": "+2348000000000",
+        }
+        fields.update(overrides)
+        return DriversLicenseApplication.objects.create(**fields)
+    return _make_application
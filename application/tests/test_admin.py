@@ -0,0 +1,82 @@
+"""Admin changelist tests."""
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from application.models import ApplicationDailyCount
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def admin_client(client):
+    """Return a client logged in as a superuser."""
+    admin = get_user_model().objects.create_user(
+        email="admin@example.com", password="testpassword", is_staff=True, is_superuser=True
+    )
+    client.force_login(admin)
+    return client
+
+
+def _changelist_queries(client, url):
+    """Return the number of queries a changelist page takes."""
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(captured)
+
+
+def test_application_changelist_queries_do_not_grow_with_rows(admin_client, make_application, license):
+    """Test applicants and licenses are joined, not fetched per row."""
+    url = reverse("admin:application_driverslicenseapplication_changelist")
+    make_application(license=license)
+    few = _changelist_queries(admin_client, url)
+    for _ in range(5):
+        make_application(license=license)
+
+    assert _changelist_queries(admin_client, url) == few
+
+
+@pytest.mark.parametrize("name, year", [
+    ("application_driverslicenseapplication", "applied_at__year"),
+    ("application_applicationdailycount", "day__year"),
+    ("license_license", "issue_date__year"),
+    ("nationalId_nationalid", "DOB__year"),
+    ("accounts_customuser", "date_joined__year"),
+])
+def test_changelists_drill_down_by_date(admin_client, make_application, license, name, year):
+    """Test every changelist renders, searches and drills down its date hierarchy."""
+    make_application(license=license)
+    url = reverse(f"admin:{name}_changelist")
+
+    assert admin_client.get(url).status_code == 200
+    assert admin_client.get(url, {"q": "DL-0001"}).status_code == 200
+    assert admin_client.get(url, {year: "1990"}).status_code == 200
+
+
+def test_license_search_is_an_exact_lookup(admin_client, license):
+    """Test the license search matches the whole license id only."""
+    url = reverse("admin:license_license_changelist")
+
+    assert list(admin_client.get(url, {"q": "DL-0001"}).context["cl"].result_list) == [license]
+    assert list(admin_client.get(url, {"q": "DL-"}).context["cl"].result_list) == []
+
+
+def test_daily_counts_are_read_only(admin_client, make_application):
+    """Test the rollup can be viewed but not added to, edited or deleted by hand."""
+    make_application()
+    row = ApplicationDailyCount.objects.get()
+
+    response = admin_client.get(reverse("admin:application_applicationdailycount_change", args=[row.pk]))
+    assert response.status_code == 200
+    assert not response.context["has_change_permission"]
+    assert admin_client.post(
+        reverse("admin:application_applicationdailycount_change", args=[row.pk]), {"count": 99},
+    ).status_code == 403
+    assert admin_client.get(reverse("admin:application_applicationdailycount_add")).status_code == 403
+    assert admin_client.post(
+        reverse("admin:application_applicationdailycount_delete", args=[row.pk]), {"post": "yes"},
+    ).status_code == 403
+    assert ApplicationDailyCount.objects.get().count == 1
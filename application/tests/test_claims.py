@@ -0,0 +1,130 @@
+"""Application claim tests."""
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from application import claims, transitions
+from application.services import ApplicationError
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(params=[True, False], ids=["skip-locked", "conditional-update"])
+def skip_locked(request, monkeypatch):
+    """Run a test with and without SELECT ... FOR UPDATE SKIP LOCKED support."""
+    monkeypatch.setattr(connection.features, "has_select_for_update_skip_locked", request.param)
+    return request.param
+
+
+def test_claim_leases_oldest_pending_at_center(make_application, staff_user, skip_locked):
+    """Test the oldest pending applications at the center are moved to Processing and leased."""
+    now = timezone.now()
+    oldest, older, newest = (make_application(applied_at=now - timedelta(hours=hours)) for hours in (3, 2, 1))
+    elsewhere = make_application(center_locations="Yaba Center", applied_at=now - timedelta(hours=4))
+
+    claimed = claims.claim("Ikeja Center", staff_user, 2)
+
+    assert [application.pk for application in claimed] == [oldest.pk, older.pk]
+    for application in claimed:
+        assert application.status == "Processing"
+        assert application.claimed_by == staff_user
+        assert application.lease_expires_at > now
+    newest.refresh_from_db()
+    elsewhere.refresh_from_db()
+    assert (newest.status, elsewhere.status) == ("Pending", "Pending")
+
+
+def test_claims_never_overlap(make_application, staff_user, skip_locked):
+    """Test successive claims take different applications until none are left."""
+    for _ in range(5):
+        make_application()
+
+    first = claims.claim("Ikeja Center", staff_user, 3)
+    second = claims.claim("Ikeja Center", staff_user, 3)
+
+    assert len(first) == 3
+    assert len(second) == 2
+    assert not {application.pk for application in first} & {application.pk for application in second}
+    assert claims.claim("Ikeja Center", staff_user, 3) == []
+
+
+def test_claim_reclaims_expired_leases_first(make_application, user, staff_user, skip_locked):
+    """Test applications whose lease expired are claimed again before pending ones."""
+    now = timezone.now()
+    pending = make_application(applied_at=now - timedelta(days=1))
+    expired = make_application(status="Processing", claimed_by=user, lease_expires_at=now - timedelta(minutes=1))
+    leased = make_application(status="Processing", claimed_by=user, lease_expires_at=now + timedelta(minutes=5))
+
+    claimed = claims.claim("Ikeja Center", staff_user, 1)
+
+    assert [application.pk for application in claimed] == [expired.pk]
+    assert claimed[0].claimed_by == staff_user
+    leased.refresh_from_db()
+    pending.refresh_from_db()
+    assert leased.claimed_by == user
+    assert pending.status == "Pending"
+
+
+def test_claim_renewals(make_application, license, staff_user):
+    """Test renewals are claimed into Renewal Processing, and only when asked for."""
+    renewal = make_application(license=license, application_type="Renewal", status="Renewal Pending")
+    make_application()
+
+    claimed = claims.claim("Ikeja Center", staff_user, 10, status="Renewal Pending")
+
+    assert [(application.pk, application.status) for application in claimed] == [(renewal.pk, "Renewal Processing")]
+
+
+def test_claim_rejects_other_statuses(staff_user):
+    """Test only pending statuses can be claimed."""
+    with pytest.raises(ApplicationError):
+        claims.claim("Ikeja Center", staff_user, 10, status="Processing")
+
+
+def test_transition_ends_lease(make_application, staff_user):
+    """Test moving a claimed application on clears its lease so it is never reclaimed."""
+    application = make_application()
+    claims.claim("Ikeja Center", staff_user, 1, lease=0)
+
+    transitions.transition([application.pk], "Processing", "Approved")
+
+    application.refresh_from_db()
+    assert application.lease_expires_at is None
+    assert application.claimed_by == staff_user
+    assert claims.claim("Ikeja Center", staff_user, 1) == []
+
+
+def test_claim_endpoint(staff_client, staff_user, make_application):
+    """Test staff claim applications through the API."""
+    application = make_application()
+
+    response = staff_client.post(
+        reverse("claim_applications"), {"center_locations": "Ikeja Center", "limit": 5}, format="json"
+    )
+
+    assert response.status_code == 200
+    [claimed] = response.data["applications"]
+    assert claimed["application_id"] == str(application.pk)
+    assert claimed["status"] == "Processing"
+    assert claimed["claimed_by"] == staff_user.pk
+    assert claimed["lease_expires_at"] is not None
+
+
+def test_claim_endpoint_rejects_unclaimable_status(staff_client):
+    """Test claiming a status without a processing step returns 400."""
+    response = staff_client.post(
+        reverse("claim_applications"), {"center_locations": "Ikeja Center", "status": "Approved"}, format="json"
+    )
+
+    assert response.status_code == 400
+    assert "error" in response.data
+
+
+def test_claim_endpoint_requires_staff(api_client):
+    """Test non-staff users cannot claim applications."""
+    response = api_client.post(reverse("claim_applications"), {"center_locations": "Ikeja Center"}, format="json")
+
+    assert response.status_code == 403
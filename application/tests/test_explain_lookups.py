@@ -0,0 +1,55 @@
+"""Renewal/reissue lookup explain command tests."""
+import io
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError
+
+from application.models import ApplicationDailyCount, DriversLicenseApplication
+from license.models import License
+from nationalId.models import NationalId
+
+pytestmark = pytest.mark.django_db
+
+
+def test_explain_rolls_back_seeded_rows(settings):
+    """Test the plans are printed before and after and the seeded rows do not survive the command."""
+    settings.DEBUG = True
+    out = io.StringIO()
+
+    call_command("explain_application_lookups", "--seed", "40", "--batch-size", "7", "--repeat", "1", stdout=out)
+
+    output = out.getvalue()
+    assert "40 applications" in output
+    assert output.index("Before") < output.index("After")
+    assert "in-flight for license" in output
+    assert not DriversLicenseApplication.objects.exists()
+    assert not License.objects.exists() and not NationalId.objects.exists()
+    assert not ApplicationDailyCount.objects.exists()
+
+
+def test_explain_keeps_the_in_flight_constraint(settings, national_id, make_application):
+    """Test the index dropped for the "before" run is restored."""
+    settings.DEBUG = True
+    call_command("explain_application_lookups", "--seed", "4", "--repeat", "1", stdout=io.StringIO())
+    license = License.objects.create(
+        IdNo=national_id, licenseId="DL-9", expiry_date="2030-01-01", passport_photo="passport_photos/jane.jpg",
+    )
+
+    make_application(status="Renewal Pending", license=license)
+    with pytest.raises(IntegrityError):
+        make_application(status="Reissue Pending", license=license)
+
+
+def test_explain_requires_debug_or_force():
+    """Test the command refuses to lock a production table by default."""
+    with pytest.raises(CommandError, match="--force"):
+        call_command("explain_application_lookups", stdout=io.StringIO())
+
+
+def test_explain_requires_applications(settings):
+    """Test an empty database is reported instead of explained."""
+    settings.DEBUG = True
+    with pytest.raises(CommandError, match="--seed"):
+        call_command("explain_application_lookups", "--force", stdout=io.StringIO())
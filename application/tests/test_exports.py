@@ -0,0 +1,71 @@
+"""Application export tests."""
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+def _body(response):
+    """Return the streamed body of ``response`` as text."""
+    return b"".join(response.streaming_content).decode()
+
+
+def test_export_ndjson(staff_client, make_application):
+    """Test the default export streams one JSON document per application."""
+    first = make_application()
+    make_application(state="Abuja")
+    response = staff_client.get(reverse("export_applications"), {"state": "Lagos"})
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in _body(response).splitlines()]
+    assert [row["application_id"] for row in rows] == [str(first.application_id)]
+    assert rows[0]["nationalId_id"] == first.nationalId_id
+
+
+def test_export_csv(staff_client, make_application):
+    """Test the CSV export has a header and one line per application."""
+    make_application(status="Approved")
+    make_application(status="Pending")
+    response = staff_client.get(reverse("export_applications"), {"export_format": "csv", "status": "Approved"})
+    assert response["Content-Type"] == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(_body(response))))
+    assert len(rows) == 1
+    assert rows[0]["status"] == "Approved"
+
+
+def test_export_applied_at_range(staff_client, make_application):
+    """Test applied_after is inclusive and applied_before exclusive."""
+    make_application(applied_at="2024-01-01T00:00:00Z")
+    make_application(applied_at="2024-02-01T00:00:00Z")
+    response = staff_client.get(
+        reverse("export_applications"),
+        {"applied_after": "2024-01-01T00:00:00Z", "applied_before": "2024-02-01T00:00:00Z"},
+    )
+    assert len(_body(response).splitlines()) == 1
+
+
+def test_export_rejects_invalid_filter(staff_client):
+    """Test an unknown status is rejected."""
+    response = staff_client.get(reverse("export_applications"), {"status": "Lost"})
+    assert response.status_code == 400
+
+
+def test_export_requires_staff(api_client):
+    """Test non-staff users cannot export."""
+    response = api_client.get(reverse("export_applications"))
+    assert response.status_code == 403
+
+
+def test_export_command(make_application):
+    """Test the management command writes the same export."""
+    make_application(application_type="Renewal")
+    make_application()
+    out = io.StringIO()
+    call_command("export_applications", "--format", "csv", "--application-type", "Renewal", stdout=out)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row["application_type"] for row in rows] == ["Renewal"]
@@ -0,0 +1,100 @@
+"""Application listing tests."""
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+pytestmark = pytest.mark.django_db
+
+
+def _read_all(client, url, params=None):
+    """Follow the next links from ``url`` and return the application ids of every page."""
+    pages = []
+    response = client.get(url, params)
+    while True:
+        assert response.status_code == 200
+        pages.append([row["application_id"] for row in response.data["results"]])
+        if response.data["next"] is None:
+            return pages
+        response = client.get(response.data["next"])
+
+
+def test_list_pages_through_every_application_once(staff_client, make_application):
+    """Test following the cursors returns each application once, newest first, ties included."""
+    now = timezone.now().replace(microsecond=123456)
+    applications = [make_application(applied_at=now - timedelta(microseconds=i // 3)) for i in range(10)]
+    expected = sorted(applications, key=lambda application: (application.applied_at, application.pk), reverse=True)
+
+    pages = _read_all(staff_client, reverse("list_applications"), {"page_size": 4})
+
+    assert [len(page) for page in pages] == [4, 4, 2]
+    assert [application_id for page in pages for application_id in page] == [
+        str(application.pk) for application in expected
+    ]
+
+
+def test_list_filters(staff_client, make_application):
+    """Test the listing only returns applications matching every filter."""
+    match = make_application(state="Lagos", status="Processing", center_locations="Yaba Center")
+    make_application(state="Lagos", status="Pending", center_locations="Yaba Center")
+    make_application(state="Ogun", status="Processing", center_locations="Yaba Center")
+
+    pages = _read_all(
+        staff_client,
+        reverse("list_applications"),
+        {"state": "Lagos", "status": "Processing", "center_locations": "Yaba Center", "application_type": "New"},
+    )
+
+    assert pages == [[str(match.pk)]]
+
+
+def test_list_includes_applicant_and_license(staff_client, make_application, license):
+    """Test rows carry the applicant's name and license without extra queries."""
+    make_application(license=license, application_type="Renewal", status="Renewed")
+    make_application()
+
+    response = staff_client.get(reverse("list_applications"))
+
+    renewal, new = sorted(response.data["results"], key=lambda row: row["application_type"], reverse=True)
+    assert renewal["applicant_name"] == "Jane Doe"
+    assert renewal["licenseId"] == "DL-0001"
+    assert renewal["license_expiry_date"] == license.expiry_date.isoformat()
+    assert new["licenseId"] is None
+
+
+def test_list_page_costs_one_query_at_any_depth(staff_client, make_application, django_assert_num_queries):
+    """Test the first and a later page are each one query, whatever their position."""
+    for _ in range(6):
+        make_application()
+    url = reverse("list_applications")
+
+    with django_assert_num_queries(1):
+        first = staff_client.get(url, {"page_size": 2})
+    response = staff_client.get(first.data["next"])
+    with django_assert_num_queries(1):
+        last = staff_client.get(response.data["next"])
+
+    assert len(last.data["results"]) == 2
+    assert last.data["next"] is None
+
+
+def test_list_rejects_invalid_cursor(staff_client):
+    """Test a malformed cursor returns 404."""
+    response = staff_client.get(reverse("list_applications"), {"cursor": "not-a-cursor"})
+
+    assert response.status_code == 404
+
+
+def test_list_rejects_invalid_filter(staff_client):
+    """Test an unknown status returns 400."""
+    response = staff_client.get(reverse("list_applications"), {"status": "Lost"})
+
+    assert response.status_code == 400
+
+
+def test_list_requires_staff(api_client):
+    """Test non-staff users cannot list applications."""
+    response = api_client.get(reverse("list_applications"))
+
+    assert response.status_code == 403
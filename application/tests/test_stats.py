@@ -0,0 +1,144 @@
+"""Application statistics rollup tests."""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from application import claims, stats, transitions
+from application.models import ApplicationDailyCount, DriversLicenseApplication
+
+pytestmark = pytest.mark.django_db
+
+MONDAY = datetime(2026, 3, 2, 9, tzinfo=timezone.utc)
+
+
+def _counts():
+    """Return the non-zero rollup rows as ``{(day, center, status): count}``."""
+    return {
+        (row.day, row.center_locations, row.status): row.count
+        for row in ApplicationDailyCount.objects.exclude(count=0)
+    }
+
+
+def test_counts_follow_saves_and_deletes(make_application):
+    """Test creating, changing the status of and deleting applications keeps the counts exact."""
+    first = make_application(applied_at=MONDAY)
+    make_application(applied_at=MONDAY + timedelta(hours=1))
+    make_application(applied_at=MONDAY + timedelta(days=1), center_locations="Yaba Center")
+
+    first.status = "Processing"
+    first.save()
+    DriversLicenseApplication.objects.get(center_locations="Yaba Center").delete()
+
+    assert _counts() == {
+        (date(2026, 3, 2), "Ikeja Center", "Pending"): 1,
+        (date(2026, 3, 2), "Ikeja Center", "Processing"): 1,
+    }
+
+
+def test_counts_ignore_saves_of_other_fields(make_application, django_assert_num_queries):
+    """Test saving fields the counts do not depend on does not touch them."""
+    application = make_application(applied_at=MONDAY)
+
+    with django_assert_num_queries(1):
+        application.save(update_fields=["email"])
+
+    assert _counts() == {(date(2026, 3, 2), "Ikeja Center", "Pending"): 1}
+
+
+def test_counts_follow_bulk_transitions_and_claims(make_application, staff_user):
+    """Test bulk status changes move the counts of the rows they updated."""
+    applications = [make_application(applied_at=MONDAY) for _ in range(3)]
+
+    claims.claim("Ikeja Center", staff_user, 2)
+    transitions.transition([application.pk for application in applications], "Processing", "Approved")
+
+    assert _counts() == {
+        (date(2026, 3, 2), "Ikeja Center", "Pending"): 1,
+        (date(2026, 3, 2), "Ikeja Center", "Approved"): 2,
+    }
+
+
+def test_counts_without_upsert(make_application, monkeypatch):
+    """Test databases without INSERT ... ON CONFLICT update or create the rows one at a time."""
+    monkeypatch.setattr(connection, "vendor", "mysql")
+    make_application(applied_at=MONDAY)
+    make_application(applied_at=MONDAY)
+
+    assert _counts() == {(date(2026, 3, 2), "Ikeja Center", "Pending"): 2}
+
+
+@pytest.mark.parametrize("vendor", ["sqlite", "mysql"])
+def test_counts_written_in_key_order(monkeypatch, vendor):
+    """Test counts are written in key order whatever the order of the deltas, so locks are taken in one order."""
+    monkeypatch.setattr(connection, "vendor", vendor)
+    keys = [(date(2026, 3, 2), "Lagos", center, "Pending") for center in ("Yaba", "Apapa", "Ikeja")]
+
+    with CaptureQueriesContext(connection) as queries:
+        stats.apply({key: 1 for key in keys})
+
+    sql = " ".join(query["sql"] for query in queries)
+    assert sql.index("Apapa") < sql.index("Ikeja") < sql.index("Yaba")
+
+
+def test_rebuild_repairs_drift(make_application):
+    """Test the rebuild recomputes every day, including days left with no applications."""
+    for days in range(5):
+        make_application(applied_at=MONDAY + timedelta(days=days))
+    expected = _counts()
+    DriversLicenseApplication.objects.filter(applied_at__gte=MONDAY + timedelta(days=3)).update(status="Approved")
+    ApplicationDailyCount.objects.create(
+        day=date(2026, 1, 1), state="Lagos", center_locations="Gone", status="Pending", count=4
+    )
+
+    written = stats.rebuild(days_per_chunk=2)
+
+    expected.update({
+        (date(2026, 3, 5), "Ikeja Center", "Approved"): 1,
+        (date(2026, 3, 6), "Ikeja Center", "Approved"): 1,
+    })
+    del expected[date(2026, 3, 5), "Ikeja Center", "Pending"], expected[date(2026, 3, 6), "Ikeja Center", "Pending"]
+    assert written == 5
+    assert _counts() == expected
+
+
+def test_rebuild_command(make_application):
+    """Test the reconciliation command rebuilds the counts."""
+    make_application(applied_at=MONDAY)
+    ApplicationDailyCount.objects.update(count=7)
+
+    call_command("rebuild_application_stats", "--days", "7")
+
+    assert _counts() == {(date(2026, 3, 2), "Ikeja Center", "Pending"): 1}
+
+
+def test_stats_endpoint_reads_only_the_rollup(staff_client, make_application, django_assert_num_queries):
+    """Test the endpoint groups and filters the counts with one query."""
+    make_application(applied_at=MONDAY)
+    make_application(applied_at=MONDAY, status="Processing")
+    make_application(applied_at=MONDAY + timedelta(days=1))
+    make_application(applied_at=MONDAY + timedelta(days=2), state="Ogun")
+
+    with django_assert_num_queries(1):
+        response = staff_client.get(
+            reverse("application_stats"),
+            {"group_by": ["day", "status"], "state": "Lagos", "date_to": "2026-03-03"},
+        )
+
+    assert response.status_code == 200
+    assert response.data["total"] == 3
+    assert response.data["results"] == [
+        {"day": date(2026, 3, 2), "status": "Pending", "count": 1},
+        {"day": date(2026, 3, 2), "status": "Processing", "count": 1},
+        {"day": date(2026, 3, 3), "status": "Pending", "count": 1},
+    ]
+
+
+def test_stats_endpoint_requires_staff(api_client):
+    """Test non-staff users cannot read the statistics."""
+    response = api_client.get(reverse("application_stats"))
+
+    assert response.status_code == 403
@@ -0,0 +1,121 @@
+"""Application status transition tests."""
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from application import transitions
+from application.models import DriversLicenseApplication
+from application.services import ApplicationError
+
+pytestmark = pytest.mark.django_db
+
+
+def test_transition_updates_matching_rows_in_one_statement(make_application, django_assert_num_queries):
+    """Test rows in the source status are moved with one UPDATE and the others reported."""
+    processing = [make_application(status="Processing") for _ in range(3)]
+    pending = make_application(status="Pending")
+    unknown = uuid.uuid4()
+    ids = [application.application_id for application in processing] + [pending.application_id, unknown]
+
+    # SAVEPOINT, UPDATE ... RETURNING, counts moved (grouped SELECT, upsert), RELEASE SAVEPOINT,
+    # SELECT statuses of the skipped rows
+    with django_assert_num_queries(6):
+        result = transitions.transition(ids, "Processing", "Approved")
+
+    assert sorted(result.updated) == sorted(application.application_id for application in processing)
+    assert result.skipped == {pending.application_id: "Pending", unknown: None}
+    assert set(DriversLicenseApplication.objects.values_list("status", flat=True)) == {"Approved", "Pending"}
+
+
+def test_transition_sets_approval_timestamps(make_application, license):
+    """Test entering Renewed stamps renewal_approved_at in the same statement."""
+    application = make_application(license=license, application_type="Renewal", status="Renewal Processing")
+
+    result = transitions.transition([str(application.application_id)], "Renewal Processing", "Renewed")
+
+    application.refresh_from_db()
+    assert result.updated == [application.application_id]
+    assert application.status == "Renewed"
+    assert application.renewal_approved_at is not None
+    assert application.reissue_approved_at is None
+
+
+def test_transition_in_chunks(make_application):
+    """Test large batches are split into several statements."""
+    applications = [make_application(status="Pending") for _ in range(5)]
+
+    result = transitions.transition([a.application_id for a in applications] * 2, "Pending", "Processing", chunk_size=2)
+
+    assert len(result.updated) == 5
+    assert result.skipped == {}
+
+
+@pytest.mark.parametrize("vendor, can_return", [("mysql", True), ("sqlite", False)])
+def test_transition_without_returning(make_application, monkeypatch, vendor, can_return):
+    """Test databases without UPDATE ... RETURNING (MySQL, SQLite < 3.35) select then update, reporting the same."""
+    monkeypatch.setattr(connection, "vendor", vendor)
+    monkeypatch.setattr(type(connection.features), "can_return_rows_from_bulk_insert", can_return)
+    moved = make_application(status="Reissue Processing", application_type="Reissue")
+    stale = make_application(status="Reissued", application_type="Reissue")
+
+    with CaptureQueriesContext(connection) as queries:
+        result = transitions.transition([moved.application_id, stale.application_id], "Reissue Processing", "Reissued")
+
+    assert result == ([moved.application_id], {stale.application_id: "Reissued"})
+    assert not any("RETURNING" in query["sql"] for query in queries)
+    moved.refresh_from_db()
+    assert moved.reissue_approved_at is not None
+
+
+@pytest.mark.parametrize("from_status, to_status", [
+    ("Pending", "Approved"),
+    ("Approved", "Pending"),
+    ("Renewal Pending", "Processing"),
+    ("Ready for Printing", "Approved"),
+])
+def test_invalid_transitions_are_rejected(make_application, from_status, to_status):
+    """Test edges outside the state machine raise and change nothing."""
+    application = make_application(status=from_status)
+    with pytest.raises(ApplicationError):
+        transitions.transition([application.application_id], from_status, to_status)
+    application.refresh_from_db()
+    assert application.status == from_status
+
+
+def test_transition_endpoint(staff_client, make_application):
+    """Test the staff endpoint applies a transition and reports skipped rows."""
+    moved = make_application(status="Approved")
+    stale = make_application(status="Processing")
+
+    response = staff_client.post(reverse("transition_applications"), {
+        "application_ids": [str(moved.application_id), str(stale.application_id)],
+        "from_status": "Approved",
+        "to_status": "Ready for Printing",
+    }, format="json")
+
+    assert response.status_code == 200
+    assert response.data == {
+        "updated": 1,
+        "skipped": [{"application_id": stale.application_id, "status": "Processing"}],
+    }
+
+
+def test_transition_endpoint_rejects_invalid_edges(staff_client, make_application):
+    """Test a transition outside the state machine is a 400."""
+    application = make_application(status="Pending")
+    response = staff_client.post(reverse("transition_applications"), {
+        "application_ids": [str(application.application_id)],
+        "from_status": "Pending",
+        "to_status": "Ready for Printing",
+    }, format="json")
+    assert response.status_code == 400
+    assert "cannot move" in response.data["error"]
+
+
+def test_transition_endpoint_requires_staff(api_client):
+    """Test non-staff users cannot transition applications."""
+    response = api_client.post(reverse("transition_applications"), {}, format="json")
+    assert response.status_code == 403
@@ -0,0 +1,185 @@
+"""Application views tests."""
+import os
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+
+from application.models import DriversLicenseApplication
+from uploads.models import Blob
+
+pytestmark = pytest.mark.django_db
+
+
+def test_in_flight_constraint(license, make_application):
+    """Test a license cannot have two in-flight renewals/reissues."""
+    make_application(license=license, application_type="Renewal", status="Renewal Pending")
+    with pytest.raises(IntegrityError), transaction.atomic():
+        make_application(license=license, application_type="Reissue", status="Reissue Pending")
+    make_application(license=license, application_type="Reissue", status="Reissued")
+
+
+def test_reissue_conflict_returns_400(api_client, license, make_application):
+    """Test a reissue racing an in-flight reissue gets the existing 400 response."""
+    make_application(license=license, application_type="Reissue", status="Reissue Pending")
+    response = api_client.post(
+        reverse("reissue_application", args=[license.licenseId]),
+        {
+            "license_id": license.licenseId,
+            "nationalId": license.IdNo_id,
+            "certificate_number": 1001,
+            "local_government_area": "Ikeja",
+            "state": "Lagos",
+            "center_locations": "Ikeja Center",
+            "email": "jane@example.com",
+            "phoneNumber": "+2348000000000",
+            "reissue_reason": "Lost",
+        },
+    )
+    assert response.status_code == 400
+    assert response.data == {"error": "A renewal application for this license is already in progress."}
+    assert DriversLicenseApplication.objects.count() == 1
+
+
+@pytest.fixture
+def renewal_data(application_data):
+    """Return the fields of a renewal request."""
+    return dict(application_data, application_type="Renewal")
+
+
+def test_create_application(api_client, application_data, django_assert_num_queries):
+    """Test a new application is created within its query budget."""
+    # SAVEPOINT, national id lookup, INSERT, count upsert, RELEASE SAVEPOINT
+    with django_assert_num_queries(5):
+        response = api_client.post(reverse("create_application"), application_data, format="json")
+    assert response.status_code == 201
+    assert response.data["nationalId"] == application_data["nationalId"]
+
+
+def test_create_application_unknown_national_id(api_client, application_data):
+    """Test an unknown national id is rejected."""
+    response = api_client.post(reverse("create_application"), dict(application_data, nationalId=1), format="json")
+    assert response.status_code == 400
+    assert "nationalId" in response.data
+
+
+def test_renew_application(api_client, license, renewal_data, django_assert_num_queries):
+    """Test a renewal is created within its query budget."""
+    # SAVEPOINT, license (FOR UPDATE), national id, existing check, INSERT, count upsert, RELEASE SAVEPOINT
+    with django_assert_num_queries(7):
+        response = api_client.post(reverse("renew_application", args=[license.licenseId]), renewal_data, format="json")
+    assert response.status_code == 201
+    application = DriversLicenseApplication.objects.get(application_id=response.data["application_id"])
+    assert (application.license, application.application_type, application.status) == (
+        license, "Renewal", "Renewal Pending"
+    )
+    assert application.renewal_applied_at is not None
+
+
+def test_renew_application_existing(api_client, license, renewal_data, make_application):
+    """Test a second renewal for the same applicant and license is rejected."""
+    make_application(license=license)
+    response = api_client.post(reverse("renew_application", args=[license.licenseId]), renewal_data, format="json")
+    assert response.status_code == 400
+    assert response.data == {"error": "A renewal application for this license is already in progress."}
+
+
+def test_renew_application_unknown_license(api_client, renewal_data):
+    """Test renewing an unknown license returns 404."""
+    response = api_client.post(reverse("renew_application", args=["FAKE-1"]), renewal_data, format="json")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("national_id_no, error", [
+    (None, "NationalId is required."),
+    (1, "Invalid NationalId."),
+    ("abc", "Invalid NationalId."),
+])
+def test_renew_application_bad_national_id(api_client, license, renewal_data, national_id_no, error):
+    """Test a missing or unknown national id is rejected."""
+    renewal_data.pop("nationalId")
+    if national_id_no is not None:
+        renewal_data["nationalId"] = national_id_no
+    response = api_client.post(reverse("renew_application", args=[license.licenseId]), renewal_data, format="json")
+    assert response.status_code == 400
+    assert response.data == {"error": error}
+
+
+def test_renew_application_invalid_details(api_client, license, renewal_data):
+    """Test serializer errors are reported and nothing is created."""
+    renewal_data.pop("certificate_number")
+    response = api_client.post(reverse("renew_application", args=[license.licenseId]), renewal_data, format="json")
+    assert response.status_code == 400
+    assert "certificate_number" in response.data
+    assert not DriversLicenseApplication.objects.exists()
+
+
+def test_reissue_application(api_client, license, application_data, django_assert_num_queries):
+    """Test a reissue is created within its query budget."""
+    data = dict(application_data, license_id=license.licenseId, is_motor_cycle="true", reissue_reason="Lost")
+    # SAVEPOINT, license (FOR UPDATE), national id, in-flight check, INSERT, count upsert, RELEASE SAVEPOINT
+    with django_assert_num_queries(7):
+        response = api_client.post(reverse("reissue_application", args=[license.licenseId]), data)
+    assert response.status_code == 201
+    application = DriversLicenseApplication.objects.get(application_id=response.data["application_id"])
+    assert (application.application_type, application.status) == ("Reissue", "Reissue Pending")
+    assert application.is_motor_cycle is True
+    assert application.reissue_reason == "Lost"
+
+
+def test_reissue_application_stores_police_report(api_client, license, application_data, settings, tmp_path):
+    """Test a multi-megabyte police report is streamed to storage with the application."""
+    settings.MEDIA_ROOT = tmp_path
+    content = os.urandom(5 * 1024 * 1024)
+    data = dict(
+        application_data,
+        license_id=license.licenseId,
+        reissue_reason="Stolen",
+        reissue_police_report=SimpleUploadedFile("report.pdf", content, content_type="application/pdf"),
+    )
+    response = api_client.post(reverse("reissue_application", args=[license.licenseId]), data)
+    assert response.status_code == 201
+    report = DriversLicenseApplication.objects.get(application_id=response.data["application_id"]).reissue_police_report
+    assert report.name.startswith("blobs/") and report.name.endswith(".pdf")
+    assert Blob.objects.get(name=report.name).refcount == 1
+    with report.open("rb") as file:
+        assert file.read() == content
+
+
+def test_reissue_application_rejects_oversized_police_report(api_client, license, application_data, settings,
+                                                             tmp_path):
+    """Test a police report over UPLOAD_MAX_FILE_SIZE is rejected and nothing is stored."""
+    settings.MEDIA_ROOT = tmp_path
+    settings.UPLOAD_MAX_FILE_SIZE = 1024 * 1024
+    data = dict(
+        application_data,
+        license_id=license.licenseId,
+        reissue_police_report=SimpleUploadedFile("report.pdf", os.urandom(2 * 1024 * 1024)),
+    )
+    response = api_client.post(reverse("reissue_application", args=[license.licenseId]), data)
+    assert response.status_code == 400
+    assert not DriversLicenseApplication.objects.exists()
+    assert not list(tmp_path.iterdir())
+
+
+def test_reissue_conflict_leaves_police_report_unreferenced(api_client, license, application_data, make_application,
+                                                            settings, tmp_path):
+    """Test a police report stored for a rejected reissue is left unreferenced, for garbage collection."""
+    settings.MEDIA_ROOT = tmp_path
+    make_application(license=license, application_type="Reissue", status="Reissue Pending")
+    data = dict(
+        application_data,
+        license_id=license.licenseId,
+        reissue_police_report=SimpleUploadedFile("report.pdf", b"%PDF-1.7"),
+    )
+    response = api_client.post(reverse("reissue_application", args=[license.licenseId]), data)
+    assert response.status_code == 400
+    assert Blob.objects.get().refcount == 0
+
+
+def test_reissue_application_requires_license_id(api_client, application_data):
+    """Test a reissue without a license id is rejected."""
+    response = api_client.post(reverse("reissue_application", args=["DL-0001"]), application_data)
+    assert response.status_code == 400
+    assert response.data == {"error": "License ID is required."}
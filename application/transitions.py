@@ -0,0 +1,121 @@
+"""
+Allowed status transitions of driver's license applications, applied in bulk.
+
+New applications go Pending -> Processing -> Approved -> Ready for Printing;
+renewals and reissues go <type> Pending -> <type> Processing -> Renewed /
+Reissued, which also stamps ``renewal_approved_at`` / ``reissue_approved_at``.
+
+:func:`transition` moves any number of applications along one edge with a
+single conditional ``UPDATE ... WHERE status = <from>`` per chunk of ids. Rows
+that were not in ``<from>`` (changed concurrently, already moved, unknown) are
+left untouched and reported back. On PostgreSQL and SQLite 3.35+ the
+statement returns the ids it updated (``RETURNING``), so the report is exact
+without locking anything first; elsewhere the matching rows are selected (and
+locked where supported) before the update. The application counts (:mod:`application.stats`) move
+in the same transaction.
+"""
+from collections import namedtuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import stats
+from .models import DriversLicenseApplication
+from .services import ApplicationError
+
+TRANSITIONS = {
+    'Pending': ['Processing'],
+    'Processing': ['Approved'],
+    'Approved': ['Ready for Printing'],
+    'Renewal Pending': ['Renewal Processing'],
+    'Renewal Processing': ['Renewed'],
+    'Reissue Pending': ['Reissue Processing'],
+    'Reissue Processing': ['Reissued'],
+}
+
+# Set to the transition time by the statement that enters the status.
+TIMESTAMP_FIELDS = {
+    'Renewed': 'renewal_approved_at',
+    'Reissued': 'reissue_approved_at',
+}
+
+
+class TransitionResult(namedtuple('TransitionResult', ['updated', 'skipped'])):
+    """The ids :func:`transition` updated, and ``{id: current status}`` (None if unknown) for those it skipped."""
+
+    __slots__ = ()
+
+
+def can_transition(from_status, to_status):
+    """Return True if applications may move from ``from_status`` to ``to_status``."""
+    return to_status in TRANSITIONS.get(from_status, ())
+
+
+def transition(application_ids, from_status, to_status, chunk_size=5000):
+    """
+    Move the applications in ``application_ids`` that are in ``from_status`` to ``to_status``.
+
+    Runs in one transaction, one ``UPDATE`` per ``chunk_size`` ids. Raises
+    ``ApplicationError`` for a transition that is not allowed. Returns a
+    :class:`TransitionResult`.
+    """
+    if not can_transition(from_status, to_status):
+        raise ApplicationError(f"Applications cannot move from '{from_status}' to '{to_status}'.")
+
+    # Moving on ends any processing lease (see application.claims).
+    changes = {'status': to_status, 'lease_expires_at': None}
+    if to_status in TIMESTAMP_FIELDS:
+        changes[TIMESTAMP_FIELDS[to_status]] = timezone.now()
+
+    to_uuid = DriversLicenseApplication._meta.pk.to_python
+    ids = list(dict.fromkeys(to_uuid(value) for value in application_ids))
+    updated = []
+    with transaction.atomic():
+        for start in range(0, len(ids), chunk_size):
+            updated += _update(ids[start:start + chunk_size], from_status, changes)
+        stats.record_transition(updated, from_status, to_status, chunk_size)
+
+    done = set(updated)
+    skipped = {pk: None for pk in ids if pk not in done}
+    if skipped:
+        statuses = DriversLicenseApplication.objects.filter(pk__in=list(skipped)).values_list('pk', 'status')
+        skipped.update(statuses.iterator(chunk_size=chunk_size))
+    return TransitionResult(updated, skipped)
+
+
+def supports_update_returning():
+    """Return True if the database runs ``UPDATE ... RETURNING`` (PostgreSQL, SQLite 3.35+)."""
+    # The flag tracks RETURNING support on SQLite; MariaDB sets it without supporting UPDATE ... RETURNING.
+    return connection.vendor in ('postgresql', 'sqlite') and connection.features.can_return_rows_from_bulk_insert
+
+
+def _update(ids, from_status, changes):
+    """Apply ``changes`` to the rows of ``ids`` still in ``from_status``; return the ids updated."""
+    if supports_update_returning():
+        return _update_returning(ids, from_status, changes)
+    # No UPDATE ... RETURNING: lock the matching rows first so the report stays exact.
+    rows = DriversLicenseApplication.objects.select_for_update().filter(pk__in=ids, status=from_status)
+    matched = list(rows.values_list('pk', flat=True))
+    DriversLicenseApplication.objects.filter(pk__in=matched, status=from_status).update(**changes)
+    return matched
+
+
+def _update_returning(ids, from_status, changes):
+    """Run the conditional ``UPDATE ... RETURNING`` for one chunk of ids."""
+    meta = DriversLicenseApplication._meta
+    quote = connection.ops.quote_name
+    pk = meta.pk
+    status = meta.get_field('status')
+    assignments = ', '.join(f'{quote(meta.get_field(name).column)} = %s' for name in changes)
+    placeholders = ', '.join(['%s'] * len(ids))
+    sql = (
+        f'UPDATE {quote(meta.db_table)} SET {assignments} '
+        f'WHERE {quote(status.column)} = %s AND {quote(pk.column)} IN ({placeholders}) '
+        f'RETURNING {quote(pk.column)}'
+    )
+    params = [meta.get_field(name).get_db_prep_save(value, connection) for name, value in changes.items()]
+    params.append(status.get_db_prep_value(from_status, connection))
+    params += [pk.get_db_prep_value(value, connection) for value in ids]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [pk.to_python(row[0]) for row in cursor.fetchall()]
@@ -3,11 +3,21 @@ from .views import (
     CreateDriversLicenseApplicationView,
     RenewDriversLicenseApplicationView,
     ReissueDriversLicenseApplicationView,
+    ApplicationExportView,
+    ApplicationTransitionView,
+    ApplicationClaimView,
+    ApplicationListView,
+    ApplicationStatsView,
 )
 
 urlpatterns = [
+    path('applications/', ApplicationListView.as_view(), name='list_applications'),
     path('applications/create/', CreateDriversLicenseApplicationView.as_view(), name='create_application'),
     path('applications/renew/<str:license_id>/', RenewDriversLicenseApplicationView.as_view(), name='renew_application'),
     path('applications/reissue/<str:license_id>/', ReissueDriversLicenseApplicationView.as_view(), name='reissue_application'),
+    path('applications/export/', ApplicationExportView.as_view(), name='export_applications'),
+    path('applications/transitions/', ApplicationTransitionView.as_view(), name='transition_applications'),
+    path('applications/claim/', ApplicationClaimView.as_view(), name='claim_applications'),
+    path('applications/stats/', ApplicationStatsView.as_view(), name='application_stats'),
 ]
 
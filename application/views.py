@@ -4,11 +4,17 @@ from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from .models import DriversLicenseApplication
-from nationalId.models import NationalId
-from license.models import License
-from .serializers import DriversLicenseApplicationSerializer
-from django.utils import timezone
-from django.shortcuts import get_object_or_404
+from .serializers import (DriversLicenseApplicationSerializer, ApplicationExportFilterSerializer,
+                          ApplicationTransitionSerializer, ApplicationClaimSerializer,
+                          ApplicationListSerializer, ApplicationListFilterSerializer,
+                          ApplicationStatsFilterSerializer)
+from .exports import EXPORT_FORMATS, export_queryset, iter_rows, stream_export
+from . import claims, services, stats, transitions
+from .services import ApplicationError
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from config.pagination import KeysetPagination
+from rest_framework.views import APIView
 
 class CreateDriversLicenseApplicationView(generics.CreateAPIView):
     """
@@ -18,15 +24,6 @@ class CreateDriversLicenseApplicationView(generics.CreateAPIView):
     queryset = DriversLicenseApplication.objects.all()
     serializer_class = DriversLicenseApplicationSerializer
 
-    def perform_create(self, serializer):
-        national_id_no = self.request.data.get('nationalId')
-        try:
-            national_id = NationalId.objects.get(pk=national_id_no)
-        except NationalId.DoesNotExist:
-            raise serializers.ValidationError("NationalId does not exist")
-        
-        serializer.save(nationalId=national_id)
-
     def create(self, request, *args, **kwargs):
         """
         Create a new driver's license application.
@@ -79,9 +76,7 @@ class CreateDriversLicenseApplicationView(generics.CreateAPIView):
             }
         - 400 Bad Request: Invalid data provided
         """
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        serializer = services.create_application(request.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 class RenewDriversLicenseApplicationView(generics.CreateAPIView):
@@ -96,6 +91,9 @@ class RenewDriversLicenseApplicationView(generics.CreateAPIView):
         """
         Create a renewal application for an existing driver's license.
 
+        Runs in a single transaction with the license row locked, so concurrent
+        submissions for the same license cannot both succeed.
+
         Parameters:
         - is_motor_cycle (boolean): Whether the application is for a motorcycle license
         - is_motor_vehicle (boolean): Whether the application is for a motor vehicle license
@@ -103,7 +101,7 @@ class RenewDriversLicenseApplicationView(generics.CreateAPIView):
         - nationalId (integer): The National ID number of the applicant
         - application_type (string): The type of application (should be "Renewal")
         - license_id (string): The ID of the license to renew
-        - status (string): The status of the application (e.g., "Pending")
+        - status (string): Ignored; renewals start as "Renewal Pending"
         - local_government_area (string): The local government area
         - state (string): The state
         - center_locations (string): The center locations
@@ -126,65 +124,10 @@ class RenewDriversLicenseApplicationView(generics.CreateAPIView):
         - 400 Bad Request: Invalid data or existing renewal application
         - 404 Not Found: License not found
         """
-        license_id = self.kwargs.get('license_id')
-        license = get_object_or_404(License, licenseId=license_id)
-
-        # Get nationalId from request data
-        national_id_no = request.data.get('nationalId')
-        if not national_id_no:
-            return Response({"error": "NationalId is required."}, status=status.HTTP_400_BAD_REQUEST)
-
         try:
-            national_id = NationalId.objects.get(pk=national_id_no)
-        except NationalId.DoesNotExist:
-            return Response({"error": "Invalid NationalId."}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Check for existing renewal application
-        existing_renewal = DriversLicenseApplication.objects.filter(
-            nationalId=national_id,
-            license=license,
-            application_type='Renewal',
-            status__in=['Renewal Pending', 'Renewal Processing']
-        ).first()
-
-        if existing_renewal:
-            return Response({"error": "A renewal application for this license is already in progress."}, status=status.HTTP_400_BAD_REQUEST)
-
-        
-        # Additional check to see if a renewal application for the specific driver's license exists
-        if DriversLicenseApplication.objects.filter(nationalId=national_id, license=license).exists():
-            return Response({"error": "A renewal application for this license is already in progress."}, status=status.HTTP_400_BAD_REQUEST)
-
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        # Create the renewal application
-        renewal_application, created = DriversLicenseApplication.objects.get_or_create(
-        nationalId=national_id,
-        license=license,
-        defaults={
-            'is_motor_cycle': request.data.get('is_motor_cycle'),
-            'is_motor_vehicle': request.data.get('is_motor_vehicle'),
-            'certificate_number': request.data.get('certificate_number'),
-            'application_type': 'Renewal',  # Hardcoded as per your requirement
-            'status': request.data.get('status'),
-            'local_government_area': request.data.get('local_government_area'),
-            'state': request.data.get('state'),
-            'center_locations': request.data.get('center_locations'),
-            'email': request.data.get('email'),
-            'phoneNumber': request.data.get('phoneNumber'),
-            'reissue_reason': request.data.get('reissue_reason'),
-            'reissue_police_report': request.data.get('reissue_police_report'),
-            'previous_license_id': request.data.get('previous_license_id'),
-            'renewal_applied_at': timezone.now(),  # Assuming current time for now
-            'renewal_approved_at': None,  
-            'reissue_applied_at': None, 
-            'reissue_approved_at': None,  
-            }
-        )
+            renewal_application = services.renew_application(self.kwargs.get('license_id'), request.data)
+        except ApplicationError as error:
+            return Response({"error": error.message}, status=error.status_code)
 
         return Response({
             "message": "Renewal application submitted successfully.",
@@ -205,6 +148,8 @@ class ReissueDriversLicenseApplicationView(generics.CreateAPIView):
         Create a reissue application for an existing driver's license.
 
         This is a multipart form where the police report is uploaded as a file.
+        Runs in a single transaction with the license row locked, so concurrent
+        submissions for the same license cannot both succeed.
 
         Parameters:
         - is_motor_cycle (boolean): Whether the application is for a motorcycle license
@@ -213,7 +158,7 @@ class ReissueDriversLicenseApplicationView(generics.CreateAPIView):
         - nationalId (integer): The National ID number of the applicant
         - application_type (string): The type of application (should be "Reissue")
         - license_id (string): The ID of the license to reissue
-        - status (string): The status of the application (e.g., "Pending")
+        - status (string): Ignored; reissues start as "Reissue Pending"
         - local_government_area (string): The local government area
         - state (string): The state
         - center_locations (string): The center locations
@@ -236,65 +181,228 @@ class ReissueDriversLicenseApplicationView(generics.CreateAPIView):
         - 400 Bad Request: Invalid data or existing renewal application
         - 404 Not Found: License not found
         """
-        license_id = request.data.get('license_id')
-        if not license_id:
-            return Response({"error": "License ID is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            reissue_application = services.reissue_application(request.data)
+        except ApplicationError as error:
+            return Response({"error": error.message}, status=error.status_code)
+
+        return Response({
+            "message": "Reissue application submitted successfully.",
+            "application_id": reissue_application.application_id
+        }, status=status.HTTP_201_CREATED)
+
+
+class ApplicationExportView(APIView):
+    """Stream a full export of driver's license applications (staff only)."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Export applications as NDJSON or CSV.
+
+        Rows are streamed from a server-side cursor, so the response starts
+        immediately and memory use does not grow with the size of the export.
+
+        Parameters:
+        - export_format (query, string): "ndjson" (default) or "csv"
+        - state (query, string): Only applications in this state
+        - status (query, string): Only applications with this status
+        - application_type (query, string): Only applications of this type
+        - applied_after (query, datetime): Only applications applied at or after this time
+        - applied_before (query, datetime): Only applications applied before this time
+
+        Returns:
+        - 200 OK: Streamed export, one application per line
+        - 400 Bad Request: Invalid filter
+        - 403 Forbidden: The user is not staff
+        """
+        filters = ApplicationExportFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        options = dict(filters.validated_data)
+        export_format = options.pop('export_format')
+
+        rows = iter_rows(export_queryset(**options))
+        response = StreamingHttpResponse(stream_export(export_format, rows), content_type=EXPORT_FORMATS[export_format])
+        response['Content-Disposition'] = f'attachment; filename="applications.{export_format}"'
+        return response
+
+
+class ApplicationTransitionView(APIView):
+    """Move many applications from one status to the next (staff only)."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Apply one status transition to a batch of applications.
+
+        Applications not in from_status when the update runs are left
+        untouched and reported as skipped with their current status. Moving to
+        "Renewed" or "Reissued" also sets renewal_approved_at or
+        reissue_approved_at.
+
+        Parameters:
+        - application_ids (list of UUIDs): The applications to move
+        - from_status (string): The status the applications must be in
+        - to_status (string): The next status, e.g. "Processing" -> "Approved"
+
+        Returns:
+        - 200 OK: The transition was applied
+            {
+                "updated": integer,
+                "skipped": [{"application_id": "string (UUID)", "status": "string or null"}]
+            }
+        - 400 Bad Request: Invalid input or a transition that is not allowed
+        - 403 Forbidden: The user is not staff
+        """
+        serializer = ApplicationTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = transitions.transition(**serializer.validated_data)
+        except ApplicationError as error:
+            return Response({"error": error.message}, status=error.status_code)
+
+        return Response({
+            "updated": len(result.updated),
+            "skipped": [
+                {"application_id": application_id, "status": current}
+                for application_id, current in result.skipped.items()
+            ],
+        }, status=status.HTTP_200_OK)
+
+
+class ApplicationClaimView(APIView):
+    """Claim the next applications waiting at a center (staff only)."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Claim up to limit applications at a center for the requesting clerk.
 
-        license = get_object_or_404(License, licenseId=license_id)
+        Claimed applications move to the matching processing status (e.g.
+        "Pending" -> "Processing") and are leased to the clerk for
+        APPLICATION_CLAIM_LEASE seconds. Applications whose lease expired before
+        they were moved on are claimed first, then the oldest pending ones.
+        Two clerks never receive the same application.
 
-        # Get nationalId from request data
-        national_id_no = request.data.get('nationalId')
-        if not national_id_no:
-            return Response({"error": "NationalId is required."}, status=status.HTTP_400_BAD_REQUEST)
+        Parameters:
+        - center_locations (string): The center to claim applications at
+        - status (string): "Pending" (default), "Renewal Pending" or "Reissue Pending"
+        - limit (integer): The most applications to claim (default 10)
 
+        Returns:
+        - 200 OK: The claimed applications, possibly none
+            {
+                "applications": [{"application_id": "string (UUID)", "status": "string",
+                                  "lease_expires_at": "datetime", ...}]
+            }
+        - 400 Bad Request: Invalid input or a status that cannot be claimed
+        - 403 Forbidden: The user is not staff
+        """
+        serializer = ApplicationClaimSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
         try:
-            national_id = NationalId.objects.get(pk=national_id_no)
-        except NationalId.DoesNotExist:
-            return Response({"error": "Invalid NationalId."}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Check for existing renewal application
-        existing_renewal = DriversLicenseApplication.objects.filter(
-            nationalId=national_id,
-            license=license,
-            application_type='Renewal',
-            status__in=['Renewal Pending', 'Renewal Processing']
-        ).exists()
-
-        if existing_renewal:
-            return Response({"error": "A renewal application for this license is already in progress."},status=status.HTTP_400_BAD_REQUEST)
-
-        # Convert boolean fields from string to boolean
-        is_motor_cycle = request.data.get('is_motor_cycle', '').lower() == 'true'
-        is_motor_vehicle = request.data.get('is_motor_vehicle', '').lower() == 'true'
-
-        # Extract reissue reason
-        reissue_reason = request.data.get('reissue_reason')
-
-        # Handle uploaded police report file
-        reissue_police_report = request.FILES.get('reissue_police_report')
-
-        # Create or update the reissue application
-        reissue_application = DriversLicenseApplication.objects.create(
-            nationalId=national_id,
-            license=license,
-            application_type='Reissue',  # Hardcoded as per your requirement
-            status='Reissue Pending',  # Assuming initial status
-            is_motor_cycle=is_motor_cycle,
-            is_motor_vehicle=is_motor_vehicle,
-            certificate_number=request.data.get('certificate_number'),
-            local_government_area=request.data.get('local_government_area'),
-            state=request.data.get('state'),
-            center_locations=request.data.get('center_locations'),
-            email=request.data.get('email'),
-            phoneNumber=request.data.get('phoneNumber'),
-            reissue_reason=reissue_reason,
-            reissue_police_report=reissue_police_report,
-            previous_license_id=request.data.get('previous_license_id'),
-            reissue_applied_at=timezone.now(),  # Assuming current time for reissue
-            reissue_approved_at=None,
+            claimed = claims.claim(data['center_locations'], request.user, data['limit'], status=data['status'])
+        except ApplicationError as error:
+            return Response({"error": error.message}, status=error.status_code)
+
+        return Response(
+            {"applications": DriversLicenseApplicationSerializer(claimed, many=True).data},
+            status=status.HTTP_200_OK,
+        )
+
+
+class ApplicationPagination(KeysetPagination):
+    """Keyset pagination of applications, newest first."""
+
+    ordering = ('-applied_at', '-application_id')
+    page_size = settings.APPLICATION_LIST_PAGE_SIZE
+    max_page_size = settings.APPLICATION_LIST_MAX_PAGE_SIZE
+
+
+class ApplicationListView(generics.ListAPIView):
+    """List driver's license applications, newest first (staff only)."""
+
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = ApplicationListSerializer
+    pagination_class = ApplicationPagination
+
+    def get_queryset(self):
+        """Return the applications matching the query parameters, with their license and applicant."""
+        filters = ApplicationListFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        return DriversLicenseApplication.objects.filter(**filters.validated_data).select_related(
+            'license', 'nationalId',
         )
 
+    def list(self, request, *args, **kwargs):
+        """
+        List applications, newest first, one page at a time.
+
+        Pages are cursor based: follow the "next" link to read the next page.
+        Every page costs the same however deep it is, and rows added while
+        paging never shift later pages.
+
+        Query parameters (all optional):
+        - state (string): Only applications in this state
+        - local_government_area (string): Only applications in this local government area
+        - center_locations (string): Only applications at this center
+        - status (string): Only applications in this status
+        - application_type (string): "New", "Renewal" or "Reissue"
+        - page_size (integer): Applications per page (default APPLICATION_LIST_PAGE_SIZE)
+        - cursor (string): The position of the page, taken from the "next" link
+
+        Returns:
+        - 200 OK: One page of applications
+            {
+                "next": "string (URL) or null",
+                "results": [{"application_id": "string (UUID)", "applicant_name": "string",
+                             "licenseId": "string or null", "license_expiry_date": "date or null", ...}]
+            }
+        - 400 Bad Request: Invalid filters
+        - 403 Forbidden: The user is not staff
+        - 404 Not Found: Invalid cursor
+        """
+        return super().list(request, *args, **kwargs)
+
+
+class ApplicationStatsView(APIView):
+    """Application counts by day, state, center and status (staff only)."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Count applications, grouped and filtered.
+
+        Counts are read from a rollup kept up to date as applications are
+        created and change status, so they cost the same however many
+        applications there are. "day" is the day the application was made.
+
+        Query parameters (all optional):
+        - group_by (string, repeatable): "day", "state", "center_locations" and/or "status" (default "status")
+        - state (string): Only applications in this state
+        - center_locations (string): Only applications at this center
+        - status (string): Only applications in this status
+        - date_from (date): Only applications made on or after this day
+        - date_to (date): Only applications made on or before this day
+
+        Returns:
+        - 200 OK: One count per group
+            {
+                "total": integer,
+                "results": [{"status": "string", "count": integer}]
+            }
+        - 400 Bad Request: Invalid parameters
+        - 403 Forbidden: The user is not staff
+        """
+        filters = ApplicationStatsFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        results = stats.counts(**filters.validated_data)
         return Response({
-            "message": "Reissue application submitted successfully.",
-            "application_id": reissue_application.application_id
-        }, status=status.HTTP_201_CREATED)
+            "total": sum(row["count"] for row in results),
+            "results": results,
+        }, status=status.HTTP_200_OK)
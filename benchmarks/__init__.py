@@ -0,0 +1,5 @@
+"""Endpoint-level performance benchmarks.
+
+Run with ``python -m benchmarks``. The suite seeds a throwaway test database,
+times every API route and compares the results against ``baseline.json``.
+"""
@@ -0,0 +1,84 @@
+"""Command line entry point: ``python -m benchmarks``."""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--citizens", type=int, default=10000, help="National ids (and licenses) to seed.")
+    parser.add_argument("--users", type=int, default=1000, help="User accounts to seed.")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed requests per scenario.")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per scenario.")
+    parser.add_argument("--only", nargs="*", help="Run only these scenarios.")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the results.")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed latency increase over the baseline, as a fraction (default 0.25).")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results to the baseline.")
+    parser.add_argument("--auth-profiles", action="store_true",
+                        help="Also time authentication under each API_AUTH_PROFILES profile.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the suite against a throwaway test database."""
+    args = parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    from .auth import format_auth_table, run_auth_profiles
+    from .runner import compare, context_user, format_table, run_suite
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        results = run_suite(args.citizens, args.users, args.iterations, args.warmup, args.only)
+        if args.auth_profiles:
+            results["auth_profiles"] = run_auth_profiles(context_user(), args.iterations, args.warmup)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+    print(format_table(results, baseline))
+    if args.auth_profiles:
+        print()
+        print(format_auth_table(results["auth_profiles"]))
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline updated: {baseline_path}")
+        return 0
+
+    if baseline is None:
+        print("No baseline to compare against.")
+        return 0
+
+    try:
+        regressions = compare(results, baseline, args.threshold)
+    except ValueError as error:
+        print(f"{error} Rerun with the baseline's parameters, or refresh it with --update-baseline.")
+        return 2
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Per-request authentication cost under each ``API_AUTH_PROFILES`` profile.
+
+Each profile's authenticators are run against a request carrying Basic
+credentials, a session cookie (for each session engine) or a bearer token,
+and the time and queries it takes to resolve ``request.user`` are recorded.
+"""
+import base64
+import statistics
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts import cache as user_cache
+from accounts.tokens import RefreshToken
+
+from .runner import percentile
+from .seed import PASSWORD
+
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+
+
+def _session_credentials(engine, user):
+    """Return a ``(name, prepare)`` pair for a session cookie stored by ``engine``."""
+    store = import_module(SESSION_ENGINES[engine]).SessionStore()
+    store["_auth_user_id"] = str(user.pk)
+    store["_auth_user_backend"] = settings.AUTHENTICATION_BACKENDS[0]
+    store["_auth_user_hash"] = user.get_session_auth_hash()
+    store.save()
+
+    def prepare(request):
+        # What SessionMiddleware and AuthenticationMiddleware do.
+        request.session = import_module(SESSION_ENGINES[engine]).SessionStore(store.session_key)
+        request.user = SimpleLazyObject(lambda: get_user(request))
+
+    return f"session ({engine})", prepare
+
+
+def credentials(user):
+    """Return ``(name, prepare)`` pairs, each preparing a request for one kind of credentials."""
+    basic = base64.b64encode(f"{user.email}:{PASSWORD}".encode()).decode()
+    bearer = str(RefreshToken.for_user(user).access_token)
+
+    def with_header(value):
+        def prepare(request):
+            request.META["HTTP_AUTHORIZATION"] = value
+        return prepare
+
+    return [
+        ("basic", with_header(f"Basic {basic}")),
+        *(_session_credentials(engine, user) for engine in SESSION_ENGINES),
+        ("jwt", with_header(f"Bearer {bearer}")),
+    ]
+
+
+def time_authentication(authenticators, prepare, iterations, warmup):
+    """Return latencies (ms), median queries and whether the last request authenticated."""
+    factory = APIRequestFactory()
+    latencies, queries = [], []
+    authenticated = False
+    for i in range(warmup + iterations):
+        django_request = factory.get("/api/licenses/bench/")
+        prepare(django_request)
+        request = Request(django_request, authenticators=[cls() for cls in authenticators])
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            authenticated = request.user.is_authenticated
+            elapsed = time.perf_counter() - started
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            queries.append(len(captured))
+    return latencies, int(statistics.median(queries)), authenticated
+
+
+def run_auth_profiles(user, iterations=200, warmup=20):
+    """Time every kind of credentials under every profile and return the rows."""
+    rows = []
+    for profile, paths in settings.API_AUTH_PROFILES.items():
+        authenticators = [import_string(path) for path in paths]
+        for name, prepare in credentials(user):
+            user_cache.clear()
+            latencies, queries, authenticated = time_authentication(authenticators, prepare, iterations, warmup)
+            rows.append({
+                "profile": profile,
+                "credentials": name,
+                "authenticated": authenticated,
+                "p50_ms": round(percentile(latencies, 50), 3),
+                "p95_ms": round(percentile(latencies, 95), 3),
+                "queries": queries,
+            })
+    return rows
+
+
+def format_auth_table(rows):
+    """Return the auth profile rows as a fixed-width table."""
+    header = f"{'profile':<10}{'credentials':<26}{'auth':>6}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['profile']:<10}{row['credentials']:<26}{'yes' if row['authenticated'] else 'no':>6}"
+            f"{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}{row['queries']:>9}"
+        )
+    return "\n".join(lines)
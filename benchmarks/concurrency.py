@@ -0,0 +1,120 @@
+r"""
+Compare concurrent license verification throughput between deployments.
+
+Runs against servers that are already up, e.g. the same database served once
+with sync workers and once with uvicorn workers::
+
+    SERVER_MODE=wsgi PORT=8000 scripts/entrypoint.sh
+    SERVER_MODE=asgi PORT=8001 scripts/entrypoint.sh
+
+    python -m benchmarks.concurrency --token "$ACCESS_TOKEN" --license-id DL-0001 \
+        wsgi=http://localhost:8000/api/licenses/ asgi=http://localhost:8001/api/licenses/async/
+
+Each target is hit with ``--concurrency`` simultaneous clients until
+``--requests`` verifications have completed. Throughput, latency percentiles
+and the error count are printed per target.
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from .runner import percentile
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.concurrency",
+        description="Compare concurrent license verification throughput between deployments.",
+    )
+    parser.add_argument("targets", nargs="+", metavar="NAME=URL",
+                        help="License endpoint prefix of each deployment, e.g. asgi=http://host/api/licenses/async/.")
+    parser.add_argument("--token", required=True, help="JWT access token sent as a Bearer token.")
+    parser.add_argument("--license-id", action="append", required=True, dest="license_ids",
+                        help="License id to verify; repeat to rotate through several.")
+    parser.add_argument("--bulk", action="store_true", help="POST all ids to bulk/verify/ instead of GET per id.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Simultaneous clients (default 50).")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per target (default 2000).")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    return parser.parse_args(argv)
+
+
+def build_request(prefix, token, license_ids, index, bulk):
+    """Return the ``index``-th request to send to the endpoint under ``prefix``."""
+    headers = {"Authorization": f"Bearer {token}"}
+    if bulk:
+        body = json.dumps({"license_ids": license_ids}).encode()
+        headers["Content-Type"] = "application/json"
+        return urllib.request.Request(f"{prefix}bulk/verify/", data=body, headers=headers, method="POST")
+    license_id = license_ids[index % len(license_ids)]
+    return urllib.request.Request(f"{prefix}{license_id}/", headers=headers)
+
+
+def send(request, timeout):
+    """Send ``request`` and return ``(latency in ms, succeeded)``."""
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            ok = response.status < 400
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return (time.perf_counter() - started) * 1000, ok
+
+
+def run_target(prefix, args):
+    """Hit one deployment and return its throughput and latency summary."""
+    requests = [
+        build_request(prefix, args.token, args.license_ids, index, args.bulk) for index in range(args.requests)
+    ]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(lambda request: send(request, args.timeout), requests))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, ok in outcomes if ok]
+    return {
+        "requests": len(outcomes),
+        "errors": len(outcomes) - len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 3) if latencies else None,
+    }
+
+
+def format_results(results):
+    """Return ``results`` as an aligned text table."""
+    lines = [f"{'target':<12}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"]
+    for name, row in results.items():
+        cells = [row["p50_ms"], row["p95_ms"], row["p99_ms"]]
+        latency = "".join(f"{cell:>10.2f}" if cell is not None else f"{'-':>10}" for cell in cells)
+        lines.append(f"{name:<12}{row['throughput_rps']:>10.1f}{latency}{row['errors']:>8}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Benchmark every target in turn and print the comparison."""
+    args = parse_args(argv)
+    results = {}
+    for target in args.targets:
+        name, _, prefix = target.partition("=")
+        if not prefix:
+            sys.exit(f"Target {target!r} must look like NAME=URL")
+        results[name] = run_target(prefix if prefix.endswith("/") else prefix + "/", args)
+
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+            output.write("\n")
+    return 1 if any(row["errors"] for row in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
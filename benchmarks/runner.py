@@ -0,0 +1,176 @@
+"""Run the benchmark scenarios and compare results against a baseline."""
+import platform
+import statistics
+import time
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.tokens import RefreshToken
+
+from .scenarios import SCENARIOS
+from .seed import seed
+
+User = get_user_model()
+
+# Metrics where a higher value is a regression, and how each is compared.
+LATENCY_METRICS = ["p50_ms", "p95_ms"]
+QUERY_METRIC = "queries"
+
+# Run parameters that must match the baseline's for the results to be comparable.
+COMPARED_PARAMETERS = ["citizens", "users", "iterations", "warmup", "database"]
+
+
+def percentile(samples, percent):
+    """Return the ``percent``-th percentile of ``samples`` (nearest rank)."""
+    ordered = sorted(samples)
+    rank = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def context_user():
+    """Return the seeded user requests are authenticated as."""
+    return User.objects.order_by("pk").first()
+
+
+def build_context(citizens, users, iterations, warmup):
+    """Seed the database and return the data scenarios draw from."""
+    needed = 2 * (iterations + warmup)
+    if citizens < needed + 100:
+        raise ValueError(f"citizens must be at least {needed + 100} for {iterations} iterations")
+
+    license_ids = seed(citizens, max(users, 1))
+    user = context_user()
+    return {
+        "license_ids": license_ids,
+        "user": user,
+        "refresh": str(RefreshToken.for_user(user)),
+        "access": str(RefreshToken.for_user(user).access_token),
+        "renew_offset": 0,
+        "reissue_offset": iterations + warmup,
+    }
+
+
+def run_scenario(scenario, context, iterations, warmup):
+    """Time ``iterations`` requests of ``scenario`` after ``warmup`` untimed ones."""
+    client = APIClient()
+    if scenario.authenticated:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {context['access']}")
+    send = getattr(client, scenario.method)
+    if scenario.prepare:
+        scenario.prepare(client, context)
+
+    latencies, queries = [], []
+    started = time.perf_counter()
+    for i in range(warmup + iterations):
+        path, payload = scenario.build(i, context)
+        kwargs = {"format": scenario.format} if payload is not None else {}
+        with CaptureQueriesContext(connection) as captured:
+            request_started = time.perf_counter()
+            response = send(path, payload, **kwargs) if payload is not None else send(path)
+            elapsed = time.perf_counter() - request_started
+        if response.status_code != scenario.expected_status:
+            raise AssertionError(
+                f"{scenario.name}: expected {scenario.expected_status}, got {response.status_code}: "
+                f"{getattr(response, 'data', response.content)!r}"
+            )
+        if i == warmup - 1:
+            started = time.perf_counter()
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            queries.append(len(captured))
+    total = time.perf_counter() - started
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "throughput_rps": round(iterations / total, 1) if total else None,
+        "queries": int(statistics.median(queries)),
+    }
+
+
+def run_suite(citizens=10000, users=1000, iterations=200, warmup=20, only=None):
+    """Seed the database, run every scenario and return the results document."""
+    context = build_context(citizens, users, iterations, warmup)
+    for cache in caches.all():
+        cache.clear()
+
+    results = {}
+    for scenario in SCENARIOS:
+        if only and scenario.name not in only:
+            continue
+        results[scenario.name] = run_scenario(scenario, context, iterations, warmup)
+
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "citizens": citizens,
+            "users": users,
+            "iterations": iterations,
+            "warmup": warmup,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Return a list of regressions of ``results`` against ``baseline``.
+
+    Latency metrics regress when they exceed the baseline by more than
+    ``threshold`` (a fraction), except for scenarios that do not compare
+    latency; query counts regress on any increase. Raises ``ValueError`` if
+    the two runs differ in any of ``COMPARED_PARAMETERS``.
+    """
+    mismatched = [
+        f"{parameter}={results.get('meta', {}).get(parameter)} "
+        f"(baseline {baseline.get('meta', {}).get(parameter)})"
+        for parameter in COMPARED_PARAMETERS
+        if results.get("meta", {}).get(parameter) != baseline.get("meta", {}).get(parameter)
+    ]
+    if mismatched:
+        raise ValueError(f"Not comparable with the baseline: {', '.join(mismatched)}.")
+
+    latency_compared = {scenario.name for scenario in SCENARIOS if scenario.compare_latency}
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for metric in LATENCY_METRICS:
+            if name in latency_compared and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {current[metric]} > {previous[metric]} (+{threshold:.0%} allowed)"
+                )
+        if current[QUERY_METRIC] > previous[QUERY_METRIC]:
+            regressions.append(f"{name}: {QUERY_METRIC} {current[QUERY_METRIC]} > {previous[QUERY_METRIC]}")
+    return regressions
+
+
+def format_table(results, baseline=None):
+    """Return the results as a fixed-width table, with baseline p50 if given."""
+    header = f"{'scenario':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>9}"
+    if baseline:
+        header += f"{'base p50':>10}"
+    lines = [header, "-" * len(header)]
+    for name, row in results["scenarios"].items():
+        line = (
+            f"{name:<24}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+            f"{row['throughput_rps'] or 0:>10.1f}{row['queries']:>9}"
+        )
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous:
+            line += f"{previous['p50_ms']:>10.2f}"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,121 @@
+"""The requests measured by the benchmark suite, one per API route."""
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.urls import reverse
+
+from .seed import FIRST_ID_NO, PASSWORD
+
+# Licenses looked up over and over by the license_detail_hot scenario.
+HOT_LICENSES = 50
+
+
+@dataclass
+class Scenario:
+    """
+    A request to time.
+
+    ``build`` receives the iteration number and the suite context and returns
+    ``(path, payload)``; ``payload`` is ``None`` for GET requests. ``prepare``,
+    if given, is called with the client and the context before the warm-up
+    requests. Scenarios with ``compare_latency`` off are only compared with
+    the baseline on their query counts.
+    """
+
+    name: str
+    method: str
+    build: Callable
+    expected_status: int = 200
+    authenticated: bool = True
+    format: str = "json"
+    options: dict = field(default_factory=dict)
+    prepare: Callable = None
+    compare_latency: bool = True
+
+
+def _application(index, **overrides):
+    """Return the request body of an application for citizen ``index``."""
+    data = {
+        "nationalId": FIRST_ID_NO + index,
+        "is_motor_cycle": False,
+        "is_motor_vehicle": True,
+        "certificate_number": 1000 + index,
+        "application_type": "New",
+        "local_government_area": "Bench LGA",
+        "state": "Lagos",
+        "center_locations": "Bench Center",
+        "email": "citizen@bench.example.com",
+        "phoneNumber": "+2348000000000",
+    }
+    data.update(overrides)
+    return data
+
+
+def _register(i, context):
+    return reverse("register"), {"email": f"new{i}@bench.example.com", "password": PASSWORD}
+
+
+def _login(i, context):
+    return reverse("login"), {"email": context["user"].email, "password": PASSWORD}
+
+
+def _token_refresh(i, context):
+    return reverse("token_refresh"), {"refresh": context["refresh"]}
+
+
+def _warm_license_detail_hot(client, context):
+    # Cache the whole working set, so every timed lookup is a hit.
+    for license_id in context["license_ids"][:HOT_LICENSES]:
+        client.get(reverse("license_detail", args=[license_id]))
+
+
+def _license_detail_hot(i, context):
+    license_ids = context["license_ids"]
+    return reverse("license_detail", args=[license_ids[i % HOT_LICENSES]]), None
+
+
+def _license_detail_cold(i, context):
+    # A different license every time, so every lookup misses the cache.
+    license_ids = context["license_ids"]
+    return reverse("license_detail", args=[license_ids[-(i + 1)]]), None
+
+
+def _license_bulk_verify(i, context):
+    license_ids = context["license_ids"]
+    start = (i * 100) % max(len(license_ids) - 100, 1)
+    return reverse("license_bulk_verify"), {"license_ids": license_ids[start:start + 100]}
+
+
+def _create_application(i, context):
+    return reverse("create_application"), _application(i)
+
+
+def _renew_application(i, context):
+    # Each renewal needs a license the citizen has not applied for yet.
+    index = context["renew_offset"] + i
+    return reverse("renew_application", args=[context["license_ids"][index]]), _application(
+        index, application_type="Renewal"
+    )
+
+
+def _reissue_application(i, context):
+    index = context["reissue_offset"] + i
+    license_id = context["license_ids"][index]
+    return reverse("reissue_application", args=[license_id]), _application(
+        index, application_type="Reissue", license_id=license_id, reissue_reason="Lost"
+    )
+
+
+# register and login spend nearly all their time hashing the password with
+# PBKDF2, which varies too much between runs for a latency threshold.
+SCENARIOS = [
+    Scenario("register", "post", _register, expected_status=201, authenticated=False, compare_latency=False),
+    Scenario("login", "post", _login, authenticated=False, compare_latency=False),
+    Scenario("token_refresh", "post", _token_refresh, authenticated=False),
+    Scenario("license_detail_hot", "get", _license_detail_hot, prepare=_warm_license_detail_hot),
+    Scenario("license_detail_cold", "get", _license_detail_cold),
+    Scenario("license_bulk_verify", "post", _license_bulk_verify),
+    Scenario("create_application", "post", _create_application, expected_status=201),
+    Scenario("renew_application", "post", _renew_application, expected_status=201),
+    Scenario("reissue_application", "post", _reissue_application, expected_status=201, format="multipart"),
+]
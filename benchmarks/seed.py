@@ -0,0 +1,70 @@
+"""Seed realistic volumes of rows for the benchmarks."""
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from application.models import DriversLicenseApplication
+from license.models import License
+from nationalId.models import NationalId
+
+User = get_user_model()
+
+PASSWORD = "benchmark-password"
+
+FIRST_ID_NO = 10_000_000
+
+STATES = ["Lagos", "Abuja", "Kano", "Rivers", "Oyo", "Kaduna"]
+
+
+def seed(citizens, users, batch_size=5000, rng=None):
+    """
+    Seed ``citizens`` national ids and ``users`` accounts.
+
+    Every citizen gets one license and two new applications; every account
+    shares :data:`PASSWORD`. Returns the ``licenseId`` of every seeded license.
+    """
+    rng = rng or random.Random(0)
+    today = date.today()
+    password = make_password(PASSWORD)
+
+    User.objects.bulk_create(
+        [User(email=f"user{index}@bench.example.com", password=password) for index in range(users)],
+        batch_size=batch_size,
+    )
+
+    license_ids = []
+    for start in range(0, citizens, batch_size):
+        id_nos = range(FIRST_ID_NO + start, FIRST_ID_NO + min(start + batch_size, citizens))
+        NationalId.objects.bulk_create([
+            NationalId(idNo=id_no, firstName=f"First{id_no}", lastName=f"Last{id_no}", DOB=date(1990, 1, 1))
+            for id_no in id_nos
+        ])
+        licenses = License.objects.bulk_create([
+            License(
+                IdNo_id=id_no,
+                licenseId=f"BENCH{id_no}",
+                issue_date=today - timedelta(days=rng.randint(0, 3650)),
+                expiry_date=today + timedelta(days=rng.randint(-730, 3650)),
+                passport_photo="passport_photos/bench.jpg",
+            )
+            for id_no in id_nos
+        ])
+        license_ids.extend(license.licenseId for license in licenses)
+        DriversLicenseApplication.objects.bulk_create([
+            DriversLicenseApplication(
+                nationalId_id=id_no,
+                application_type="New",
+                status=rng.choice(["Pending", "Processing", "Approved", "Ready for Printing"]),
+                certificate_number=rng.randint(1, 10 ** 6),
+                local_government_area="Bench LGA",
+                state=rng.choice(STATES),
+                center_locations="Bench Center",
+                email="citizen@bench.example.com",
+                phoneNumber="+2348000000000",
+            )
+            for id_no in id_nos
+            for _ in range(2)
+        ])
+    return license_ids
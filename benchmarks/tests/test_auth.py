@@ -0,0 +1,21 @@
+"""Auth profile benchmark tests."""
+import pytest
+from django.contrib.auth import get_user_model
+
+from benchmarks.auth import (SESSION_ENGINES, format_auth_table,
+                             run_auth_profiles)
+from benchmarks.seed import PASSWORD
+
+
+@pytest.mark.django_db
+def test_run_auth_profiles_smoke(settings):
+    """Test every profile is timed against every kind of credentials."""
+    user = get_user_model().objects.create_user(email="bench@example.com", password=PASSWORD)
+    rows = run_auth_profiles(user, iterations=2, warmup=1)
+
+    assert len(rows) == len(settings.API_AUTH_PROFILES) * (len(SESSION_ENGINES) + 2)
+    outcome = {(row["profile"], row["credentials"]): row["authenticated"] for row in rows}
+    assert outcome[("compat", "basic")] and outcome[("compat", "session (db)")]
+    assert outcome[("jwt", "jwt")]
+    assert not outcome[("jwt", "basic")] and not outcome[("jwt", "session (db)")]
+    assert "profile" in format_auth_table(rows)
@@ -0,0 +1,68 @@
+"""Benchmark runner tests."""
+import pytest
+
+from benchmarks.runner import compare, format_table, percentile, run_suite
+from benchmarks.scenarios import SCENARIOS
+
+
+def _results(**rows):
+    return {"scenarios": rows}
+
+
+def _row(p50=1.0, p95=2.0, queries=1):
+    return {"p50_ms": p50, "p95_ms": p95, "p99_ms": p95, "throughput_rps": 10.0, "queries": queries}
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 95) == 95
+    assert percentile([3.0], 99) == 3.0
+
+
+def test_compare_flags_latency_beyond_threshold():
+    """Test latency is only flagged beyond the threshold."""
+    baseline = _results(token_refresh=_row(p50=10.0, p95=20.0))
+    assert compare(_results(token_refresh=_row(p50=12.0, p95=24.0)), baseline, 0.25) == []
+    assert compare(_results(token_refresh=_row(p50=13.0, p95=20.0)), baseline, 0.25) == [
+        "token_refresh: p50_ms 13.0 > 10.0 (+25% allowed)"
+    ]
+
+
+def test_compare_flags_any_extra_query():
+    """Test a single extra query is a regression."""
+    regressions = compare(_results(login=_row(queries=2)), _results(login=_row(queries=1)), 0.25)
+    assert regressions == ["login: queries 2 > 1"]
+
+
+def test_compare_skips_latency_of_hash_bound_scenarios():
+    """Test register and login are compared on queries only."""
+    baseline = _results(register=_row(p50=10.0), login=_row(p95=10.0, queries=1))
+    assert compare(_results(register=_row(p50=99.0), login=_row(p95=99.0, queries=2)), baseline, 0.25) == [
+        "login: queries 2 > 1"
+    ]
+
+
+def test_compare_refuses_different_parameters():
+    """Test runs seeded or timed differently from the baseline are not compared."""
+    meta = {"citizens": 10000, "users": 1000, "iterations": 200, "warmup": 20, "database": "sqlite"}
+    baseline = {"meta": meta, "scenarios": {"login": _row()}}
+    assert compare({"meta": dict(meta), "scenarios": {"login": _row()}}, baseline, 0.25) == []
+
+    with pytest.raises(ValueError, match=r"citizens=600 \(baseline 10000\)"):
+        compare({"meta": {**meta, "citizens": 600}, "scenarios": {"login": _row()}}, baseline, 0.25)
+
+
+def test_compare_ignores_new_scenarios():
+    """Test scenarios missing from the baseline are not compared."""
+    assert compare(_results(login=_row()), _results(), 0.25) == []
+
+
+@pytest.mark.django_db
+def test_run_suite_smoke():
+    """Test every scenario runs and returns the expected status."""
+    results = run_suite(citizens=150, users=2, iterations=2, warmup=1)
+    assert set(results["scenarios"]) == {scenario.name for scenario in SCENARIOS}
+    assert results["scenarios"]["license_detail_hot"]["queries"] == 0
+    assert "base p50" in format_table(results, results)
@@ -0,0 +1,53 @@
+"""A compact Bloom filter for fast "definitely not present" checks."""
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    ``in`` never gives false negatives; false positives happen at roughly
+    ``error_rate`` once ``capacity`` items have been added. The bit array is a
+    plain ``bytearray`` (or any buffer, see :meth:`from_bytes`), so a filter
+    can be written to and mapped from a file.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        """Size the filter for ``capacity`` items at ``error_rate`` false positives."""
+        capacity = max(int(capacity), 1)
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.size = max(bits, 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_bytes(cls, bits, size, hashes):
+        """Return a filter over an existing bit buffer of ``size`` bits."""
+        bloom = cls.__new__(cls)
+        bloom.size = size
+        bloom.hashes = hashes
+        bloom.bits = bits
+        return bloom
+
+    def _positions(self, item):
+        """Yield the bit positions of ``item`` (double hashing over one blake2b digest)."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, item):
+        """Add ``item`` to the filter."""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def update(self, items):
+        """Add every item of ``items``."""
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item):
+        """Return False if ``item`` was definitely never added."""
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
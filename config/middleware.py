@@ -0,0 +1,244 @@
+"""Per-request timing and on-demand profiling."""
+import cProfile
+import io
+import marshal
+import pstats
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.fields import empty
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+# Durations (in seconds) recorded by ``timed`` for the request being handled.
+_timings = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def timed(name):
+    """Add the duration of the block to the current request's ``name`` timing."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that reports its rendering time as ``render``."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render ``data`` to JSON, recording how long it took."""
+        with timed("render"):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class TimedSerializerMixin:
+    """Serializer mixin that reports validation and representation time as ``serializer``."""
+
+    def run_validation(self, data=empty):
+        """Validate ``data``, recording how long it took."""
+        with timed("serializer"):
+            return super().run_validation(data)
+
+    def to_representation(self, instance):
+        """Represent ``instance``, recording how long it took."""
+        with timed("serializer"):
+            return super().to_representation(instance)
+
+
+class QueryStats:
+    """Database execute wrapper counting queries and the time spent in them."""
+
+    def __init__(self):
+        """Start with no queries recorded."""
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Run the query and record its duration."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class ServerTimingMiddleware:
+    """
+    Report where a request's time went in a ``Server-Timing`` header.
+
+    The header carries the number of SQL queries and the time spent in them
+    (``db``), serializer validation and representation (``serializer``, see
+    :class:`TimedSerializerMixin`), the view including the rendering of its
+    response (``view``, see :class:`ViewTimingMiddleware`), JSON rendering
+    (``render``) and the whole request (``total``).
+
+    When ``REQUEST_PROFILING_HEADER`` is sent by a staff user (authenticated
+    up front with the default API authentication classes), the request is run
+    under cProfile and the profile is returned as a download instead of the
+    normal response: ``X-Profile: prof`` gives a binary ``.prof`` file for
+    pstats/snakeviz, any other value a text report. Everybody else gets the
+    normal response, unprofiled, whatever ``DEBUG`` says.
+
+    Requests served asynchronously are never profiled: cProfile only sees the
+    event loop thread, where it would record every other request's coroutines
+    but not the sync views that run on worker threads.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Store the next handler in the chain, switching to async mode if it is async."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handle the request, timing it and profiling it if asked to."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timings, token, profiler = self._start(request)
+        queries = QueryStats()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(queries))
+                response = self._run(profiler, self.get_response, request)
+        finally:
+            _timings.reset(token)
+        return self._finish(request, response, profiler, queries, timings, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        """
+        Async version of ``__call__``.
+
+        Queries run on a worker thread whose connection cannot be wrapped from
+        here, so the ``db`` metric is left out, and the request is not profiled.
+        """
+        timings, token, _ = self._start(request, profile=False)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self._finish(request, response, None, None, timings, time.perf_counter() - started)
+
+    def _start(self, request, profile=True):
+        """Start collecting timings and create a profiler if one was requested and ``profile`` allows it."""
+        timings = {}
+        token = _timings.set(timings)
+        profiler = None
+        if (
+            profile
+            and request.META.get(settings.REQUEST_PROFILING_HEADER)
+            and settings.REQUEST_PROFILING_ENABLED
+            and self._is_staff(request)
+        ):
+            profiler = cProfile.Profile()
+        return timings, token, profiler
+
+    @staticmethod
+    def _is_staff(request):
+        """Return True if the API credentials of ``request`` belong to a staff user."""
+        authenticators = [authentication() for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+        try:
+            user = Request(request, authenticators=authenticators).user
+        except APIException:
+            return False
+        return bool(user and user.is_staff)
+
+    @staticmethod
+    def _run(profiler, get_response, request):
+        """Call ``get_response``, under ``profiler`` if there is one."""
+        if profiler is None:
+            return get_response(request)
+        profiler.enable()
+        try:
+            return get_response(request)
+        finally:
+            profiler.disable()
+
+    def _finish(self, request, response, profiler, queries, timings, total):
+        """Add the Server-Timing header, swapping in the profile if there is one."""
+        server_timing = self.server_timing(queries, timings, total)
+        if profiler:
+            profile_format = request.META[settings.REQUEST_PROFILING_HEADER]
+            response = self.profile_response(profiler, profile_format, request, response)
+        response["Server-Timing"] = server_timing
+        return response
+
+    @staticmethod
+    def server_timing(queries, timings, total):
+        """Return the ``Server-Timing`` header value; ``queries`` is None when not measured."""
+        metrics = []
+        if queries is not None:
+            metrics.append(f'db;dur={queries.duration * 1000:.2f};desc="{queries.count} queries"')
+        metrics += [f"{name};dur={duration * 1000:.2f}" for name, duration in timings.items()]
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+    @staticmethod
+    def profile_response(profiler, profile_format, request, response):
+        """Return the captured profile as a downloadable attachment."""
+        if profile_format == "prof":
+            profiler.create_stats()
+            content = marshal.dumps(profiler.stats)
+            content_type, extension = "application/octet-stream", "prof"
+        else:
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(50)
+            content = stream.getvalue()
+            content_type, extension = "text/plain; charset=utf-8", "txt"
+
+        name = request.path.strip("/").replace("/", "-") or "root"
+        profile = HttpResponse(content, content_type=content_type)
+        profile["Content-Disposition"] = f'attachment; filename="profile-{name}.{extension}"'
+        profile["X-Profiled-Status"] = str(response.status_code)
+        return profile
+
+
+class ViewTimingMiddleware:
+    """
+    Report the time spent in the view as ``view`` in ``ServerTimingMiddleware``'s header.
+
+    Goes last in ``MIDDLEWARE`` so that only URL resolution, the
+    ``process_view`` hooks, the view and the rendering of its response run
+    inside it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Store the next handler in the chain, switching to async mode if it is async."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handle the request, timing it as ``view``."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with timed("view"):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        """Async version of ``__call__``."""
+        with timed("view"):
+            return await self.get_response(request)
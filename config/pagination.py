@@ -0,0 +1,197 @@
+"""Pagination classes shared by the API and the admin."""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks to the last row seen instead of counting an offset.
+
+    Rows are ordered by ``ordering``, whose last field must be unique and none
+    of them null (e.g. ``('-applied_at', '-pk')``). The ``next`` link carries
+    that row's ordering values, and the following page is read with
+    ``WHERE <ordering> after <values> ... LIMIT page_size + 1``, so page 1000
+    costs what page 1 does when an index matches the filters and ordering.
+    There is no total count and no ``previous`` link.
+    """
+
+    ordering = ('-pk',)
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page of ``queryset`` after the request's cursor."""
+        self.request = request
+        self._model = queryset.model
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+
+        rows = list(queryset.order_by(*self.ordering)[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        """Return the requested page size, capped at ``max_page_size``."""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def _fields(self):
+        """Yield ``(field name, descending)`` for each ordering term."""
+        for term in self.ordering:
+            name = term.lstrip('-')
+            yield (self._model._meta.pk.name if name == 'pk' else name), term.startswith('-')
+
+    def _after(self, position):
+        """Return the condition selecting rows that sort after ``position``."""
+        fields = list(self._fields())
+        condition = Q()
+        for index, (name, descending) in enumerate(fields):
+            equal = {field: position[field] for field, _ in fields[:index]}
+            condition |= Q(**equal, **{f'{name}__{"lt" if descending else "gt"}': position[name]})
+        # A range on the leading field lets the database seek in the index;
+        # the OR only breaks ties within it.
+        name, descending = fields[0]
+        return Q(**{f'{name}__{"lte" if descending else "gte"}': position[name]}) & condition
+
+    def encode_cursor(self, row):
+        """Return the cursor pointing after ``row``."""
+        # value_to_string keeps full precision (JSON encoders round datetimes to milliseconds).
+        values = [self._model._meta.get_field(name).value_to_string(row) for name, _ in self._fields()]
+        data = json.dumps(values, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        """Return ``{field: value}`` from the request's cursor, or None on the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            fields = [name for name, _ in self._fields()]
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError(encoded)
+            meta = self._model._meta
+            return {name: meta.get_field(name).to_python(value) for name, value in zip(fields, values)}
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        """Return the URL of the next page, or None on the last page."""
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        """Return the page with the link to the next one."""
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        """Return the OpenAPI schema of a page."""
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                    'example': 'http://api.example.org/accounts/?cursor=WyIyMDI0LTAxLTAxVDAwOjAwOjAwWiJd',
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        """Return the OpenAPI query parameters of a page."""
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+def estimate_count(queryset):
+    """
+    Return the query planner's row estimate for ``queryset``, or None if it has none.
+
+    PostgreSQL estimates any query (``EXPLAIN``), and a whole table from
+    ``pg_class.reltuples``; SQLite only has whole-table counts from ``ANALYZE``
+    (``sqlite_stat1``). Estimates are only as fresh as the last (auto)vacuum or
+    ``ANALYZE``.
+    """
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    whole_table = not queryset.query.where and not queryset.query.distinct
+    try:
+        with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql' and whole_table:
+                quoted = connection.ops.quote_name(table)
+                cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [quoted])
+                row = cursor.fetchone()
+                return int(row[0]) if row and row[0] >= 0 else None
+            if connection.vendor == 'postgresql':
+                sql, params = queryset.order_by().query.sql_with_params()
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                return int(plan[0]['Plan']['Plan Rows'])
+            if connection.vendor == 'sqlite' and whole_table:
+                # One row per index (or one for the table if it has none), each
+                # starting with its row count; partial indexes count fewer rows.
+                cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [table])
+                counts = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+                return max(counts) if counts else None
+    except DatabaseError:
+        # e.g. sqlite_stat1 does not exist until the first ANALYZE.
+        return None
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    ``Paginator`` that counts large results from planner statistics instead of ``COUNT(*)``.
+
+    Results estimated at fewer than ``exact_below`` rows (or that cannot be
+    estimated) are counted exactly. Page numbers near the end of an estimated
+    result may be off by the estimate's error.
+    """
+
+    exact_below = 100000
+
+    @cached_property
+    def count(self):
+        """Return the estimated number of objects, or the exact number for small results."""
+        estimate = estimate_count(self.object_list) if hasattr(self.object_list, 'query') else None
+        if estimate is None or estimate < self.exact_below:
+            return super().count
+        return estimate
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 from config.settings.utils import get_bool_env, get_env_variable
@@ -54,6 +55,8 @@ LOCAL_APPS = [
     "nationalId",
     "license",
     "application",
+    "uploads",
+    "jobs",
 
 ]
 
@@ -61,12 +64,14 @@ INSTALLED_APPS += THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "config.middleware.ServerTimingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "config.middleware.ViewTimingMiddleware",
 ]
 
 AUTH_USER_MODEL = "accounts.CustomUser"
@@ -74,8 +79,17 @@ AUTH_USER_MODEL = "accounts.CustomUser"
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.TokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.TokenRefreshSerializer',
 }
 
+# Per-process cache of the user fields checked when authenticating a JWT (see
+# accounts.cache). A change to is_active/is_staff reaches other processes
+# within JWT_USER_CACHE_TIMEOUT seconds.
+
+JWT_USER_CACHE_TIMEOUT = 60
+JWT_USER_CACHE_MAX_ENTRIES = 10000
+
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
@@ -134,6 +148,183 @@ USE_TZ = True
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Request profiling
+# Requests sending the X-Profile header from staff users are run under cProfile
+# and get the profile back instead of the response, in DEBUG too. Requests
+# served asynchronously are never profiled (see config.middleware).
+
+REQUEST_PROFILING_ENABLED = True
+REQUEST_PROFILING_HEADER = "HTTP_X_PROFILE"
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "licenses": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "licenses",
+        "TIMEOUT": 300,
+        "OPTIONS": {
+            "MAX_ENTRIES": 50000,
+        },
+    },
+    # License snapshot dirty marks, kept apart from the culled lookup cache so
+    # floods of unknown ids cannot evict them.
+    "license-dirty": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "license-dirty",
+        "OPTIONS": {
+            "MAX_ENTRIES": 10_000_000,
+        },
+    },
+}
+
+# License verification cache
+# Positive entries live for LICENSE_CACHE_TIMEOUT seconds, unknown ids for
+# LICENSE_CACHE_NEGATIVE_TIMEOUT seconds.
+
+LICENSE_CACHE_ALIAS = "licenses"
+LICENSE_CACHE_TIMEOUT = 300
+LICENSE_CACHE_NEGATIVE_TIMEOUT = 60
+
+# Read-only license snapshot shared by every worker (see license.snapshot),
+# rebuilt with manage.py build_license_snapshot. Disabled unless
+# LICENSE_SNAPSHOT_PATH is set, and only used when the dirty marks live in a
+# cache shared by every worker (LICENSE_DIRTY_CACHE_ALIAS, not LocMem). Workers
+# notice a new file within LICENSE_SNAPSHOT_CHECK_INTERVAL seconds. Changed
+# licenses bypass it for LICENSE_SNAPSHOT_DIRTY_TIMEOUT seconds, which must
+# exceed the rebuild period; an older snapshot is not used at all. Ids missing
+# from a snapshot older than LICENSE_SNAPSHOT_MAX_AGE seconds are looked up in
+# the database.
+
+LICENSE_SNAPSHOT_PATH = None
+LICENSE_DIRTY_CACHE_ALIAS = "license-dirty"
+LICENSE_SNAPSHOT_CHECK_INTERVAL = 5
+LICENSE_SNAPSHOT_DIRTY_TIMEOUT = 3600
+LICENSE_SNAPSHOT_MAX_AGE = 15 * 60
+
+# Maximum number of ids accepted by the bulk license verification endpoint.
+LICENSE_BULK_MAX_IDS = 500
+
+# Renewal reminders (see license.expiry), queued by manage.py
+# sweep_expiring_licenses for licenses expiring within
+# LICENSE_EXPIRY_REMINDER_DAYS days, reading LICENSE_EXPIRY_SWEEP_CHUNK_SIZE
+# licenses per query.
+
+LICENSE_EXPIRY_REMINDER_DAYS = 30
+LICENSE_EXPIRY_SWEEP_CHUNK_SIZE = 1000
+
+# File uploads (see uploads.handlers). Every file streams to a temporary file in
+# UPLOAD_CHUNK_SIZE chunks and is hashed on the way; a file over
+# UPLOAD_MAX_FILE_SIZE aborts the request with a 400. Images are validated from
+# their header only (see uploads.images).
+
+FILE_UPLOAD_HANDLERS = [
+    "uploads.handlers.HashingUploadHandler",
+]
+UPLOAD_CHUNK_SIZE = 256 * 1024
+UPLOAD_MAX_FILE_SIZE = 10 * 1024 * 1024
+UPLOAD_IMAGE_FORMATS = ("JPEG", "PNG", "WEBP")
+UPLOAD_IMAGE_MAX_PIXELS = 40_000_000
+
+# Uploaded files are stored once per distinct content (see uploads.storage).
+# manage.py gc_blobs deletes blobs unreferenced and unused for this long.
+
+BLOB_GC_GRACE_HOURS = 24
+
+# Resized passport photos (see uploads.derivatives), rendered by a pool of
+# IMAGE_DERIVATIVE_WORKERS processes (0 renders in the request thread) and kept
+# under IMAGE_DERIVATIVE_CACHE_DIR, least recently used first out once it holds
+# more than IMAGE_DERIVATIVE_CACHE_MAX_BYTES. Source image hashes are cached for
+# IMAGE_DERIVATIVE_SOURCE_TIMEOUT seconds.
+
+IMAGE_DERIVATIVE_PRESETS = {
+    "thumbnail": (96, 96),
+    "small": (240, 240),
+    "medium": (480, 480),
+}
+IMAGE_DERIVATIVE_QUALITY = 80
+IMAGE_DERIVATIVE_WORKERS = 2
+IMAGE_DERIVATIVE_CACHE_DIR = BASE_DIR / "build" / "derivatives"
+IMAGE_DERIVATIVE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+IMAGE_DERIVATIVE_CACHE_ALIAS = "default"
+IMAGE_DERIVATIVE_SOURCE_TIMEOUT = 60 * 60 * 24
+
+# Background jobs (see jobs.queue), run by manage.py runworker. Failed jobs are
+# retried after JOBS_RETRY_BACKOFF seconds, doubled per attempt up to
+# JOBS_RETRY_BACKOFF_MAX, and dead-lettered after JOBS_MAX_ATTEMPTS tries. A job
+# claimed longer than JOBS_LEASE_TIMEOUT ago is assumed lost and queued again,
+# so it must exceed the longest job. Done jobs are kept JOBS_RETENTION_HOURS.
+
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_BACKOFF = 10
+JOBS_RETRY_BACKOFF_MAX = 60 * 60
+JOBS_LEASE_TIMEOUT = 10 * 60
+JOBS_POLL_INTERVAL = 1.0
+JOBS_WORKER_THREADS = 4
+JOBS_RETENTION_HOURS = 24
+
+# Maximum number of applications moved by one bulk status transition request.
+APPLICATION_TRANSITION_MAX_IDS = 10000
+
+# How long (seconds) a clerk's claim on an application lasts before another
+# clerk can claim it, and the most applications one claim request can take.
+APPLICATION_CLAIM_LEASE = 15 * 60
+APPLICATION_CLAIM_MAX_SIZE = 100
+
+# Default and largest page size of the staff application listing.
+APPLICATION_LIST_PAGE_SIZE = 50
+APPLICATION_LIST_MAX_PAGE_SIZE = 500
+
+# National ID search results per page by default and at most, and how deep
+# the results can be paged (offsets past that are refused).
+NATIONAL_ID_SEARCH_PAGE_SIZE = 20
+NATIONAL_ID_SEARCH_MAX_PAGE_SIZE = 100
+NATIONAL_ID_SEARCH_MAX_RESULTS = 1000
+
+# Number of rows fetched per round trip when streaming application exports.
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Where manage.py generate_openapi_schema writes the schema served at
+# /swagger.json/. Without it the schema is generated per request in DEBUG only.
+# The /swagger/ and /redoc/ pages never generate it: they are rendered from
+# drf-yasg's templates and load the schema from its versioned URL.
+
+OPENAPI_SCHEMA_DIR = BASE_DIR / "build" / "openapi"
+
+# Refresh-token blacklist (see accounts.blacklist). Revocations live in the
+# shared cache until the token expires and reach the database in batches, at
+# most TOKEN_BLACKLIST_FLUSH_INTERVAL seconds later. With a per-process cache
+# they are written to the database at once.
+
+TOKEN_BLACKLIST_CACHE_ALIAS = "default"
+TOKEN_BLACKLIST_BATCH_SIZE = 100
+TOKEN_BLACKLIST_FLUSH_INTERVAL = 5
+TOKEN_BLACKLIST_BLOOM_REFRESH = 300
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = 0.01
+
+# Authentication classes accepted on API routes, by profile. "compat" also
+# accepts Basic credentials (a full password hash per request) and sessions (a
+# django_session read per request); "jwt" only accepts bearer tokens. The admin
+# always uses sessions, whatever the profile.
+
+API_AUTH_PROFILES = {
+    "compat": [
+        "rest_framework.authentication.BasicAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
+    ],
+    "jwt": [
+        "accounts.authentication.CachedJWTAuthentication",
+    ],
+}
+
+API_AUTH_PROFILE = os.getenv("API_AUTH_PROFILE", "compat")
+
 # Django Rest Framework
 # https://www.django-rest-framework.org/api-guide/settings/
 
@@ -143,14 +334,10 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.MultiPartParser'
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "config.middleware.TimedJSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
-    "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.BasicAuthentication",
-        "rest_framework.authentication.SessionAuthentication",
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    ],
+    "DEFAULT_AUTHENTICATION_CLASSES": API_AUTH_PROFILES[API_AUTH_PROFILE],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
@@ -1,3 +1,5 @@
+import os
+
 import dj_database_url
 import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
@@ -25,10 +27,47 @@ DATABASES = {
     )
 }
 
+# API routes only accept JWTs; sessions are left to the admin and are kept in
+# the cache (with the database behind it) or in signed cookies.
+API_AUTH_PROFILE = os.getenv("API_AUTH_PROFILE", "jwt")
+REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"] = API_AUTH_PROFILES[API_AUTH_PROFILE]
+
+SESSION_ENGINE = os.getenv("SESSION_ENGINE", "django.contrib.sessions.backends.cached_db")
+
+# Shared caches, so that every worker sees the same refresh-token blacklist
+# and the same license snapshot dirty marks.
+if os.getenv("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+    CACHES["licenses"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+        "TIMEOUT": 300,
+        "KEY_PREFIX": "licenses",
+    }
+    CACHES["license-dirty"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+        "KEY_PREFIX": "license-dirty",
+    }
+
+# The license snapshot needs the shared dirty marks above; rebuild it from cron.
+LICENSE_SNAPSHOT_PATH = os.getenv("LICENSE_SNAPSHOT_PATH") or None
+
+# Processes rendering resized passport photos, per web worker.
+IMAGE_DERIVATIVE_WORKERS = int(os.getenv("IMAGE_DERIVATIVE_WORKERS", "2"))
+
+# On-demand profiling is opt-in in production.
+REQUEST_PROFILING_ENABLED = get_bool_env("REQUEST_PROFILING_ENABLED")
+
+# Per-request timings are always available from the Server-Timing header, so
+# Sentry only needs a sample of traces and profiles.
 sentry_sdk.init(
     dsn=get_env_variable("SENTRY_DSN"),
-    traces_sample_rate=1.0,
-    profiles_sample_rate=1.0,
+    traces_sample_rate=float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.1")),
+    profiles_sample_rate=float(os.getenv("SENTRY_PROFILES_SAMPLE_RATE", "0.1")),
     enable_tracing=True,
     integrations=[
         DjangoIntegration(
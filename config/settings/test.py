@@ -31,3 +31,5 @@ STATICFILES_DIRS = [
 MEDIA_URL = "/media/"
 
 MEDIA_ROOT = BASE_DIR / "media"
+
+ROOT_URLCONF = "config.urls"
@@ -0,0 +1 @@
+"""Project configuration tests."""
@@ -0,0 +1,27 @@
+"""Bloom filter tests."""
+from config.bloom import BloomFilter
+
+
+def test_no_false_negatives():
+    """Test every added item is reported present."""
+    bloom = BloomFilter(1000)
+    items = [f"item-{i}" for i in range(1000)]
+    bloom.update(items)
+    assert all(item in bloom for item in items)
+
+
+def test_false_positive_rate_near_target():
+    """Test unseen items are rarely reported present at capacity."""
+    bloom = BloomFilter(1000, error_rate=0.01)
+    bloom.update(f"item-{i}" for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_from_bytes_shares_buffer():
+    """Test a filter rebuilt over the same bits answers the same."""
+    bloom = BloomFilter(100)
+    bloom.add("present")
+    copy = BloomFilter.from_bytes(bytes(bloom.bits), bloom.size, bloom.hashes)
+    assert "present" in copy
+    assert "absent" not in copy
@@ -0,0 +1,120 @@
+"""Server-Timing middleware tests."""
+import marshal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from config.middleware import ServerTimingMiddleware
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client_for():
+    """Return a factory of API clients authenticated as a new user."""
+    def _client_for(**extra):
+        user = User.objects.create_user(email=f"user{User.objects.count()}@example.com", password="pw", **extra)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+    return _client_for
+
+
+def _metrics(response):
+    """Return the Server-Timing header as a ``{name: params}`` mapping."""
+    metrics = {}
+    for metric in response["Server-Timing"].split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = params
+    return metrics
+
+
+def test_server_timing_header(client_for):
+    """Test query, view, rendering and total timings are reported."""
+    response = client_for().get(reverse("license_detail", args=["FAKE-1"]))
+    metrics = _metrics(response)
+    assert set(metrics) == {"db", "view", "render", "total"}
+    assert 'desc="1 queries"' in metrics["db"]
+
+
+def test_server_timing_includes_serializers(client):
+    """Test serializer validation is reported as ``serializer``."""
+    response = client.post(reverse("register"), {"email": "bad"}, content_type="application/json")
+    assert response.status_code == 400
+    assert set(_metrics(response)) == {"db", "serializer", "view", "render", "total"}
+
+
+def test_server_timing_on_non_api_views(client):
+    """Test plain Django views are timed too."""
+    response = client.get(reverse("core:home"))
+    assert "total" in _metrics(response)
+
+
+def test_profile_for_staff(client_for):
+    """Test staff users get a text profile instead of the response."""
+    response = client_for(is_staff=True).get(reverse("license_detail", args=["FAKE-1"]), HTTP_X_PROFILE="text")
+    assert response.status_code == 200
+    assert response["Content-Disposition"] == 'attachment; filename="profile-api-licenses-FAKE-1.txt"'
+    assert response["X-Profiled-Status"] == "404"
+    assert b"function calls" in response.content
+    assert "Server-Timing" in response
+
+
+def test_binary_profile_for_staff(client_for):
+    """Test ``X-Profile: prof`` returns marshalled pstats data."""
+    response = client_for(is_staff=True).get(reverse("license_detail", args=["FAKE-1"]), HTTP_X_PROFILE="prof")
+    assert response["Content-Type"] == "application/octet-stream"
+    assert isinstance(marshal.loads(response.content), dict)
+
+
+def test_profile_ignored_for_non_staff(client_for):
+    """Test non-staff users get their normal response."""
+    response = client_for().get(reverse("license_detail", args=["FAKE-1"]), HTTP_X_PROFILE="text")
+    assert response.status_code == 404
+    assert "Content-Disposition" not in response
+
+
+def test_profile_ignored_for_anonymous(client, monkeypatch):
+    """Test anonymous requests are not run under the profiler at all."""
+    monkeypatch.setattr("config.middleware.cProfile.Profile", lambda: pytest.fail("profiled an anonymous request"))
+    response = client.get(reverse("core:home"), HTTP_X_PROFILE="text")
+    assert "Content-Disposition" not in response
+
+
+def test_profile_requires_staff_in_debug(client, settings):
+    """Test DEBUG does not let anonymous requests download profiles."""
+    settings.DEBUG = True
+    response = client.get(reverse("core:home"), HTTP_X_PROFILE="text")
+    assert "Content-Disposition" not in response
+
+
+def test_async_requests_are_not_profiled(rf, monkeypatch):
+    """Test the async path never authenticates or profiles, but is still timed."""
+    async def view(request):
+        return HttpResponse("ok")
+
+    monkeypatch.setattr(ServerTimingMiddleware, "_is_staff", lambda request: pytest.fail("authenticated on the loop"))
+    monkeypatch.setattr("config.middleware.cProfile.Profile", lambda: pytest.fail("profiled an async request"))
+    response = async_to_sync(ServerTimingMiddleware(view))(rf.get("/", HTTP_X_PROFILE="text"))
+
+    assert response.content == b"ok"
+    assert set(_metrics(response)) == {"total"}
+
+
+def test_profile_ignored_for_invalid_credentials(client):
+    """Test a request with a bad token is not profiled."""
+    response = client.get(reverse("core:home"), HTTP_X_PROFILE="text", HTTP_AUTHORIZATION="Bearer nope")
+    assert "Content-Disposition" not in response
+
+
+def test_profiling_can_be_disabled(client_for, settings):
+    """Test the header is ignored when profiling is disabled."""
+    settings.REQUEST_PROFILING_ENABLED = False
+    response = client_for(is_staff=True).get(reverse("license_detail", args=["FAKE-1"]), HTTP_X_PROFILE="text")
+    assert response.status_code == 404
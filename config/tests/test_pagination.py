@@ -0,0 +1,53 @@
+"""Estimated count paginator tests."""
+from datetime import date
+
+import pytest
+from django.db import connection
+
+from config.pagination import EstimatedCountPaginator, estimate_count
+from nationalId.models import NationalId
+
+pytestmark = pytest.mark.django_db
+
+
+def _create(first, last):
+    """Create national IDs numbered ``first`` to ``last - 1``."""
+    NationalId.objects.bulk_create(
+        NationalId(idNo=i, firstName=f"Person {i}", DOB=date(1990, 1, 1)) for i in range(first, last)
+    )
+
+
+def _analyze():
+    """Refresh the planner statistics."""
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def test_estimate_whole_table_from_statistics():
+    """Test whole tables are estimated from ANALYZE statistics and filtered querysets are not."""
+    _create(1, 6)
+    _analyze()
+
+    assert estimate_count(NationalId.objects.all()) == 5
+    assert estimate_count(NationalId.objects.filter(idNo__lt=3)) is None
+
+
+def test_paginator_counts_large_results_from_estimate(django_assert_num_queries):
+    """Test results above the threshold are not counted with COUNT(*)."""
+    _create(1, 6)
+    _analyze()
+    _create(6, 8)
+    paginator = EstimatedCountPaginator(NationalId.objects.order_by("idNo"), 2)
+    paginator.exact_below = 3
+
+    with django_assert_num_queries(3):  # SAVEPOINT, statistics, RELEASE SAVEPOINT
+        assert paginator.count == 5
+    assert paginator.num_pages == 3
+
+
+def test_paginator_counts_small_results_exactly():
+    """Test results below the threshold, or without statistics, are counted exactly."""
+    _create(1, 6)
+
+    assert EstimatedCountPaginator(NationalId.objects.order_by("idNo"), 2).count == 5
+    assert EstimatedCountPaginator(NationalId.objects.filter(idNo__lt=3).order_by("idNo"), 2).count == 2
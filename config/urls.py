@@ -17,47 +17,39 @@ Including another URLconf
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
+from django.urls import include, path, re_path
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Django Template",
-        default_version="v1",
-        description="Django Template API Documentatio",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="richiemugambi4@gmail.com"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from docs.app.views import (ArtifactReDocRenderer, ArtifactSwaggerUIRenderer,
+                            SchemaUIView, SchemaView)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("docs/", include("docs.app.urls")),
     path("api-auth/", include("rest_framework.urls")),
-    path(
-        "swagger<format>/", schema_view.without_ui(cache_timeout=0), name="schema-json"
+    re_path(r"^swagger\.(?P<format>json|yaml)/$", SchemaView.as_view(), name="schema-json"),
+    re_path(
+        r"^swagger-(?P<version>[0-9a-f]+)\.(?P<format>json|yaml)/$",
+        SchemaView.as_view(),
+        name="schema-json-versioned",
     ),
     path(
         "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
+        SchemaUIView.as_view(renderer_class=ArtifactSwaggerUIRenderer),
         name="schema-swagger-ui",
     ),
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+    path("redoc/", SchemaUIView.as_view(renderer_class=ArtifactReDocRenderer), name="schema-redoc"),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api-auth/', include('rest_framework.urls')),
     path('api/', include('accounts.urls')),
     path('api/', include('application.urls')),
-    path('api/', include('license.urls'))
+    path('api/', include('license.urls')),
+    path('api/', include('nationalId.urls')),
+    path('api/', include('uploads.urls')),
 ]
 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -0,0 +1 @@
+"""Docs management commands."""
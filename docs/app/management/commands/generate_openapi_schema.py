@@ -0,0 +1,31 @@
+"""Pre-generate the OpenAPI schema served at /swagger.json/."""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from docs.app.schema import generate_schema, write_artifacts
+
+
+class Command(BaseCommand):
+    """Generate the OpenAPI schema once and write it as versioned artifacts."""
+
+    help = (
+        "Introspect the API once and write the OpenAPI schema as versioned JSON and YAML files, plus a "
+        "manifest, to OPENAPI_SCHEMA_DIR. Run at build/deploy time."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--output-dir", default=None, help="Directory to write to (default: settings.OPENAPI_SCHEMA_DIR)."
+        )
+        parser.add_argument(
+            "--url", default=None, help="Base API URL recorded in the schema, e.g. https://api.example.com."
+        )
+
+    def handle(self, *args, **options):
+        """Generate and write the schema."""
+        directory = options["output_dir"] or settings.OPENAPI_SCHEMA_DIR
+        manifest = write_artifacts(generate_schema(options["url"]), directory)
+        for filename in manifest["files"].values():
+            self.stdout.write(f"Wrote {directory}/{filename}")
+        self.stdout.write(self.style.SUCCESS(f"OpenAPI schema version {manifest['version']}"))
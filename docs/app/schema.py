@@ -0,0 +1,94 @@
+"""
+OpenAPI schema generation and the pre-generated schema artifacts.
+
+drf_yasg introspects every view and serializer each time it builds the
+schema. ``manage.py generate_openapi_schema`` does that once at build time
+and writes the result to ``OPENAPI_SCHEMA_DIR`` as content-addressed files
+(``openapi-<version>.json``/``.yaml``) plus a ``manifest.json`` naming them.
+The schema views serve those files; live generation is only used in DEBUG.
+"""
+import hashlib
+import json
+from pathlib import Path
+
+from django.conf import settings
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+INFO = openapi.Info(
+    title="Django Template",
+    default_version="v1",
+    description="Django Template API Documentatio",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="richiemugambi4@gmail.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+schema_view = get_schema_view(
+    INFO,
+    public=True,
+    permission_classes=(permissions.AllowAny,),
+)
+
+CODECS = {"json": OpenAPICodecJson, "yaml": OpenAPICodecYaml}
+
+CONTENT_TYPES = {"json": "application/json", "yaml": "application/yaml"}
+
+MANIFEST_NAME = "manifest.json"
+
+# Artifacts read so far, by format. They are immutable once written.
+_artifacts = {}
+
+# Length of the content hash used as the schema version.
+VERSION_LENGTH = 12
+
+
+def generate_schema(url=None):
+    """Build the public schema by introspecting every API view."""
+    generator = OpenAPISchemaGenerator(INFO, url=url)
+    return generator.get_schema(request=None, public=True)
+
+
+def write_artifacts(schema, directory):
+    """
+    Write ``schema`` as versioned JSON and YAML files into ``directory``.
+
+    The version is a hash of the JSON encoding, so it only changes when the
+    schema does. Returns the manifest that was written.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    encoded = {name: codec(validators=[]).encode(schema) for name, codec in CODECS.items()}
+    version = hashlib.sha256(encoded["json"]).hexdigest()[:VERSION_LENGTH]
+    manifest = {"version": version, "files": {}}
+    for name, content in encoded.items():
+        filename = f"openapi-{version}.{name}"
+        (directory / filename).write_bytes(content)
+        manifest["files"][name] = filename
+
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n")
+    _artifacts.clear()
+    return manifest
+
+
+def load_artifact(format):
+    """
+    Return ``(version, content)`` of the pre-generated schema in ``format``.
+
+    Returns None when no schema has been generated. Each artifact is read from
+    disk once per process.
+    """
+    if format in _artifacts:
+        return _artifacts[format]
+    directory = Path(settings.OPENAPI_SCHEMA_DIR)
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text())
+        content = (directory / manifest["files"][format]).read_bytes()
+    except (OSError, KeyError, ValueError):
+        return None
+    _artifacts[format] = manifest["version"], content
+    return _artifacts[format]
@@ -0,0 +1,88 @@
+"""Test the pre-generated OpenAPI schema."""
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from docs.app import schema
+
+
+@pytest.fixture
+def schema_dir(settings, tmp_path):
+    """Point OPENAPI_SCHEMA_DIR at an empty directory."""
+    settings.OPENAPI_SCHEMA_DIR = tmp_path
+    schema._artifacts.clear()
+    yield tmp_path
+    schema._artifacts.clear()
+
+
+@pytest.fixture
+def manifest(schema_dir):
+    """Generate the schema and return its manifest."""
+    call_command("generate_openapi_schema")
+    return json.loads((schema_dir / schema.MANIFEST_NAME).read_text())
+
+
+def test_generate_writes_versioned_artifacts(schema_dir, manifest):
+    """Test the command writes content-addressed JSON and YAML files."""
+    version = manifest["version"]
+    assert manifest["files"] == {"json": f"openapi-{version}.json", "yaml": f"openapi-{version}.yaml"}
+    document = json.loads((schema_dir / manifest["files"]["json"]).read_text())
+    assert "/licenses/{license_id}/" in document["paths"]
+
+
+def test_generate_is_deterministic(schema_dir, manifest):
+    """Test regenerating an unchanged API keeps the same version."""
+    call_command("generate_openapi_schema")
+    assert json.loads((schema_dir / schema.MANIFEST_NAME).read_text())["version"] == manifest["version"]
+
+
+@pytest.mark.django_db
+def test_schema_served_with_strong_etag(client, manifest):
+    """Test the unversioned schema is revalidated against a strong ETag."""
+    response = client.get(reverse("schema-json", kwargs={"format": "json"}))
+    assert response.status_code == 200
+    assert response["ETag"] == f'"{manifest["version"]}"'
+    assert "no-cache" in response["Cache-Control"]
+
+    response = client.get(reverse("schema-json", kwargs={"format": "json"}), HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_versioned_schema_is_immutable(client, manifest):
+    """Test the versioned schema is cached as immutable and stale versions 404."""
+    url = reverse("schema-json-versioned", kwargs={"version": manifest["version"], "format": "yaml"})
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/yaml"
+    assert "immutable" in response["Cache-Control"]
+
+    response = client.get(reverse("schema-json-versioned", kwargs={"version": "0" * 12, "format": "yaml"}))
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_live_fallback_only_in_debug(client, settings, schema_dir):
+    """Test a missing artifact is generated live in DEBUG and a 404 otherwise."""
+    url = reverse("schema-json", kwargs={"format": "json"})
+    settings.DEBUG = True
+    assert client.get(url).status_code == 200
+
+    settings.DEBUG = False
+    assert client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", ["schema-swagger-ui", "schema-redoc"])
+def test_ui_loads_the_versioned_schema(client, manifest, monkeypatch, name):
+    """Test the UI pages point at the immutable schema without generating one."""
+    monkeypatch.setattr(
+        "drf_yasg.generators.OpenAPISchemaGenerator.get_schema", lambda *args, **kwargs: pytest.fail("generated"),
+    )
+    response = client.get(reverse(name))
+    assert response.status_code == 200
+    assert reverse("schema-json-versioned", kwargs={"version": manifest["version"], "format": "json"}) in (
+        response.content.decode()
+    )
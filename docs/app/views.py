@@ -1,8 +1,101 @@
 """Views for the core app."""
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.shortcuts import render
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.views import View
 from django.views.generic import TemplateView
+from drf_yasg.renderers import ReDocRenderer, SwaggerUIRenderer
+
+from .schema import CONTENT_TYPES, INFO, load_artifact, schema_view
+
+# One year, the conventional maximum for immutable assets.
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
 
 
 class HomePageView(TemplateView):
     """Home page view."""
 
     template_name = "home.html"
+
+
+class SchemaView(View):
+    """
+    Serve the pre-generated OpenAPI schema.
+
+    ``swagger.json``/``swagger.yaml`` are revalidated on every use with a strong
+    ETag (the schema version), so unchanged schemas cost a 304.
+    ``swagger-<version>.json`` never changes and is cached as immutable. If no
+    schema has been generated, it is built live per request in DEBUG only.
+    """
+
+    live_view = staticmethod(schema_view.without_ui(cache_timeout=0))
+
+    def get(self, request, format, version=None):
+        """Return the schema in ``format`` ("json" or "yaml")."""
+        artifact = load_artifact(format)
+        if artifact is None:
+            if settings.DEBUG:
+                return self.live_view(request, format=f".{format}")
+            raise Http404("The OpenAPI schema has not been generated; run manage.py generate_openapi_schema.")
+        current, content = artifact
+        if version is not None and version != current:
+            raise Http404("Unknown schema version.")
+
+        etag = f'"{current}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=CONTENT_TYPES[format])
+        response["ETag"] = etag
+        if version is None:
+            patch_cache_control(response, public=True, no_cache=True)
+        else:
+            patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+        return response
+
+
+def spec_url():
+    """Return the URL the UIs load the schema from: the immutable versioned one once it is generated."""
+    artifact = load_artifact("json")
+    if artifact is None:
+        return reverse("schema-json", kwargs={"format": "json"})
+    return reverse("schema-json-versioned", kwargs={"version": artifact[0], "format": "json"})
+
+
+class ArtifactSwaggerUIRenderer(SwaggerUIRenderer):
+    """Swagger UI pointed at :func:`spec_url`."""
+
+    def get_swagger_ui_settings(self):
+        """Return the Swagger UI settings with the schema URL."""
+        return {**super().get_swagger_ui_settings(), "url": spec_url()}
+
+
+class ArtifactReDocRenderer(ReDocRenderer):
+    """ReDoc pointed at :func:`spec_url`."""
+
+    def get_redoc_settings(self):
+        """Return the ReDoc settings with the schema URL."""
+        return {**super().get_redoc_settings(), "url": spec_url()}
+
+
+class SchemaUIView(View):
+    """
+    Serve the Swagger UI or ReDoc page.
+
+    The page is drf_yasg's template with the settings of ``renderer_class``;
+    the browser then fetches the schema from :func:`spec_url`. Unlike
+    drf_yasg's own UI views, no schema is built to render the page.
+    """
+
+    renderer_class = None
+
+    def get(self, request):
+        """Return the UI page."""
+        renderer = self.renderer_class()
+        context = {"request": request}
+        renderer.set_context(context)
+        context.update(title=INFO.title, version=INFO.version)
+        return render(request, renderer.template, context)
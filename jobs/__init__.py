@@ -0,0 +1 @@
+"""Background jobs stored in the project database."""
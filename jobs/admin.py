@@ -0,0 +1,31 @@
+"""Admin for the jobs app."""
+from django.contrib import admin
+
+from . import queue
+from .models import DeadLetter, Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Queued, running and recently done jobs."""
+
+    list_display = ("id", "task", "queue", "status", "attempts", "run_at", "finished_at")
+    list_filter = ("queue", "status")
+    search_fields = ("task",)
+
+
+@admin.register(DeadLetter)
+class DeadLetterAdmin(admin.ModelAdmin):
+    """Jobs that ran out of attempts."""
+
+    list_display = ("job_id", "task", "queue", "attempts", "failed_at")
+    list_filter = ("queue",)
+    search_fields = ("task",)
+    actions = ["requeue"]
+
+    @admin.action(description="Queue the selected jobs again")
+    def requeue(self, request, queryset):
+        """Queue each selected dead letter again."""
+        for dead_letter in queryset:
+            queue.requeue(dead_letter)
+        self.message_user(request, f"Queued {len(queryset)} jobs again.")
@@ -0,0 +1,9 @@
+"""Jobs app config."""
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    """Jobs app config."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "jobs"
@@ -0,0 +1 @@
+"""Jobs management commands."""
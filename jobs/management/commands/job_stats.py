@@ -0,0 +1,30 @@
+"""Report the backlog and throughput of each job queue."""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.metrics import queue_stats
+
+
+class Command(BaseCommand):
+    """Print per-queue job metrics."""
+
+    help = "Print each queue's backlog, and its throughput, failures and mean run time over --window minutes."
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("--window", type=float, default=15, help="Minutes of history to measure.")
+
+    def handle(self, *args, **options):
+        """Print the table."""
+        stats = queue_stats(timedelta(minutes=options["window"]))
+        header = (f"{'queue':<20}{'ready':>8}{'scheduled':>11}{'running':>9}{'done':>8}{'dead':>6}"
+                  f"{'per min':>10}{'mean s':>9}")
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, row in sorted(stats.items()):
+            mean = "-" if row["mean_seconds"] is None else f"{row['mean_seconds']:.3f}"
+            self.stdout.write(
+                f"{name:<20}{row['ready']:>8}{row['scheduled']:>11}{row['running']:>9}{row['done']:>8}"
+                f"{row['dead']:>6}{row['per_minute']:>10.2f}{mean:>9}"
+            )
@@ -0,0 +1,71 @@
+"""Run background jobs from the database queue."""
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    """Run a job worker."""
+
+    help = (
+        "Claim and run queued jobs until stopped (SIGTERM/SIGINT let running jobs finish). "
+        "Each process runs --threads jobs at a time."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "-q", "--queue", dest="queues", action="append",
+            help="Queue to run jobs from; repeat for several (default: default).",
+        )
+        parser.add_argument("--threads", type=int, default=settings.JOBS_WORKER_THREADS, help="Jobs run at once.")
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes to start.")
+        parser.add_argument("--poll-interval", type=float, help="Seconds between polls of empty queues.")
+        parser.add_argument("--stats-interval", type=float, default=60, help="Seconds between throughput reports.")
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due.")
+
+    def handle(self, *args, **options):
+        """Start the worker, or fork one per process."""
+        if options["processes"] <= 1:
+            self.run_worker(options)
+            return
+
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        children = [context.Process(target=self.run_worker, args=(options,)) for _ in range(options["processes"])]
+        for child in children:
+            child.start()
+
+        def forward(signum, frame):
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+
+        signal.signal(signal.SIGTERM, forward)
+        for child in children:
+            child.join()
+
+    def run_worker(self, options):
+        """Run one worker until it is stopped."""
+        worker = Worker(
+            options["queues"] or ["default"],
+            threads=options["threads"],
+            poll_interval=options["poll_interval"],
+            stats_interval=options["stats_interval"],
+            log=self.stdout.write,
+        )
+        previous = {
+            signum: signal.signal(signum, lambda signum, frame: worker.stop())
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        self.stdout.write(f"Worker {worker.name} running {', '.join(worker.queues)} on {worker.threads} threads.")
+        try:
+            worker.run(burst=options["burst"])
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
@@ -0,0 +1,46 @@
+"""Per-queue backlog and throughput, read from the jobs tables."""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
+from django.utils import timezone
+
+from .models import DeadLetter, Job
+
+
+def queue_stats(window=timedelta(minutes=15)):
+    """
+    Return ``{queue: stats}`` for every queue with jobs or dead letters.
+
+    ``ready`` jobs are due, ``scheduled`` ones wait for their ``run_at`` (new
+    or retrying), ``running`` ones are claimed. ``done``, ``dead`` and
+    ``per_minute`` (throughput) cover the last ``window``, ``mean_seconds`` is
+    the mean run time of the jobs done in it.
+    """
+    now = timezone.now()
+    since = now - window
+    stats = defaultdict(lambda: {
+        "ready": 0, "scheduled": 0, "running": 0, "done": 0, "dead": 0, "per_minute": 0.0, "mean_seconds": None,
+    })
+
+    backlog = Job.objects.exclude(status=Job.DONE).values("queue").annotate(
+        ready=Count("pk", filter=Q(status=Job.QUEUED, run_at__lte=now)),
+        scheduled=Count("pk", filter=Q(status=Job.QUEUED, run_at__gt=now)),
+        running=Count("pk", filter=Q(status=Job.RUNNING)),
+    ).order_by()
+    for row in backlog:
+        stats[row.pop("queue")].update(row)
+
+    run_time = ExpressionWrapper(F("finished_at") - F("locked_at"), output_field=DurationField())
+    done = Job.objects.filter(status=Job.DONE, finished_at__gte=since).values("queue").annotate(
+        done=Count("pk"), mean=Avg(run_time),
+    ).order_by()
+    for row in done:
+        queue = stats[row["queue"]]
+        queue["done"] = row["done"]
+        queue["per_minute"] = round(row["done"] / (window.total_seconds() / 60), 2)
+        queue["mean_seconds"] = row["mean"] and round(row["mean"].total_seconds(), 3)
+
+    for row in DeadLetter.objects.filter(failed_at__gte=since).values("queue").annotate(dead=Count("pk")).order_by():
+        stats[row["queue"]]["dead"] = row["dead"]
+    return dict(stats)
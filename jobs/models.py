@@ -0,0 +1,67 @@
+"""Models for the jobs app."""
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A call of a registered task, queued in the database (see :mod:`jobs.queue`).
+
+    Workers claim queued jobs whose ``run_at`` has passed, run them and mark
+    them done, or put them back with a later ``run_at`` when they fail. A job
+    that exhausts ``max_attempts`` moves to :class:`DeadLetter`. Done jobs are
+    kept for ``JOBS_RETENTION_HOURS`` for the throughput metrics.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+    ]
+
+    queue = models.CharField(max_length=64, default="default")
+    task = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField()
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Set when a worker claims the job; a running job whose claim is older than
+    # JOBS_LEASE_TIMEOUT is assumed lost with its worker and queued again.
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        """Index the claim query and the metrics/prune queries."""
+
+        indexes = [
+            models.Index(fields=["queue", "status", "run_at"], name="job_claim_idx"),
+            models.Index(fields=["status", "finished_at"], name="job_finished_idx"),
+        ]
+
+    def __str__(self):
+        """Return the task and id."""
+        return f"{self.task} #{self.pk}"
+
+
+class DeadLetter(models.Model):
+    """A job that failed ``max_attempts`` times (or could not run at all), kept for inspection and requeueing."""
+
+    job_id = models.BigIntegerField()
+    queue = models.CharField(max_length=64)
+    task = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+    attempts = models.PositiveIntegerField()
+    error = models.TextField()
+    created_at = models.DateTimeField()
+    failed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        """Return the task and original job id."""
+        return f"{self.task} #{self.job_id}"
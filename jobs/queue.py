@@ -0,0 +1,207 @@
+"""
+A job queue kept in the project database, so no broker is needed.
+
+Declare a task with :func:`task` and queue calls to it with :func:`enqueue`
+(or the task's own ``enqueue``)::
+
+    @task(queue="notifications")
+    def send_reminder(license_id):
+        ...
+
+    send_reminder.enqueue(license_id="DL-0001")
+
+Payloads are keyword arguments and must be JSON serializable. Jobs queued
+inside a transaction only become visible to workers when it commits, and
+disappear with it on rollback.
+
+Workers (``manage.py runworker``, see :mod:`jobs.worker`) claim jobs with
+``SELECT ... FOR UPDATE SKIP LOCKED`` where the database supports it, and
+otherwise (SQLite) with one conditional ``UPDATE`` per job. A failed job is
+retried after an exponential backoff (``JOBS_RETRY_BACKOFF`` seconds, doubled
+per attempt up to ``JOBS_RETRY_BACKOFF_MAX``, with jitter) and moved to the
+dead-letter table once it has been tried ``max_attempts`` times.
+"""
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import DeadLetter, Job
+
+_registry = {}
+
+
+class NotATask(Exception):
+    """A job names something that is not a registered task; it is dead-lettered without retries."""
+
+
+def task(function=None, *, queue="default", max_attempts=None):
+    """
+    Register ``function`` as a task run by workers from ``queue``.
+
+    Adds ``function.enqueue(**kwargs)``. ``max_attempts`` defaults to
+    ``JOBS_MAX_ATTEMPTS``.
+    """
+    def register(function):
+        name = f"{function.__module__}.{function.__qualname__}"
+        function.task_name = name
+        function.queue = queue
+        function.max_attempts = max_attempts
+        function.enqueue = lambda run_at=None, **kwargs: enqueue(function, run_at=run_at, **kwargs)
+        _registry[name] = function
+        return function
+
+    return register if function is None else register(function)
+
+
+def get_task(name):
+    """Return the registered task ``name``, importing its module if needed."""
+    if name not in _registry:
+        try:
+            import_string(name)
+        except ImportError as error:
+            raise NotATask(f"{name} cannot be imported: {error}") from error
+    try:
+        return _registry[name]
+    except KeyError:
+        raise NotATask(f"{name} is not a registered task.")
+
+
+def enqueue(function, run_at=None, queue=None, **kwargs):
+    """Queue a call of the task ``function`` (or its name) with ``kwargs`` and return the :class:`Job`."""
+    function = get_task(function) if isinstance(function, str) else function
+    return Job.objects.create(
+        queue=queue or function.queue,
+        task=function.task_name,
+        payload=kwargs,
+        max_attempts=function.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def enqueue_many(function, payloads, run_at=None, queue=None, batch_size=500):
+    """
+    Queue one call of the task ``function`` (or its name) per kwargs dict in ``payloads``.
+
+    The jobs are inserted ``batch_size`` at a time rather than one query each.
+    Returns the number of jobs queued.
+    """
+    function = get_task(function) if isinstance(function, str) else function
+    run_at = run_at or timezone.now()
+    jobs = [
+        Job(
+            queue=queue or function.queue,
+            task=function.task_name,
+            payload=payload,
+            max_attempts=function.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+            run_at=run_at,
+        )
+        for payload in payloads
+    ]
+    Job.objects.bulk_create(jobs, batch_size=batch_size)
+    return len(jobs)
+
+
+def claim(queues, limit, worker):
+    """
+    Mark up to ``limit`` due jobs from ``queues`` as running for ``worker`` and return them.
+
+    Jobs are claimed oldest ``run_at`` first. Concurrent workers never claim
+    the same job: row locks are skipped where supported, and otherwise each
+    claim is a conditional update that only one worker can win.
+    """
+    now = timezone.now()
+    due = Job.objects.filter(queue__in=queues, status=Job.QUEUED, run_at__lte=now).order_by("run_at", "pk")
+    claimed = dict(status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F("attempts") + 1)
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list("pk", flat=True)[:limit])
+            Job.objects.filter(pk__in=ids).update(**claimed)
+    else:
+        ids = [
+            pk for pk in due.values_list("pk", flat=True)[:limit]
+            if Job.objects.filter(pk=pk, status=Job.QUEUED).update(**claimed)
+        ]
+    return list(Job.objects.filter(pk__in=ids).order_by("run_at", "pk"))
+
+
+def run(job):
+    """Run ``job``'s task and record the outcome; return True if it succeeded."""
+    try:
+        get_task(job.task)(**job.payload)
+    except Exception as error:
+        fail(job, error)
+        return False
+    Job.objects.filter(pk=job.pk).update(status=Job.DONE, finished_at=timezone.now(), last_error="")
+    return True
+
+
+def fail(job, error):
+    """Schedule a retry of ``job`` after a backoff, or move it to the dead-letter table."""
+    message = "".join(traceback.format_exception(error))
+    if isinstance(error, NotATask) or job.attempts >= job.max_attempts:
+        with transaction.atomic():
+            DeadLetter.objects.create(
+                job_id=job.pk,
+                queue=job.queue,
+                task=job.task,
+                payload=job.payload,
+                attempts=job.attempts,
+                error=message,
+                created_at=job.created_at,
+            )
+            Job.objects.filter(pk=job.pk).delete()
+        return
+
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.QUEUED,
+        run_at=timezone.now() + timedelta(seconds=backoff(job.attempts)),
+        locked_by="",
+        locked_at=None,
+        last_error=message,
+    )
+
+
+def backoff(attempts):
+    """Return the delay in seconds before retrying a job that has failed ``attempts`` times."""
+    delay = min(settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOBS_RETRY_BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def reclaim_expired():
+    """Queue again the running jobs whose worker has not finished them within ``JOBS_LEASE_TIMEOUT``."""
+    cutoff = timezone.now() - timedelta(seconds=settings.JOBS_LEASE_TIMEOUT)
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).update(
+        status=Job.QUEUED, locked_by="", locked_at=None,
+    )
+
+
+def requeue(dead_letter):
+    """Queue a dead-lettered job again with a fresh set of attempts and return the new :class:`Job`."""
+    with transaction.atomic():
+        job = Job.objects.create(
+            queue=dead_letter.queue,
+            task=dead_letter.task,
+            payload=dead_letter.payload,
+            max_attempts=settings.JOBS_MAX_ATTEMPTS,
+        )
+        dead_letter.delete()
+    return job
+
+
+def prune(batch_size=10000):
+    """Delete done jobs older than ``JOBS_RETENTION_HOURS``; return how many were deleted."""
+    deleted = 0
+    cutoff = timezone.now() - timedelta(hours=settings.JOBS_RETENTION_HOURS)
+    old = Job.objects.filter(status=Job.DONE, finished_at__lt=cutoff)
+    while True:
+        ids = list(old.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += Job.objects.filter(pk__in=ids).delete()[0]
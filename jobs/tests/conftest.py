@@ -0,0 +1,11 @@
+"""Test fixtures for jobs app."""
+import pytest
+
+from jobs.tests import tasks
+
+
+@pytest.fixture(autouse=True)
+def calls():
+    """Return the values recorded by ``tasks.record``, starting empty."""
+    tasks.calls.clear()
+    return tasks.calls
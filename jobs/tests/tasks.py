@@ -0,0 +1,20 @@
+"""Tasks used by the jobs tests."""
+from jobs.queue import task
+
+calls = []
+
+
+@task
+def record(value):
+    """Remember ``value``."""
+    calls.append(value)
+
+
+@task(queue="flaky", max_attempts=2)
+def explode(message):
+    """Fail with ``message``."""
+    raise RuntimeError(message)
+
+
+def not_a_task():
+    """Do nothing; never registered as a task."""
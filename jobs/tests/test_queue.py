@@ -0,0 +1,165 @@
+"""Tests for the job queue."""
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from jobs import queue
+from jobs.metrics import queue_stats
+from jobs.models import DeadLetter, Job
+from jobs.tests import tasks
+
+pytestmark = pytest.mark.django_db
+
+
+def run_due(queues=("default",)):
+    """Claim and run every due job in ``queues``."""
+    for job in queue.claim(list(queues), 100, "test"):
+        queue.run(job)
+
+
+def test_enqueue_and_run(calls):
+    """Test a queued job is claimed once, run with its payload and marked done."""
+    job = tasks.record.enqueue(value=42)
+    assert (job.queue, job.task, job.payload) == ("default", "jobs.tests.tasks.record", {"value": 42})
+    assert job.max_attempts == 5
+
+    claimed = queue.claim(["default"], 10, "worker-1")
+    assert [c.pk for c in claimed] == [job.pk]
+    assert queue.claim(["default"], 10, "worker-2") == []
+    assert claimed[0].attempts == 1
+
+    assert queue.run(claimed[0]) is True
+    assert calls == [42]
+    job.refresh_from_db()
+    assert (job.status, job.locked_by) == (Job.DONE, "worker-1")
+
+
+def test_enqueue_by_name_and_run_at(calls):
+    """Test jobs can be queued by task name and are not claimed before ``run_at``."""
+    queue.enqueue("jobs.tests.tasks.record", run_at=timezone.now() + timedelta(minutes=5), value=1)
+    assert queue.claim(["default"], 10, "test") == []
+    Job.objects.update(run_at=timezone.now())
+    run_due()
+    assert calls == [1]
+
+
+def test_enqueue_many_inserts_in_batches(calls, django_assert_num_queries):
+    """Test a batch of calls is queued with one insert per ``batch_size`` jobs."""
+    with django_assert_num_queries(2):
+        assert queue.enqueue_many(tasks.record, [{"value": i} for i in range(5)], batch_size=3) == 5
+
+    run_due()
+    assert sorted(calls) == [0, 1, 2, 3, 4]
+
+
+def test_claim_respects_queues_order_and_limit():
+    """Test claims take the oldest due jobs of the requested queues only."""
+    now = timezone.now()
+    jobs = [tasks.record.enqueue(value=i, run_at=now - timedelta(seconds=10 - i)) for i in range(5)]
+    queue.enqueue(tasks.record, queue="other", value=99)
+
+    claimed = queue.claim(["default"], 3, "test")
+
+    assert [job.pk for job in claimed] == [job.pk for job in jobs[:3]]
+
+
+def test_enqueue_is_transactional():
+    """Test a job queued in a rolled back transaction disappears with it."""
+    with pytest.raises(RuntimeError), transaction.atomic():
+        tasks.record.enqueue(value=1)
+        raise RuntimeError
+    assert not Job.objects.exists()
+
+
+def test_failed_job_is_retried_with_backoff(settings):
+    """Test a failure puts the job back with an exponential delay and the error."""
+    settings.JOBS_RETRY_BACKOFF = 10
+    job = tasks.explode.enqueue(message="boom")
+
+    started = timezone.now()
+    run_due(["flaky"])
+
+    job.refresh_from_db()
+    assert (job.status, job.attempts, job.locked_by) == (Job.QUEUED, 1, "")
+    assert "RuntimeError: boom" in job.last_error
+    assert started + timedelta(seconds=5) <= job.run_at <= timezone.now() + timedelta(seconds=10)
+    assert 10 <= queue.backoff(2) <= 20
+    assert queue.backoff(30) <= settings.JOBS_RETRY_BACKOFF_MAX
+
+
+def test_exhausted_job_is_dead_lettered_and_can_be_requeued():
+    """Test a job out of attempts moves to the dead-letter table."""
+    job = tasks.explode.enqueue(message="boom")
+    for _ in range(2):
+        Job.objects.update(run_at=timezone.now())
+        run_due(["flaky"])
+
+    assert not Job.objects.exists()
+    dead = DeadLetter.objects.get()
+    assert (dead.job_id, dead.task, dead.payload, dead.attempts) == (job.pk, job.task, {"message": "boom"}, 2)
+
+    requeued = queue.requeue(dead)
+    assert (requeued.task, requeued.status, requeued.attempts) == (job.task, Job.QUEUED, 0)
+    assert not DeadLetter.objects.exists()
+
+
+@pytest.mark.parametrize("name", ["jobs.tests.tasks.not_a_task", "jobs.tests.tasks.missing"])
+def test_unknown_task_is_dead_lettered_at_once(name):
+    """Test a job naming something that is not a task is not retried."""
+    Job.objects.create(task=name, max_attempts=5)
+    run_due()
+    assert "NotATask" in DeadLetter.objects.get().error
+
+
+def test_expired_lease_is_reclaimed(settings, calls):
+    """Test a job claimed by a worker that died is queued again after the lease timeout."""
+    tasks.record.enqueue(value=7)
+    queue.claim(["default"], 1, "dead-worker")
+    assert queue.reclaim_expired() == 0
+
+    Job.objects.update(locked_at=timezone.now() - timedelta(seconds=settings.JOBS_LEASE_TIMEOUT + 1))
+    assert queue.reclaim_expired() == 1
+    run_due()
+    assert calls == [7]
+    assert Job.objects.get().attempts == 2
+
+
+def test_prune_deletes_old_done_jobs(settings):
+    """Test done jobs are deleted after the retention period, others kept."""
+    for value in range(3):
+        tasks.record.enqueue(value=value)
+    run_due()
+    tasks.record.enqueue(value=3)
+    Job.objects.filter(status=Job.DONE).exclude(payload__value=0).update(
+        finished_at=timezone.now() - timedelta(hours=settings.JOBS_RETENTION_HOURS + 1),
+    )
+
+    assert queue.prune(batch_size=1) == 2
+    assert Job.objects.count() == 2
+
+
+def test_queue_stats_and_command(capsys):
+    """Test the per-queue backlog and throughput metrics."""
+    for value in range(3):
+        tasks.record.enqueue(value=value)
+    run_due()
+    tasks.record.enqueue(value=3)
+    tasks.record.enqueue(value=4, run_at=timezone.now() + timedelta(hours=1))
+    tasks.explode.enqueue(message="boom")
+    Job.objects.filter(queue="flaky").update(max_attempts=1)
+    run_due(["flaky"])
+
+    stats = queue_stats(timedelta(minutes=1))
+
+    assert stats["default"]["ready"] == 1
+    assert stats["default"]["scheduled"] == 1
+    assert stats["default"]["done"] == 3
+    assert stats["default"]["per_minute"] == 3.0
+    assert stats["default"]["mean_seconds"] is not None
+    assert stats["flaky"]["dead"] == 1
+
+    call_command("job_stats", "--window", "1")
+    assert "default" in capsys.readouterr().out
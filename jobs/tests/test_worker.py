@@ -0,0 +1,69 @@
+"""Tests for the job worker."""
+import threading
+
+import pytest
+from django.core.management import call_command
+
+from jobs.models import DeadLetter, Job
+from jobs.tests import tasks
+from jobs.worker import QueueCounters, Worker
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def test_burst_worker_runs_every_job(calls):
+    """Test a burst worker runs all due jobs on its threads, then exits."""
+    for value in range(20):
+        tasks.record.enqueue(value=value)
+    tasks.explode.enqueue(message="boom")
+    lines = []
+
+    Worker(["default", "flaky"], threads=4, poll_interval=0.01, log=lines.append).run(burst=True)
+
+    assert sorted(calls) == list(range(20))
+    assert Job.objects.filter(status=Job.DONE).count() == 20
+    assert Job.objects.get(queue="flaky").status == Job.QUEUED
+    assert any(line.startswith("queue=default ") and "succeeded=20" in line for line in lines)
+    assert any(line.startswith("queue=flaky ") and "failed=1" in line for line in lines)
+
+
+def test_worker_stops_on_request(calls):
+    """Test a running worker picks up new jobs and returns once stopped."""
+    worker = Worker(["default"], threads=2, poll_interval=0.01)
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    tasks.record.enqueue(value=1)
+    for _ in range(500):
+        if calls:
+            break
+        threading.Event().wait(0.01)
+    worker.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert calls == [1]
+
+
+def test_runworker_command(calls, capsys):
+    """Test runworker --burst processes the named queues."""
+    tasks.record.enqueue(value=1)
+    tasks.explode.enqueue(message="boom")
+    Job.objects.filter(queue="flaky").update(max_attempts=1)
+
+    call_command("runworker", "--burst", "-q", "default", "-q", "flaky", "--threads", "2", "--poll-interval", "0.01")
+
+    assert calls == [1]
+    assert DeadLetter.objects.count() == 1
+    assert "running default, flaky on 2 threads" in capsys.readouterr().out
+
+
+def test_queue_counters_report():
+    """Test the throughput report covers each queue and resets."""
+    counters = QueueCounters()
+    counters.record("default", True, 0.5)
+    counters.record("default", False, 1.5)
+
+    [line] = counters.report()
+
+    assert "succeeded=1 failed=1 mean_ms=1000.0" in line
+    assert counters.report() == []
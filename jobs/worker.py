@@ -0,0 +1,142 @@
+"""
+The worker loop behind ``manage.py runworker``.
+
+A :class:`Worker` claims as many due jobs as it has idle threads, runs them on
+a thread pool and polls again, every ``poll_interval`` seconds while the
+queues are empty. Each thread uses its own database connection. Running
+several worker processes (``runworker --processes``) adds CPU parallelism;
+claims never overlap (see :func:`jobs.queue.claim`).
+
+The worker also queues again jobs lost with a crashed worker, prunes old done
+jobs, and reports per-queue throughput every ``stats_interval`` seconds.
+"""
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from . import queue
+
+
+class QueueCounters:
+    """Jobs finished per queue since the last report."""
+
+    def __init__(self):
+        """Start from zero."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zero the counters and restart the clock."""
+        self.started = time.monotonic()
+        self.counts = defaultdict(lambda: {"succeeded": 0, "failed": 0, "seconds": 0.0})
+
+    def record(self, queue_name, succeeded, seconds):
+        """Count a finished job."""
+        with self._lock:
+            counts = self.counts[queue_name]
+            counts["succeeded" if succeeded else "failed"] += 1
+            counts["seconds"] += seconds
+
+    def report(self):
+        """Return one line per queue (jobs/s, failures, mean run time) and reset the counters."""
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            lines = []
+            for name, counts in sorted(self.counts.items()):
+                finished = counts["succeeded"] + counts["failed"]
+                lines.append(
+                    f"queue={name} jobs/s={finished / elapsed:.2f} succeeded={counts['succeeded']} "
+                    f"failed={counts['failed']} mean_ms={1000 * counts['seconds'] / finished:.1f}"
+                )
+            self.reset()
+        return lines
+
+
+class Worker:
+    """Claim and run jobs from ``queues`` on ``threads`` threads."""
+
+    def __init__(self, queues, threads=4, poll_interval=None, stats_interval=60, log=None):
+        """Configure the worker; ``log`` receives status lines."""
+        self.queues = list(queues)
+        self.threads = threads
+        self.poll_interval = settings.JOBS_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.stats_interval = stats_interval
+        self.log = log or (lambda line: None)
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.counters = QueueCounters()
+        self.stopping = threading.Event()
+        self._busy = 0
+        self._changed = threading.Condition()
+
+    def run(self, burst=False):
+        """Process jobs until :meth:`stop` is called, or, with ``burst``, until no job is due."""
+        executor = ThreadPoolExecutor(self.threads, thread_name_prefix="job")
+        next_stats = next_maintenance = time.monotonic()
+        try:
+            while not self.stopping.is_set():
+                now = time.monotonic()
+                if now >= next_maintenance:
+                    queue.reclaim_expired()
+                    queue.prune()
+                    next_maintenance = now + settings.JOBS_LEASE_TIMEOUT / 2
+                if self.stats_interval and now >= next_stats:
+                    for line in self.counters.report():
+                        self.log(line)
+                    next_stats = now + self.stats_interval
+
+                claimed = self.claim()
+                for job in claimed:
+                    executor.submit(self._run, job)
+                if not claimed:
+                    if burst and self._all_idle():
+                        break
+                    self.stopping.wait(self.poll_interval)
+        finally:
+            executor.shutdown(wait=True)
+            connection.close()
+        for line in self.counters.report():
+            self.log(line)
+
+    def claim(self):
+        """Claim as many jobs as there are idle threads, waiting for one to free up if all are busy."""
+        with self._changed:
+            while self._busy >= self.threads and not self.stopping.is_set():
+                self._changed.wait(self.poll_interval)
+            idle = self.threads - self._busy
+            if idle <= 0:
+                return []
+            self._busy += idle
+        jobs = queue.claim(self.queues, idle, self.name)
+        with self._changed:
+            self._busy -= idle - len(jobs)
+        return jobs
+
+    def _all_idle(self):
+        """Return True if no job is running."""
+        with self._changed:
+            return self._busy == 0
+
+    def _run(self, job):
+        """Run ``job`` on a pool thread."""
+        close_old_connections()
+        started = time.monotonic()
+        try:
+            succeeded = queue.run(job)
+            self.counters.record(job.queue, succeeded, time.monotonic() - started)
+        finally:
+            close_old_connections()
+            with self._changed:
+                self._busy -= 1
+                self._changed.notify()
+
+    def stop(self):
+        """Finish the running jobs and return from :meth:`run`."""
+        self.stopping.set()
+        with self._changed:
+            self._changed.notify_all()
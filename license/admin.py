@@ -1,6 +1,23 @@
 from django.contrib import admin
+
+from config.pagination import EstimatedCountPaginator
 from .models import License
 
-# Register your models here.
 
-admin.site.register(License)
+@admin.register(License)
+class LicenseAdmin(admin.ModelAdmin):
+    list_display = ('licenseId', 'IdNo', 'issue_date', 'expiry_date')
+    list_select_related = ('IdNo',)
+    autocomplete_fields = ('IdNo',)
+    search_fields = ('licenseId',)
+    date_hierarchy = 'issue_date'
+    ordering = ('-issue_date', 'licenseId')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """Look up the license id exactly, through its unique index."""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.filter(licenseId=search_term), False
@@ -0,0 +1,130 @@
+"""Async license verification views.
+
+These are plain Django async views rather than DRF views (DRF does not
+support ``async def`` handlers). Under the ASGI application they wait on the
+cache and database without holding a worker thread. Responses have the same
+shape as :class:`license.views.LicenseDetailView` and
+:class:`license.views.BulkLicenseVerificationView`.
+"""
+import json
+import time
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken, TokenError)
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.authentication import CachedJWTAuthentication
+from accounts.cache import get_user_snapshot
+
+from .cache import (aget_license_snapshot, aget_license_snapshots,
+                    license_status)
+from .serializers import BulkLicenseVerificationSerializer
+
+
+def _response(data, status_code):
+    """Return ``data`` as JSON, encoding dates the way DRF does."""
+    return JsonResponse(data, status=status_code, encoder=DjangoJSONEncoder, safe=False)
+
+
+def _unauthorized(detail):
+    """Return the 401 response DRF sends for JWT authentication failures."""
+    response = _response({'detail': detail}, status.HTTP_401_UNAUTHORIZED)
+    response['WWW-Authenticate'] = 'Bearer realm="api"'
+    return response
+
+
+async def authenticate(request):
+    """
+    Authenticate ``request`` from its ``Authorization: Bearer`` header.
+
+    Returns ``(user, None)`` on success or ``(None, response)`` with the 401
+    to send back. The user is resolved like ``CachedJWTAuthentication`` does;
+    only a snapshot cache miss touches the database.
+    """
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None, _unauthorized('Authentication credentials were not provided.')
+
+    try:
+        token = authentication.get_validated_token(raw_token)
+        user_id = token[api_settings.USER_ID_CLAIM]
+    except (InvalidToken, TokenError, KeyError):
+        return None, _unauthorized('Given token not valid for any token type')
+
+    snapshot = authentication.get_known_snapshot(user_id, token)
+    if snapshot is None:
+        snapshot = await sync_to_async(get_user_snapshot)(user_id)
+    try:
+        user = authentication.user_from_snapshot(user_id, snapshot)
+    except AuthenticationFailed as e:
+        return None, _unauthorized(e.detail)
+
+    request.user = user
+    return user, None
+
+
+async def license_detail(request, license_id):
+    """
+    Async variant of ``licenses/<license_id>/``.
+
+    Returns:
+    - 200 OK: {'licenseId', 'issue_date', 'expiry_date', 'status'}
+    - 401 Unauthorized: Missing or invalid access token
+    - 404 Not Found: {'error': 'License does not exist'}
+    - 405 Method Not Allowed: Anything but GET
+    """
+    if request.method != 'GET':
+        return _response({'detail': f'Method "{request.method}" not allowed.'}, status.HTTP_405_METHOD_NOT_ALLOWED)
+    user, error = await authenticate(request)
+    if error:
+        return error
+
+    snapshot = await aget_license_snapshot(license_id)
+    if snapshot is None:
+        return _response({'error': 'License does not exist'}, status.HTTP_404_NOT_FOUND)
+    return _response(license_status(snapshot), status.HTTP_200_OK)
+
+
+async def license_bulk_verify(request):
+    """
+    Async variant of ``licenses/bulk/verify/``.
+
+    Returns:
+    - 200 OK: {'count', 'elapsed_ms', 'results'}
+    - 400 Bad Request: Malformed JSON, or missing, empty or oversized list of ids
+    - 401 Unauthorized: Missing or invalid access token
+    - 405 Method Not Allowed: Anything but POST
+    """
+    if request.method != 'POST':
+        return _response({'detail': f'Method "{request.method}" not allowed.'}, status.HTTP_405_METHOD_NOT_ALLOWED)
+    started = time.perf_counter()
+    user, error = await authenticate(request)
+    if error:
+        return error
+
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return _response({'detail': 'JSON parse error'}, status.HTTP_400_BAD_REQUEST)
+    serializer = BulkLicenseVerificationSerializer(data=payload)
+    if not serializer.is_valid():
+        return _response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+    snapshots = await aget_license_snapshots(serializer.validated_data['license_ids'])
+    today = date.today()
+    results = [
+        license_status(snapshot, today) if snapshot else {'licenseId': license_id, 'status': 'not found'}
+        for license_id, snapshot in snapshots.items()
+    ]
+    return _response({
+        'count': len(results),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+        'results': results,
+    }, status.HTTP_200_OK)
@@ -0,0 +1,298 @@
+"""Read-through cache for license verification lookups.
+
+Entries are keyed by ``licenseId`` and hold only the immutable facts needed to
+answer a verification call (id, issue date, expiry date). The ``valid`` /
+``expired`` status is derived from those dates at read time, so a cached entry
+never goes stale across midnight.
+
+Unknown ids are cached too (negative caching) with a shorter timeout so that
+floods of fake license numbers are answered without reaching the database.
+
+Cache misses are answered from the shared snapshot file (:mod:`license.snapshot`)
+when one is configured, unless the license has changed since: saving or
+deleting a license leaves a dirty mark for ``LICENSE_SNAPSHOT_DIRTY_TIMEOUT``
+seconds, during which its misses go to the database instead. The marks live in
+their own cache (``LICENSE_DIRTY_CACHE_ALIAS``); the snapshot is only used when
+that cache is shared by every worker and the snapshot is younger than the
+marks, and ids missing from a snapshot older than ``LICENSE_SNAPSHOT_MAX_AGE``
+are looked up in the database.
+"""
+import logging
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from . import snapshot as snapshot_file
+from .models import License
+
+KEY_PREFIX = "license:"
+
+DIRTY_PREFIX = "license-dirty:"
+
+# Stored in place of a snapshot when the license does not exist.
+MISSING = "__missing__"
+
+logger = logging.getLogger(__name__)
+
+# Reasons a snapshot was ignored that have been logged, with its build time,
+# so that each is logged once per snapshot rather than on every lookup.
+_warned = set()
+
+
+def get_cache():
+    """Return the cache backend used for license lookups."""
+    return caches[settings.LICENSE_CACHE_ALIAS]
+
+
+def get_dirty_cache():
+    """Return the cache backend holding the snapshot dirty marks."""
+    return caches[settings.LICENSE_DIRTY_CACHE_ALIAS]
+
+
+def marks_are_shared():
+    """Return True when the dirty marks are visible to every worker, which the snapshot requires."""
+    return not isinstance(get_dirty_cache(), (LocMemCache, DummyCache))
+
+
+def make_key(license_id):
+    """Return the cache key for ``license_id``."""
+    return f"{KEY_PREFIX}{license_id}"
+
+
+def make_dirty_key(license_id):
+    """Return the cache key marking ``license_id`` as changed since the snapshot build."""
+    return f"{DIRTY_PREFIX}{license_id}"
+
+
+def snapshot_from_instance(instance):
+    """Return the cacheable snapshot of a ``License`` instance."""
+    return {
+        'licenseId': instance.licenseId,
+        'issue_date': instance.issue_date,
+        'expiry_date': instance.expiry_date,
+    }
+
+
+def license_status(snapshot, today=None):
+    """Return the verification payload for ``snapshot`` as of ``today``."""
+    today = today or date.today()
+    return {
+        'licenseId': snapshot['licenseId'],
+        'issue_date': snapshot['issue_date'],
+        'expiry_date': snapshot['expiry_date'],
+        'status': 'expired' if snapshot['expiry_date'] < today else 'valid',
+    }
+
+
+def _possible(license_id):
+    """Return False for ids longer than the ``licenseId`` column, which can never match."""
+    return len(license_id) <= License._meta.get_field('licenseId').max_length
+
+
+def _lookup(license_ids):
+    """Return the queryset resolving ``license_ids`` in one ``IN`` query."""
+    return License.objects.filter(licenseId__in=license_ids).only('licenseId', 'issue_date', 'expiry_date')
+
+
+def _keys(license_ids):
+    """Return the entry cache keys of ``license_ids``."""
+    return [make_key(license_id) for license_id in license_ids]
+
+
+def _dirty_keys(license_ids):
+    """Return the dirty-mark cache keys of ``license_ids``."""
+    return [make_dirty_key(license_id) for license_id in license_ids]
+
+
+def _partition(candidates, cached):
+    """
+    Resolve ``candidates`` from a ``get_many`` result over :func:`_keys`.
+
+    Returns the snapshots found (None for known-missing ids) and the ids
+    still to look up.
+    """
+    hits, misses = {}, []
+    for license_id in candidates:
+        value = cached.get(make_key(license_id))
+        if value is not None:
+            hits[license_id] = None if value == MISSING else value
+        else:
+            misses.append(license_id)
+    return hits, misses
+
+
+def get_usable_snapshot():
+    """
+    Return the snapshot to answer cache misses from, or None.
+
+    None when no snapshot is configured or built, when the dirty marks are not
+    shared (other workers' changes would go unseen), or when the snapshot is
+    older than the dirty marks, which may have expired for licenses changed
+    since.
+    """
+    snapshot = snapshot_file.get_snapshot()
+    if snapshot is None:
+        return None
+    if not marks_are_shared():
+        _warn_once(snapshot, "License snapshot ignored: %s is not a shared cache.", settings.LICENSE_DIRTY_CACHE_ALIAS)
+        return None
+    if time.time() - snapshot.built_at > settings.LICENSE_SNAPSHOT_DIRTY_TIMEOUT:
+        _warn_once(snapshot, "License snapshot ignored: built more than LICENSE_SNAPSHOT_DIRTY_TIMEOUT seconds ago.")
+        return None
+    return snapshot
+
+
+def _warn_once(snapshot, message, *args):
+    """Log ``message`` unless it has already been logged for ``snapshot``."""
+    if (message, snapshot.built_at) not in _warned:
+        _warned.add((message, snapshot.built_at))
+        logger.warning(message, *args)
+
+
+def _from_snapshot(snapshot, misses, dirty):
+    """
+    Answer ``misses`` without a mark in ``dirty`` (a ``get_many`` result over :func:`_dirty_keys`) from ``snapshot``.
+
+    Ids missing from a snapshot older than ``LICENSE_SNAPSHOT_MAX_AGE`` may
+    have been created since and are left to the database. Returns the
+    snapshots found and the ids still to look up.
+    """
+    stale = time.time() - snapshot.built_at > settings.LICENSE_SNAPSHOT_MAX_AGE
+    hits, remaining = {}, []
+    for license_id in misses:
+        found = None if make_dirty_key(license_id) in dirty else snapshot.get(license_id)
+        if found is not None or (not stale and make_dirty_key(license_id) not in dirty):
+            hits[license_id] = found
+        else:
+            remaining.append(license_id)
+    return hits, remaining
+
+
+def _resolve(candidates):
+    """Return the snapshots of ``candidates`` found in the cache or the snapshot file, and the ids left."""
+    hits, misses = _partition(candidates, get_cache().get_many(_keys(candidates)))
+    snapshot = get_usable_snapshot() if misses else None
+    if snapshot is not None:
+        found, misses = _from_snapshot(snapshot, misses, get_dirty_cache().get_many(_dirty_keys(misses)))
+        hits.update(found)
+    return hits, misses
+
+
+async def _aresolve(candidates):
+    """Async variant of :func:`_resolve`."""
+    hits, misses = _partition(candidates, await get_cache().aget_many(_keys(candidates)))
+    snapshot = get_usable_snapshot() if misses else None
+    if snapshot is not None:
+        found, misses = _from_snapshot(snapshot, misses, await get_dirty_cache().aget_many(_dirty_keys(misses)))
+        hits.update(found)
+    return hits, misses
+
+
+def _entries(found, misses):
+    """Return the positive and negative cache entries for a database lookup."""
+    positive = {make_key(license_id): snapshot for license_id, snapshot in found.items()}
+    negative = {make_key(license_id): MISSING for license_id in misses if license_id not in found}
+    return positive, negative
+
+
+def _store(cache, found, misses):
+    """Write positive and negative entries to ``cache``."""
+    positive, negative = _entries(found, misses)
+    if positive:
+        cache.set_many(positive, timeout=settings.LICENSE_CACHE_TIMEOUT)
+    if negative:
+        cache.set_many(negative, timeout=settings.LICENSE_CACHE_NEGATIVE_TIMEOUT)
+
+
+async def _astore(cache, found, misses):
+    """Async variant of :func:`_store`."""
+    positive, negative = _entries(found, misses)
+    if positive:
+        await cache.aset_many(positive, timeout=settings.LICENSE_CACHE_TIMEOUT)
+    if negative:
+        await cache.aset_many(negative, timeout=settings.LICENSE_CACHE_NEGATIVE_TIMEOUT)
+
+
+def get_license_snapshot(license_id):
+    """
+    Return the snapshot for ``license_id`` or ``None`` if it does not exist.
+
+    The database is only queried when neither the cache nor the snapshot file
+    can answer. Ids longer than the
+    ``licenseId`` column can never match and are rejected without touching
+    the cache or the database.
+    """
+    if not _possible(license_id):
+        return None
+
+    hits, misses = _resolve([license_id])
+    if not misses:
+        return hits[license_id]
+
+    instance = _lookup([license_id]).first()
+    found = {license_id: snapshot_from_instance(instance)} if instance else {}
+    _store(get_cache(), found, [license_id])
+    return found.get(license_id)
+
+
+async def aget_license_snapshot(license_id):
+    """Async variant of :func:`get_license_snapshot`."""
+    if not _possible(license_id):
+        return None
+
+    hits, misses = await _aresolve([license_id])
+    if not misses:
+        return hits[license_id]
+
+    instance = await _lookup([license_id]).afirst()
+    found = {license_id: snapshot_from_instance(instance)} if instance else {}
+    await _astore(get_cache(), found, [license_id])
+    return found.get(license_id)
+
+
+def get_license_snapshots(license_ids):
+    """
+    Return a ``{license_id: snapshot or None}`` mapping for ``license_ids``.
+
+    Cached ids are served from a single ``get_many`` and clean misses from the
+    snapshot file; the remaining ids are resolved with one ``IN`` query and
+    written back to the cache.
+    """
+    results = dict.fromkeys(license_ids)
+    candidates = [license_id for license_id in results if _possible(license_id)]
+
+    hits, misses = _resolve(candidates)
+    results.update(hits)
+
+    if misses:
+        found = {instance.licenseId: snapshot_from_instance(instance) for instance in _lookup(misses)}
+        _store(get_cache(), found, misses)
+        results.update(found)
+
+    return results
+
+
+async def aget_license_snapshots(license_ids):
+    """Async variant of :func:`get_license_snapshots`."""
+    results = dict.fromkeys(license_ids)
+    candidates = [license_id for license_id in results if _possible(license_id)]
+
+    hits, misses = await _aresolve(candidates)
+    results.update(hits)
+
+    if misses:
+        found = {instance.licenseId: snapshot_from_instance(instance) async for instance in _lookup(misses)}
+        await _astore(get_cache(), found, misses)
+        results.update(found)
+
+    return results
+
+
+def invalidate_license(license_id):
+    """Drop any cached entry for ``license_id`` and mark it as changed since the snapshot."""
+    get_cache().delete(make_key(license_id))
+    get_dirty_cache().set(make_dirty_key(license_id), True, settings.LICENSE_SNAPSHOT_DIRTY_TIMEOUT)
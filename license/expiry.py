@@ -0,0 +1,136 @@
+"""
+Renewal reminders for licenses about to expire.
+
+:func:`sweep` walks the licenses expiring in the next
+``LICENSE_EXPIRY_REMINDER_DAYS`` days in ``(expiry_date, id)`` order, one
+chunk at a time. Each chunk is a range seek on ``license_expiry_idx`` that
+starts after the last row of the previous one, so every chunk costs the same
+however far the walk has got, and only the licenses in the window are read.
+
+For each chunk, one reminder job (:func:`send_renewal_reminder`, on the
+``notifications`` queue) is queued per license not yet reminded of its
+current expiry date. The licenses are marked as reminded in the same
+transaction, so running the sweep daily reminds each holder once per expiry.
+Renewing a license changes its expiry date, which makes it due again before
+the next one.
+
+The sweep also counts the licenses expiring on each day of the window, whether
+reminded or not; :func:`write_counts` writes them as CSV.
+"""
+import csv
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import Q
+
+from jobs.queue import enqueue_many, task
+
+from .models import License
+
+
+def walk(start, end, chunk_size):
+    """
+    Yield the licenses expiring from ``start`` up to (excluding) ``end``, ``chunk_size`` at a time.
+
+    Each chunk is a list of ``(pk, licenseId, expiry_date, reminded_for)``
+    tuples in ``(expiry_date, pk)`` order.
+    """
+    window = (
+        License.objects.filter(expiry_date__gte=start, expiry_date__lt=end)
+        .order_by('expiry_date', 'pk')
+        .values_list('pk', 'licenseId', 'expiry_date', 'reminded_for')
+    )
+    queryset = window
+    while True:
+        rows = list(queryset[:chunk_size])
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        pk, _, expiry_date, _ = rows[-1]
+        queryset = window.filter(Q(expiry_date__gt=expiry_date) | Q(expiry_date=expiry_date, pk__gt=pk))
+
+
+def _remind(rows):
+    """Queue reminders for ``rows`` and mark them as reminded of their expiry date."""
+    by_day = {}
+    for pk, _, expiry_date, _ in rows:
+        by_day.setdefault(expiry_date, []).append(pk)
+    with transaction.atomic():
+        enqueue_many(send_renewal_reminder, [
+            {'license_id': license_id, 'expiry_date': expiry_date.isoformat()}
+            for _, license_id, expiry_date, _ in rows
+        ])
+        for expiry_date, pks in by_day.items():
+            License.objects.filter(pk__in=pks).update(reminded_for=expiry_date)
+
+
+def sweep(today=None, days=None, chunk_size=None):
+    """
+    Queue renewal reminders for the licenses expiring within ``days`` of ``today``.
+
+    ``days`` defaults to ``LICENSE_EXPIRY_REMINDER_DAYS`` and ``chunk_size`` to
+    ``LICENSE_EXPIRY_SWEEP_CHUNK_SIZE``. Returns ``(counts, reminded)``: the
+    number of licenses expiring on each day of the window, zeros included, and
+    the number of reminders queued.
+    """
+    today = today or date.today()
+    days = settings.LICENSE_EXPIRY_REMINDER_DAYS if days is None else days
+    counts = {today + timedelta(days=offset): 0 for offset in range(days)}
+    reminded = 0
+    for rows in walk(today, today + timedelta(days=days), chunk_size or settings.LICENSE_EXPIRY_SWEEP_CHUNK_SIZE):
+        for row in rows:
+            counts[row[2]] += 1
+        due = [row for row in rows if row[3] != row[2]]
+        if due:
+            _remind(due)
+            reminded += len(due)
+    return counts, reminded
+
+
+def write_counts(counts, stream):
+    """Write ``counts`` to ``stream`` as ``expiry_date,count`` CSV rows, by day."""
+    writer = csv.writer(stream)
+    writer.writerow(['expiry_date', 'count'])
+    for day in sorted(counts):
+        writer.writerow([day.isoformat(), counts[day]])
+
+
+def _holder_email(license):
+    """Return the email of the holder's most recent application, or None."""
+    from application.models import DriversLicenseApplication
+
+    return (
+        DriversLicenseApplication.objects.filter(nationalId=license.IdNo_id)
+        .exclude(email='')
+        .order_by('-applied_at')
+        .values_list('email', flat=True)
+        .first()
+    )
+
+
+@task(queue='notifications')
+def send_renewal_reminder(license_id, expiry_date):
+    """
+    Email the holder of ``license_id`` that it expires on ``expiry_date``.
+
+    Nothing is sent when the license is gone or has been renewed since the
+    reminder was queued, or when the holder left no email address.
+    """
+    license = License.objects.filter(licenseId=license_id).only('licenseId', 'IdNo', 'expiry_date').first()
+    if license is None or license.expiry_date.isoformat() != expiry_date:
+        return
+    email = _holder_email(license)
+    if not email:
+        return
+    send_mail(
+        subject=f"Your driver's license {license_id} expires on {expiry_date}",
+        message=(
+            f"Your driver's license {license_id} expires on {expiry_date}. "
+            "Apply for a renewal before then to keep driving legally."
+        ),
+        from_email=None,
+        recipient_list=[email],
+    )
@@ -0,0 +1 @@
+"""License management."""
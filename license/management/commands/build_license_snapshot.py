@@ -0,0 +1,40 @@
+"""Build the memory-mapped license snapshot read by every worker."""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from license import snapshot
+
+
+class Command(BaseCommand):
+    """Write every license to the snapshot file, once or on an interval."""
+
+    help = (
+        "Write every license to LICENSE_SNAPSHOT_PATH (sorted fixed-width records behind a Bloom filter). "
+        "Run it from cron, or keep it running with --every SECONDS. Rebuild more often than "
+        "LICENSE_SNAPSHOT_DIRTY_TIMEOUT."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("--path", default=None, help="Output file (default: settings.LICENSE_SNAPSHOT_PATH).")
+        parser.add_argument("--every", type=int, default=0, help="Rebuild every SECONDS instead of once.")
+        parser.add_argument("--error-rate", type=float, default=0.001, help="Bloom filter false positive rate.")
+
+    def handle(self, *args, **options):
+        """Build the snapshot."""
+        path = options["path"] or settings.LICENSE_SNAPSHOT_PATH
+        if not path:
+            raise CommandError("LICENSE_SNAPSHOT_PATH is not set; pass --path.")
+        if options["every"] and options["every"] >= settings.LICENSE_SNAPSHOT_DIRTY_TIMEOUT:
+            raise CommandError("--every must be shorter than LICENSE_SNAPSHOT_DIRTY_TIMEOUT.")
+
+        while True:
+            started = time.perf_counter()
+            count = snapshot.build(path, error_rate=options["error_rate"])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"Wrote {count} licenses to {path} in {elapsed:.2f}s")
+            if not options["every"]:
+                return
+            time.sleep(max(options["every"] - elapsed, 0))
@@ -0,0 +1,45 @@
+"""Queue renewal reminders for licenses about to expire and export the daily expiry counts."""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from license import expiry
+
+
+class Command(BaseCommand):
+    """Walk the licenses expiring soon in keyset-ordered chunks."""
+
+    help = (
+        "Queue a renewal reminder for every license expiring within --days days that has not had one for its "
+        "expiry date, and write the number of licenses expiring per day as CSV. Run it daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--days", type=int, default=None, help="Window length (default: settings.LICENSE_EXPIRY_REMINDER_DAYS)."
+        )
+        parser.add_argument("--chunk-size", type=int, default=None, help="Licenses read per round trip.")
+        parser.add_argument("--output", default="-", help="CSV file for the daily counts, '-' for stdout (default).")
+
+    def handle(self, *args, **options):
+        """Run the sweep and write the counts."""
+        if options["days"] is not None and options["days"] < 1:
+            raise CommandError("--days must be at least 1.")
+        if options["chunk_size"] is not None and options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        started = time.perf_counter()
+        counts, reminded = expiry.sweep(days=options["days"], chunk_size=options["chunk_size"])
+        elapsed = time.perf_counter() - started
+
+        output = options["output"]
+        stream = self.stdout if output == "-" else open(output, "w", newline="")
+        try:
+            expiry.write_counts(counts, stream)
+        finally:
+            if stream is not self.stdout:
+                stream.close()
+        self.stderr.write(self.style.SUCCESS(
+            f"Queued {reminded} renewal reminders for {sum(counts.values())} expiring licenses in {elapsed:.2f}s"
+        ))
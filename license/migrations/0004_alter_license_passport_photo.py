@@ -0,0 +1,19 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:19
+
+from django.db import migrations
+import uploads.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('license', '0003_alter_license_licenseid'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='license',
+            name='passport_photo',
+            field=uploads.fields.ImageField(upload_to='passport_photos/'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:27
+
+from django.db import migrations
+import uploads.fields
+import uploads.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('license', '0004_alter_license_passport_photo'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='license',
+            name='passport_photo',
+            field=uploads.fields.ImageField(storage=uploads.storage.get_blob_storage, upload_to='passport_photos/'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:49
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('license', '0005_alter_license_passport_photo'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='license',
+            name='issue_date',
+            field=models.DateField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
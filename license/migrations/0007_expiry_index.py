@@ -0,0 +1,22 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('license', '0006_alter_license_issue_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='license',
+            name='reminded_for',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(fields=['expiry_date', 'id'], name='license_expiry_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 from nationalId.models import NationalId
+from uploads.fields import ImageField
+from uploads.storage import get_blob_storage
 import uuid
 
 
@@ -8,9 +10,17 @@ import uuid
 class License(models.Model):
     IdNo = models.ForeignKey(NationalId,on_delete=models.CASCADE)
     licenseId = models.CharField(max_length=20, unique=True)
-    issue_date = models.DateField(default=timezone.now)
+    issue_date = models.DateField(default=timezone.now, db_index=True)
     expiry_date = models.DateField()
-    passport_photo = models.ImageField(upload_to='passport_photos/', null=False, blank=False)
+    passport_photo = ImageField(upload_to='passport_photos/', storage=get_blob_storage, null=False, blank=False)
+    # The expiry date a renewal reminder was last queued for (see license.expiry)
+    reminded_for = models.DateField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Keyset walk of licenses by expiry (see license.expiry)
+            models.Index(fields=['expiry_date', 'id'], name='license_expiry_idx'),
+        ]
 
     def __str__(self):
         return self.licenseId
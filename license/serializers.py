@@ -1,8 +1,20 @@
+from django.conf import settings
 from rest_framework import serializers
+from config.middleware import TimedSerializerMixin
+from uploads.serializers import ImageField
 from .models import License
 
-class LicenseSerializer(serializers.ModelSerializer):
+class LicenseSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    passport_photo = ImageField()
+
     class Meta:
         model = License
         fields = '__all__'
 
+
+class BulkLicenseVerificationSerializer(TimedSerializerMixin, serializers.Serializer):
+    license_ids = serializers.ListField(
+        child=serializers.CharField(max_length=64),
+        allow_empty=False,
+        max_length=settings.LICENSE_BULK_MAX_IDS,
+    )
@@ -0,0 +1,38 @@
+"""Signal handlers for the license app."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_license
+from .models import License
+
+
+@receiver(pre_save, sender=License)
+def remember_previous_license_id(sender, instance, update_fields=None, **kwargs):
+    """Read the ``licenseId`` an existing row is cached under before it is overwritten."""
+    instance._previous_license_id = None
+    if instance._state.adding or (update_fields is not None and 'licenseId' not in update_fields):
+        return
+    instance._previous_license_id = (
+        sender._base_manager.filter(pk=instance.pk).values_list('licenseId', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=License)
+@receiver(post_delete, sender=License)
+def invalidate_license_cache(sender, instance, **kwargs):
+    """
+    Drop the cached verification entry when a license changes.
+
+    A renamed license also drops the entry of its previous ``licenseId``. The
+    entries are dropped again once the transaction commits, so a concurrent
+    read that repopulated them with the pre-commit row does not linger.
+    """
+    license_ids = {instance.licenseId, instance.__dict__.pop('_previous_license_id', None)} - {None}
+
+    def invalidate():
+        for license_id in license_ids:
+            invalidate_license(license_id)
+
+    invalidate()
+    transaction.on_commit(invalidate)
@@ -0,0 +1,169 @@
+"""Memory-mapped, read-only snapshot of every license for verification lookups.
+
+``manage.py build_license_snapshot`` writes all licenses to one file at
+``LICENSE_SNAPSHOT_PATH``: a header, a Bloom filter over the ids, then
+fixed-width records sorted by id::
+
+    header   magic, format version, record count, key width, Bloom bits,
+             Bloom hashes, build time
+    bloom    ceil(bits / 8) bytes
+    records  count x (key width bytes of NUL-padded id, issue ordinal u32,
+             expiry ordinal u32)
+
+Every worker maps the file read-only, so the operating system keeps one copy
+in its page cache however many workers there are. A lookup is a Bloom filter
+probe and, for ids that may exist, a binary search over the records. Workers
+switch to a rebuilt file (swapped in with an atomic rename) within
+``LICENSE_SNAPSHOT_CHECK_INTERVAL`` seconds.
+
+Licenses saved or deleted since a build are marked dirty in a shared cache
+(see :mod:`license.cache`) and read from the database until the mark expires.
+"""
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+
+from config.bloom import BloomFilter
+
+from .models import License
+
+MAGIC = b"LSNP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHIHQBd")
+DATES = struct.Struct("<II")
+
+_lock = threading.Lock()
+_current = None
+_checked_at = 0.0
+
+
+class LicenseSnapshot:
+    """A mapped snapshot file."""
+
+    def __init__(self, path):
+        """Map the snapshot at ``path``."""
+        with open(path, "rb") as file:
+            self.stat = os.fstat(file.fileno())
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.key_width, bloom_bits, bloom_hashes, self.built_at = (
+            HEADER.unpack_from(self._map)
+        )
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} license snapshot")
+
+        bloom_start = HEADER.size
+        self._records = bloom_start + (bloom_bits + 7) // 8
+        self._record_size = self.key_width + DATES.size
+        view = memoryview(self._map)
+        self.bloom = BloomFilter.from_bytes(view[bloom_start:self._records], bloom_bits, bloom_hashes)
+
+    def _key(self, index):
+        """Return the padded id of record ``index``."""
+        start = self._records + index * self._record_size
+        return self._map[start:start + self.key_width]
+
+    def get(self, license_id):
+        """Return the snapshot dict for ``license_id``, or None if it was not in the build."""
+        if license_id not in self.bloom:
+            return None
+        key = license_id.encode().ljust(self.key_width, b"\0")
+        if len(key) > self.key_width:
+            return None
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count or self._key(low) != key:
+            return None
+
+        issue, expiry = DATES.unpack_from(self._map, self._records + low * self._record_size + self.key_width)
+        return {
+            'licenseId': license_id,
+            'issue_date': date.fromordinal(issue),
+            'expiry_date': date.fromordinal(expiry),
+        }
+
+
+def build(path=None, error_rate=0.001, chunk_size=10000):
+    """Write a snapshot of every license to ``path`` and return the record count."""
+    path = Path(path or settings.LICENSE_SNAPSHOT_PATH)
+    key_width = License._meta.get_field('licenseId').max_length
+    # Taken before reading, so that a license changed during the build still
+    # has its dirty mark for as long as the snapshot is trusted.
+    built_at = time.time()
+    rows = License.objects.values_list('licenseId', 'issue_date', 'expiry_date').iterator(chunk_size=chunk_size)
+    records = sorted(
+        (license_id.encode().ljust(key_width, b"\0"), issue.toordinal(), expiry.toordinal())
+        for license_id, issue, expiry in rows
+    )
+
+    bloom = BloomFilter(len(records), error_rate)
+    for key, _, _ in records:
+        bloom.add(key.rstrip(b"\0").decode())
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(records), key_width, bloom.size, bloom.hashes,
+                                   built_at))
+            file.write(bloom.bits)
+            for key, issue, expiry in records:
+                file.write(key)
+                file.write(DATES.pack(issue, expiry))
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return len(records)
+
+
+def get_snapshot():
+    """
+    Return the current :class:`LicenseSnapshot`, or None if none is configured or built.
+
+    The file is re-checked at most every ``LICENSE_SNAPSHOT_CHECK_INTERVAL``
+    seconds and remapped when it has been replaced.
+    """
+    global _current, _checked_at
+    path = settings.LICENSE_SNAPSHOT_PATH
+    if not path:
+        return None
+    now = time.monotonic()
+    if now - _checked_at < settings.LICENSE_SNAPSHOT_CHECK_INTERVAL:
+        return _current
+
+    with _lock:
+        if now - _checked_at < settings.LICENSE_SNAPSHOT_CHECK_INTERVAL:
+            return _current
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            _current = None
+        else:
+            if _current is None or (_current.stat.st_ino, _current.stat.st_mtime_ns) != (
+                stat.st_ino, stat.st_mtime_ns
+            ):
+                _current = LicenseSnapshot(path)
+        _checked_at = now
+    return _current
+
+
+def reset():
+    """Forget the mapped snapshot so the next lookup re-reads the file."""
+    global _current, _checked_at
+    with _lock:
+        _current = None
+        _checked_at = 0.0
@@ -0,0 +1,54 @@
+"""Test fixtures for license app."""
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from license.cache import get_cache, get_dirty_cache
+from license.models import License
+from nationalId.models import NationalId
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_license_cache():
+    """Start every test with empty license caches."""
+    get_cache().clear()
+    get_dirty_cache().clear()
+    yield
+    get_cache().clear()
+    get_dirty_cache().clear()
+
+
+@pytest.fixture
+def user():
+    """Return a user."""
+    return User.objects.create_user(email="test@example.com", password="testpassword")
+
+
+@pytest.fixture
+def api_client(user):
+    """Return an API client authenticated as ``user``."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def national_id():
+    """Return a national id."""
+    return NationalId.objects.create(idNo=12345678, firstName="Jane", lastName="Doe", DOB=date(1990, 1, 1))
+
+
+@pytest.fixture
+def license(national_id):
+    """Return a license that expires in a year."""
+    return License.objects.create(
+        IdNo=national_id,
+        licenseId="DL-0001",
+        issue_date=date.today() - timedelta(days=365),
+        expiry_date=date.today() + timedelta(days=365),
+        passport_photo="passport_photos/jane.jpg",
+    )
@@ -0,0 +1,83 @@
+"""Async license views tests."""
+import pytest
+from django.conf import settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def auth_headers(user):
+    """Return request headers carrying an access token for ``user``."""
+    return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+
+def test_license_detail(client, auth_headers, license):
+    """Test a known license is returned in the same shape as the sync view."""
+    response = client.get(reverse("license_detail_async", args=[license.licenseId]), **auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "licenseId": license.licenseId,
+        "issue_date": license.issue_date.isoformat(),
+        "expiry_date": license.expiry_date.isoformat(),
+        "status": "valid",
+    }
+
+
+def test_license_detail_not_found(client, auth_headers):
+    """Test an unknown license returns 404."""
+    response = client.get(reverse("license_detail_async", args=["FAKE-1"]), **auth_headers)
+    assert response.status_code == 404
+    assert response.json() == {"error": "License does not exist"}
+
+
+def test_license_detail_served_from_cache(client, auth_headers, license, django_assert_num_queries):
+    """Test a repeated lookup is answered without queries."""
+    url = reverse("license_detail_async", args=[license.licenseId])
+    client.get(url, **auth_headers)
+    with django_assert_num_queries(0):
+        response = client.get(url, **auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("headers", [{}, {"HTTP_AUTHORIZATION": "Bearer not-a-token"}])
+def test_license_detail_requires_authentication(client, license, headers):
+    """Test requests without a valid access token are rejected."""
+    response = client.get(reverse("license_detail_async", args=[license.licenseId]), **headers)
+    assert response.status_code == 401
+    assert "WWW-Authenticate" in response
+
+
+def test_license_detail_rejects_other_methods(client, auth_headers, license):
+    """Test only GET is allowed."""
+    response = client.post(reverse("license_detail_async", args=[license.licenseId]), **auth_headers)
+    assert response.status_code == 405
+
+
+def test_bulk_verify(client, auth_headers, license):
+    """Test a batch returns one result per distinct id in request order."""
+    response = client.post(
+        reverse("license_bulk_verify_async"),
+        {"license_ids": ["FAKE-1", license.licenseId, "FAKE-1"]},
+        content_type="application/json",
+        **auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 2
+    assert data["results"][0] == {"licenseId": "FAKE-1", "status": "not found"}
+    assert data["results"][1]["status"] == "valid"
+
+
+@pytest.mark.parametrize("body", [
+    "not json",
+    '{"license_ids": []}',
+    '{"license_ids": [%s]}' % ", ".join(f'"DL-{i}"' for i in range(settings.LICENSE_BULK_MAX_IDS + 1)),
+], ids=["malformed", "empty", "oversized"])
+def test_bulk_verify_rejects_invalid_batch(client, auth_headers, body):
+    """Test malformed, empty and oversized batches are rejected."""
+    response = client.post(
+        reverse("license_bulk_verify_async"), body, content_type="application/json", **auth_headers
+    )
+    assert response.status_code == 400
@@ -0,0 +1,91 @@
+"""License cache unit tests."""
+from datetime import date, timedelta
+
+import pytest
+
+from license.cache import (MISSING, get_cache, get_license_snapshot,
+                           get_license_snapshots, license_status, make_key)
+
+pytestmark = pytest.mark.django_db
+
+
+def test_snapshot_is_cached(license, django_assert_num_queries):
+    """Test a second lookup is served without a query."""
+    with django_assert_num_queries(1):
+        get_license_snapshot(license.licenseId)
+    with django_assert_num_queries(0):
+        snapshot = get_license_snapshot(license.licenseId)
+    assert snapshot["expiry_date"] == license.expiry_date
+
+
+def test_unknown_id_is_negatively_cached(django_assert_num_queries):
+    """Test unknown ids only reach the database once."""
+    with django_assert_num_queries(1):
+        assert get_license_snapshot("FAKE-1") is None
+    with django_assert_num_queries(0):
+        assert get_license_snapshot("FAKE-1") is None
+    assert get_cache().get(make_key("FAKE-1")) == MISSING
+
+
+def test_overlong_id_skips_database(django_assert_num_queries):
+    """Test ids longer than the column are rejected without a query."""
+    with django_assert_num_queries(0):
+        assert get_license_snapshot("X" * 64) is None
+
+
+def test_save_invalidates_entry(license):
+    """Test saving a license drops its cached entry."""
+    get_license_snapshot(license.licenseId)
+    license.expiry_date = date.today() - timedelta(days=1)
+    license.save()
+    assert get_license_snapshot(license.licenseId)["expiry_date"] == license.expiry_date
+
+
+def test_rename_invalidates_previous_entry(license):
+    """Test renaming a license drops the entry cached under its previous id."""
+    get_license_snapshot("DL-0001")
+    license.licenseId = "DL-0002"
+    license.save()
+    assert get_license_snapshot("DL-0001") is None
+    assert get_license_snapshot("DL-0002") is not None
+
+
+def test_create_invalidates_negative_entry(license):
+    """Test creating a license replaces a cached miss."""
+    assert get_license_snapshot("DL-0002") is None
+    license.pk = None
+    license.licenseId = "DL-0002"
+    license.save()
+    assert get_license_snapshot("DL-0002") is not None
+
+
+def test_delete_invalidates_entry(license):
+    """Test deleting a license drops its cached entry."""
+    get_license_snapshot(license.licenseId)
+    license.delete()
+    assert get_license_snapshot("DL-0001") is None
+
+
+def test_status_is_computed_at_read_time(license):
+    """Test the cached snapshot is evaluated against the given day."""
+    snapshot = get_license_snapshot(license.licenseId)
+    assert license_status(snapshot)["status"] == "valid"
+    tomorrow = license.expiry_date + timedelta(days=1)
+    assert license_status(snapshot, today=tomorrow)["status"] == "expired"
+
+
+def test_bulk_snapshots_use_one_query(license, django_assert_num_queries):
+    """Test cache misses in a batch are resolved with a single query."""
+    with django_assert_num_queries(1):
+        snapshots = get_license_snapshots([license.licenseId, "FAKE-1", "FAKE-2"])
+    assert snapshots[license.licenseId]["licenseId"] == license.licenseId
+    assert snapshots["FAKE-1"] is None
+    with django_assert_num_queries(0):
+        get_license_snapshots([license.licenseId, "FAKE-1", "FAKE-2"])
+
+
+def test_bulk_snapshots_share_single_lookup_cache(license, django_assert_num_queries):
+    """Test entries cached by the single lookup are reused by the batch."""
+    get_license_snapshot(license.licenseId)
+    with django_assert_num_queries(0):
+        assert get_license_snapshots([license.licenseId])[license.licenseId] is not None
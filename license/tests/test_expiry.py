@@ -0,0 +1,115 @@
+"""License expiry sweep tests."""
+import io
+from datetime import date, timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+from application.models import DriversLicenseApplication
+from jobs import queue
+from jobs.models import Job
+from license import expiry
+from license.models import License
+
+pytestmark = pytest.mark.django_db
+
+TODAY = date(2026, 3, 2)
+
+
+@pytest.fixture
+def make_license(national_id):
+    """Return a factory creating licenses of ``national_id`` expiring ``days`` after TODAY."""
+    def _make_license(number, days):
+        return License.objects.create(
+            IdNo=national_id,
+            licenseId=f"DL-{number:04d}",
+            issue_date=TODAY - timedelta(days=365),
+            expiry_date=TODAY + timedelta(days=days),
+            passport_photo="passport_photos/jane.jpg",
+        )
+    return _make_license
+
+
+def _reminders():
+    """Return the queued reminder payloads as ``(license_id, expiry_date)``."""
+    return sorted((job.payload["license_id"], job.payload["expiry_date"]) for job in Job.objects.all())
+
+
+def test_walk_reads_the_window_in_keyset_chunks(make_license, django_assert_num_queries):
+    """Test the walk returns each license in the window once, in expiry order, one query per chunk."""
+    for number, days in enumerate([3, -1, 0, 3, 1, 30, 2]):
+        make_license(number, days)
+
+    # The short second chunk ends the walk without a third query.
+    with django_assert_num_queries(2):
+        chunks = list(expiry.walk(TODAY, TODAY + timedelta(days=30), chunk_size=3))
+
+    assert [[row[1] for row in chunk] for chunk in chunks] == [
+        ["DL-0002", "DL-0004", "DL-0006"],
+        ["DL-0000", "DL-0003"],
+    ]
+
+
+def test_sweep_queues_one_reminder_per_expiry(make_license):
+    """Test reminders are queued once per expiry date and again after a renewal."""
+    make_license(1, 0)
+    renewed = make_license(2, 10)
+    make_license(3, 45)
+
+    counts, reminded = expiry.sweep(today=TODAY, days=30, chunk_size=1)
+
+    assert reminded == 2
+    assert len(counts) == 30
+    assert counts[TODAY] == counts[TODAY + timedelta(days=10)] == 1
+    assert sum(counts.values()) == 2
+    assert _reminders() == [("DL-0001", "2026-03-02"), ("DL-0002", "2026-03-12")]
+
+    renewed.expiry_date = TODAY + timedelta(days=20)
+    renewed.save()
+    counts, reminded = expiry.sweep(today=TODAY, days=30)
+
+    assert (sum(counts.values()), reminded) == (2, 1)
+    assert _reminders()[-1] == ("DL-0002", "2026-03-22")
+
+
+def test_renewal_reminder_is_emailed_to_the_holder(make_license, national_id):
+    """Test the reminder goes to the holder's latest application email."""
+    DriversLicenseApplication.objects.create(
+        nationalId=national_id, certificate_number=1001, application_type="New", local_government_area="Ikeja",
+        state="Lagos", center_locations="Ikeja Center", email="jane@example.com", phoneNumber="+2348000000000",
+    )
+    make_license(1, 5)
+    expiry.sweep(today=TODAY)
+
+    for job in queue.claim(["notifications"], 10, "test"):
+        queue.run(job)
+
+    assert [message.to for message in mail.outbox] == [["jane@example.com"]]
+    assert "DL-0001 expires on 2026-03-07" in mail.outbox[0].subject
+
+
+def test_renewal_reminder_skips_renewed_licenses(make_license):
+    """Test a reminder queued before the license was renewed is dropped."""
+    make_license(1, 5)
+
+    expiry.send_renewal_reminder(license_id="DL-0001", expiry_date="2026-01-01")
+
+    assert mail.outbox == []
+
+
+def test_sweep_command_writes_daily_counts(make_license, tmp_path):
+    """Test the command writes one CSV row per day of the window."""
+    make_license(1, 0)
+    make_license(2, 0)
+    output = tmp_path / "expiring.csv"
+    License.objects.update(expiry_date=date.today())
+
+    call_command("sweep_expiring_licenses", "--days", "2", "--output", str(output), stderr=io.StringIO())
+
+    assert output.read_text().splitlines() == [
+        "expiry_date,count",
+        f"{date.today().isoformat()},2",
+        f"{(date.today() + timedelta(days=1)).isoformat()},0",
+    ]
+    assert Job.objects.count() == 2
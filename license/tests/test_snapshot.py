@@ -0,0 +1,151 @@
+"""License snapshot tests."""
+import os
+import time
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from license import snapshot
+from license.cache import (get_cache, get_dirty_cache, get_license_snapshot,
+                           get_license_snapshots)
+from license.models import License
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def snapshot_path(settings, tmp_path):
+    """Point LICENSE_SNAPSHOT_PATH at a temporary file, checked on every lookup, with shared dirty marks."""
+    settings.CACHES = {
+        **settings.CACHES,
+        "license-dirty": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "dirty"),
+        },
+    }
+    settings.LICENSE_SNAPSHOT_PATH = tmp_path / "licenses.bin"
+    settings.LICENSE_SNAPSHOT_CHECK_INTERVAL = 0
+    snapshot.reset()
+    yield settings.LICENSE_SNAPSHOT_PATH
+    snapshot.reset()
+
+
+@pytest.fixture
+def built(snapshot_path, license):
+    """Build a snapshot holding ``license``, then forget the dirty mark its creation left."""
+    call_command("build_license_snapshot")
+    get_cache().clear()
+    get_dirty_cache().clear()
+    return snapshot.get_snapshot()
+
+
+def _age(path, seconds):
+    """Rewrite the build time of the snapshot at ``path`` to ``seconds`` ago."""
+    data = bytearray(path.read_bytes())
+    fields = list(snapshot.HEADER.unpack_from(data))
+    fields[-1] = time.time() - seconds
+    snapshot.HEADER.pack_into(data, 0, *fields)
+    path.write_bytes(bytes(data))
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1))
+
+
+def test_lookup(built, license):
+    """Test a built license is found with its dates and unknown ids are not."""
+    assert built.get(license.licenseId) == {
+        "licenseId": license.licenseId,
+        "issue_date": license.issue_date,
+        "expiry_date": license.expiry_date,
+    }
+    assert built.get("DL-0000") is None
+    assert built.get("DL-0002") is None
+
+
+def test_many_records_sorted(snapshot_path, national_id):
+    """Test binary search finds every record of a larger build."""
+    License.objects.bulk_create([
+        License(IdNo=national_id, licenseId=f"X{i:05}", expiry_date=date.today(), passport_photo="p.jpg")
+        for i in range(500, 0, -1)
+    ])
+    snapshot.build()
+    mapped = snapshot.get_snapshot()
+    assert mapped.count == 500
+    assert all(mapped.get(f"X{i:05}") for i in range(1, 501))
+    assert mapped.get("X00000") is None and mapped.get("X00501") is None
+
+
+def test_cache_miss_served_from_snapshot(built, license, django_assert_num_queries):
+    """Test clean misses, known or unknown, are answered without a query."""
+    with django_assert_num_queries(0):
+        assert get_license_snapshot(license.licenseId)["expiry_date"] == license.expiry_date
+        assert get_license_snapshot("FAKE-1") is None
+        assert get_license_snapshots([license.licenseId, "FAKE-2"])["FAKE-2"] is None
+
+
+def test_changed_license_bypasses_snapshot(built, license):
+    """Test a license saved after the build is read from the database."""
+    license.expiry_date = date.today() - timedelta(days=1)
+    license.save()
+    assert get_license_snapshot(license.licenseId)["expiry_date"] == license.expiry_date
+
+
+def test_rebuilt_file_is_remapped(built, license):
+    """Test workers switch to a rebuilt snapshot."""
+    license.pk = None
+    license.licenseId = "DL-0002"
+    license.save()
+    snapshot.build()
+    assert snapshot.get_snapshot().get("DL-0002") is not None
+
+
+def test_build_time_taken_before_reading(snapshot_path, license):
+    """Test the recorded build time precedes the read of the licenses."""
+    read_at = []
+
+    def record(execute, sql, params, many, context):
+        read_at.append(time.time())
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        snapshot.build()
+
+    assert snapshot.get_snapshot().built_at <= min(read_at)
+
+
+def test_snapshot_ignored_without_shared_dirty_marks(
+    settings, tmp_path, license, django_assert_num_queries, caplog,
+):
+    """Test a snapshot is not used when other workers' dirty marks would be invisible, and that is logged once."""
+    settings.LICENSE_SNAPSHOT_PATH = tmp_path / "licenses.bin"
+    settings.LICENSE_SNAPSHOT_CHECK_INTERVAL = 0
+    snapshot.reset()
+    snapshot.build()
+    License.objects.filter(pk=license.pk).update(licenseId="DL-0002")
+
+    with django_assert_num_queries(1):
+        assert get_license_snapshot("DL-0002") is not None
+    get_cache().clear()
+    assert get_license_snapshot("DL-0002") is not None
+    assert [record.message for record in caplog.records] == [
+        "License snapshot ignored: license-dirty is not a shared cache."
+    ]
+    snapshot.reset()
+
+
+def test_stale_snapshot_misses_go_to_the_database(built, snapshot_path, license, settings):
+    """Test ids missing from a snapshot older than LICENSE_SNAPSHOT_MAX_AGE are looked up."""
+    License.objects.filter(pk=license.pk).update(licenseId="DL-0002")
+    assert get_license_snapshot("DL-0002") is None
+
+    get_cache().clear()
+    _age(snapshot_path, settings.LICENSE_SNAPSHOT_MAX_AGE + 1)
+    assert get_license_snapshot("DL-0002") is not None
+
+
+def test_snapshot_older_than_dirty_marks_ignored(built, snapshot_path, license, settings):
+    """Test a snapshot built before the oldest possible dirty mark is not used."""
+    License.objects.filter(pk=license.pk).update(expiry_date=date.today() - timedelta(days=1))
+    _age(snapshot_path, settings.LICENSE_SNAPSHOT_DIRTY_TIMEOUT + 1)
+
+    assert get_license_snapshot(license.licenseId)["expiry_date"] == date.today() - timedelta(days=1)
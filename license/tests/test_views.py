@@ -0,0 +1,57 @@
+"""License views tests."""
+import pytest
+from django.conf import settings
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+def test_license_detail(api_client, license):
+    """Test a known license is returned with its status."""
+    response = api_client.get(reverse("license_detail", args=[license.licenseId]))
+    assert response.status_code == 200
+    assert response.data["licenseId"] == license.licenseId
+    assert response.data["status"] == "valid"
+
+
+def test_license_detail_not_found(api_client):
+    """Test an unknown license returns 404."""
+    response = api_client.get(reverse("license_detail", args=["FAKE-1"]))
+    assert response.status_code == 404
+    assert response.data == {"error": "License does not exist"}
+
+
+def test_license_detail_requires_authentication(client, license):
+    """Test anonymous requests are rejected."""
+    response = client.get(reverse("license_detail", args=[license.licenseId]))
+    assert response.status_code in (401, 403)
+
+
+def test_bulk_verify(api_client, license):
+    """Test a batch returns one result per distinct id in request order."""
+    response = api_client.post(
+        reverse("license_bulk_verify"),
+        {"license_ids": ["FAKE-1", license.licenseId, "FAKE-1"]},
+        format="json",
+    )
+    assert response.status_code == 200
+    assert response.data["count"] == 2
+    assert response.data["results"][0] == {"licenseId": "FAKE-1", "status": "not found"}
+    assert response.data["results"][1]["status"] == "valid"
+    assert "elapsed_ms" in response.data
+
+
+def test_bulk_verify_rejects_oversized_batch(api_client):
+    """Test batches above the cap are rejected."""
+    response = api_client.post(
+        reverse("license_bulk_verify"),
+        {"license_ids": [f"DL-{i}" for i in range(settings.LICENSE_BULK_MAX_IDS + 1)]},
+        format="json",
+    )
+    assert response.status_code == 400
+
+
+def test_bulk_verify_rejects_empty_batch(api_client):
+    """Test an empty batch is rejected."""
+    response = api_client.post(reverse("license_bulk_verify"), {"license_ids": []}, format="json")
+    assert response.status_code == 400
@@ -1,8 +1,12 @@
 # portal/urls.py
 from django.urls import path
-from .views import LicenseDetailView
+from . import async_views
+from .views import LicenseDetailView, BulkLicenseVerificationView
 
 urlpatterns = [
+        path('licenses/async/bulk/verify/', async_views.license_bulk_verify, name='license_bulk_verify_async'),
+        path('licenses/async/<str:license_id>/', async_views.license_detail, name='license_detail_async'),
+        path('licenses/bulk/verify/', BulkLicenseVerificationView.as_view(), name='license_bulk_verify'),
         path('licenses/<str:license_id>/', LicenseDetailView.as_view(), name='license_detail'),
 
 
@@ -1,10 +1,12 @@
 # views.py
+import time
+from datetime import date
+
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from .models import License
-from .serializers import LicenseSerializer
-from django.shortcuts import get_object_or_404
-from datetime import date
+from .serializers import LicenseSerializer, BulkLicenseVerificationSerializer
+from .cache import get_license_snapshot, get_license_snapshots, license_status
 
 class LicenseDetailView(generics.RetrieveAPIView):
     """
@@ -16,16 +18,19 @@ class LicenseDetailView(generics.RetrieveAPIView):
 
     def get_object(self):
         """
-        Retrieve the License object based on the license_id.
+        Retrieve the cached license snapshot based on the license_id.
+
+        Returns None when the license does not exist.
         """
-        license_id = self.kwargs.get('license_id')  
-        return get_object_or_404(License, licenseId=license_id)
+        license_id = self.kwargs.get('license_id')
+        return get_license_snapshot(license_id)
 
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve details of a specific license.
 
         This endpoint returns the license details along with its current status (valid or expired).
+        Lookups are served from the license cache; the status is always computed against today's date.
 
         Parameters:
         - license_id (path): The unique identifier of the license
@@ -43,18 +48,63 @@ class LicenseDetailView(generics.RetrieveAPIView):
                 'error': 'License does not exist'
             }
         """
-        try:
-            instance = self.get_object()
-        except License.DoesNotExist:
+        snapshot = self.get_object()
+        if snapshot is None:
             return Response({'error': 'License does not exist'}, status=status.HTTP_404_NOT_FOUND)
 
+        return Response(license_status(snapshot), status=status.HTTP_200_OK)
+
+
+class BulkLicenseVerificationView(generics.GenericAPIView):
+    """
+    API endpoint that verifies a batch of licenses in one call.
+    """
+    serializer_class = BulkLicenseVerificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Verify several licenses at once.
+
+        Ids are looked up through the same cache as the single license endpoint;
+        whatever is not cached is resolved with a single query.
+
+        Parameters:
+        - license_ids (list of strings): The license ids to verify (at most LICENSE_BULK_MAX_IDS)
+
+        Returns:
+        - 200 OK: One result per distinct id, in request order
+            {
+                'count': integer,
+                'elapsed_ms': float,
+                'results': [
+                    {
+                        'licenseId': 'string',
+                        'issue_date': 'date',
+                        'expiry_date': 'date',
+                        'status': 'valid' | 'expired'
+                    },
+                    {
+                        'licenseId': 'string',
+                        'status': 'not found'
+                    }
+                ]
+            }
+        - 400 Bad Request: Missing, empty or oversized list of ids
+        """
+        started = time.perf_counter()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        snapshots = get_license_snapshots(serializer.validated_data['license_ids'])
         today = date.today()
-        status_text = 'expired' if instance.expiry_date < today else 'valid'
-
-        response_data = {
-            'licenseId': instance.licenseId,
-            'issue_date': instance.issue_date,
-            'expiry_date': instance.expiry_date,
-            'status': status_text,
-        }
-        return Response(response_data, status=status.HTTP_200_OK)
+        results = [
+            license_status(snapshot, today) if snapshot else {'licenseId': license_id, 'status': 'not found'}
+            for license_id, snapshot in snapshots.items()
+        ]
+
+        return Response({
+            'count': len(results),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+            'results': results,
+        }, status=status.HTTP_200_OK)
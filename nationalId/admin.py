@@ -1,7 +1,39 @@
+from django.conf import settings
 from django.contrib import admin
+from django.utils.dateparse import parse_date
+from config.pagination import EstimatedCountPaginator
 from .models import NationalId
+from . import search
+
+
+def _parse_date(word):
+    """Return ``word`` as a date if it is one (YYYY-MM-DD), else None."""
+    try:
+        return parse_date(word)
+    except ValueError:
+        return None
+
 
 @admin.register(NationalId)
 class NationalIdAdmin(admin.ModelAdmin):
     list_display = ('idNo', 'firstName', 'middleName', 'lastName', 'DOB', 'Sex', 'Passport', 'issuedAt')
+    # Searched through the name index (see get_search_results), not icontains.
     search_fields = ('idNo', 'firstName', 'middleName', 'lastName')
+    search_help_text = 'Name words (prefixes and misspellings match) or an ID number; add YYYY-MM-DD to filter by DOB.'
+    date_hierarchy = 'DOB'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """Narrow ``queryset`` to the best NATIONAL_ID_SEARCH_MAX_RESULTS index matches of ``search_term``."""
+        words, dob = [], None
+        for word in search_term.split():
+            day = _parse_date(word)
+            if day:
+                dob = day
+            else:
+                words.append(word)
+        if not words and dob is None:
+            return queryset, False
+        hits = search.search_ids(' '.join(words), dob=dob, limit=settings.NATIONAL_ID_SEARCH_MAX_RESULTS)
+        return queryset.filter(pk__in=[pk for pk, _ in hits]), False
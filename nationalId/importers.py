@@ -0,0 +1,220 @@
+"""Bulk import of national registry records.
+
+Records are streamed from a CSV or NDJSON file line by line, validated, and
+upserted on ``idNo`` in batches. Each batch is committed on its own and the
+byte offset just past it is reported, so an interrupted import can be resumed
+from that offset.
+
+On PostgreSQL a batch is ``COPY``-ed into a temporary staging table and merged
+with ``INSERT ... ON CONFLICT``; other backends use ``bulk_create`` with
+``update_conflicts``.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ID_NO_MAX, NationalId
+
+IMPORT_FIELDS = ["idNo", "firstName", "middleName", "lastName", "DOB", "Sex"]
+
+# Fields overwritten when an idNo already exists; issuedAt keeps its original value.
+UPDATE_FIELDS = ["firstName", "middleName", "lastName", "DOB", "Sex"]
+
+
+@dataclass
+class Rejection:
+    """A line that could not be imported."""
+
+    offset: int
+    reason: str
+    line: str
+
+
+@dataclass
+class Batch:
+    """Validated records ready to be written, and the offset just past them."""
+
+    records: dict = field(default_factory=dict)
+    rejections: list = field(default_factory=list)
+    end_offset: int = 0
+    lines: int = 0
+
+
+def _max_length(name):
+    """Return the ``max_length`` of a ``NationalId`` field."""
+    return NationalId._meta.get_field(name).max_length
+
+
+def validate_record(raw):
+    """
+    Return the cleaned version of ``raw`` or raise ``ValueError``.
+
+    ``raw`` maps field names to strings (CSV) or JSON values (NDJSON).
+    """
+    def text(name, required=False):
+        value = raw.get(name)
+        value = "" if value is None else str(value).strip()
+        if not value:
+            if required:
+                raise ValueError(f"{name} is required")
+            return None
+        if len(value) > _max_length(name):
+            raise ValueError(f"{name} is longer than {_max_length(name)} characters")
+        return value
+
+    try:
+        id_no = int(str(raw.get("idNo", "")).strip())
+    except ValueError:
+        raise ValueError("idNo must be an integer")
+    if id_no <= 0:
+        raise ValueError("idNo must be positive")
+    if id_no > ID_NO_MAX:
+        raise ValueError(f"idNo must be at most {ID_NO_MAX}")
+
+    try:
+        dob = date.fromisoformat(str(raw.get("DOB", "")).strip())
+    except ValueError:
+        raise ValueError("DOB must be an ISO date (YYYY-MM-DD)")
+
+    return {
+        "idNo": id_no,
+        "firstName": text("firstName", required=True),
+        "middleName": text("middleName"),
+        "lastName": text("lastName"),
+        "DOB": dob,
+        "Sex": text("Sex"),
+    }
+
+
+def iter_lines(stream, offset=0):
+    """Yield ``(start_offset, end_offset, text)`` for each line from ``offset``."""
+    stream.seek(offset)
+    position = offset
+    for raw in stream:
+        start, position = position, position + len(raw)
+        text = raw.decode("utf-8").rstrip("\r\n")
+        if text.strip():
+            yield start, position, text
+
+
+def iter_records(stream, import_format, offset=0):
+    """
+    Yield ``(start_offset, end_offset, line, record_or_error)`` from ``stream``.
+
+    ``stream`` must be opened in binary mode. For CSV the header is always read
+    from the start of the file, so ``offset`` may point anywhere after it.
+    """
+    header = None
+    if import_format == "csv":
+        stream.seek(0)
+        header_line = stream.readline()
+        header = next(csv.reader([header_line.decode("utf-8-sig")]))
+        offset = max(offset, len(header_line))
+
+    for start, end, line in iter_lines(stream, offset):
+        try:
+            if header is not None:
+                values = next(csv.reader([line]))
+                if len(values) != len(header):
+                    raise ValueError(f"expected {len(header)} columns, got {len(values)}")
+                raw = dict(zip(header, values))
+            else:
+                raw = json.loads(line)
+                if not isinstance(raw, dict):
+                    raise ValueError("expected a JSON object")
+            yield start, end, line, validate_record(raw)
+        except ValueError as error:
+            yield start, end, line, error
+
+
+def iter_batches(stream, import_format, offset=0, batch_size=5000):
+    """Group the records of ``stream`` into batches of ``batch_size`` lines."""
+    batch = Batch(end_offset=offset)
+    for start, end, line, result in iter_records(stream, import_format, offset):
+        batch.lines += 1
+        batch.end_offset = end
+        if isinstance(result, Exception):
+            batch.rejections.append(Rejection(start, str(result), line))
+        else:
+            # The last occurrence of an idNo within a batch wins.
+            batch.records[result["idNo"]] = result
+        if batch.lines >= batch_size:
+            yield batch
+            batch = Batch(end_offset=end)
+    if batch.lines:
+        yield batch
+
+
+class BulkCreateLoader:
+    """Upsert records with ``bulk_create(update_conflicts=True)``."""
+
+    name = "bulk_create"
+
+    def load(self, records):
+        """Write ``records`` and return how many were written."""
+        NationalId.objects.bulk_create(
+            [NationalId(**record) for record in records],
+            update_conflicts=True,
+            unique_fields=["idNo"],
+            update_fields=UPDATE_FIELDS,
+        )
+        return len(records)
+
+
+class PostgresCopyLoader:
+    """Upsert records by ``COPY``-ing them into a staging table and merging."""
+
+    name = "copy"
+
+    def load(self, records):
+        """Write ``records`` and return how many were written."""
+        table = connection.ops.quote_name(NationalId._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(name) for name in IMPORT_FIELDS)
+        issued_at = connection.ops.quote_name("issuedAt")
+        passport = connection.ops.quote_name("Passport")
+        updates = ", ".join(
+            f"{connection.ops.quote_name(name)} = EXCLUDED.{connection.ops.quote_name(name)}" for name in UPDATE_FIELDS
+        )
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            writer.writerow(["" if record[name] is None else record[name] for name in IMPORT_FIELDS])
+        buffer.seek(0)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE nationalid_import_staging "
+                f"ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            cursor.cursor.copy_expert(
+                f"COPY nationalid_import_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+            cursor.execute(
+                # New rows get an empty Passport, as bulk_create writes.
+                f"INSERT INTO {table} ({columns}, {issued_at}, {passport}) "
+                f"SELECT {columns}, %s, '' FROM nationalid_import_staging "
+                f"ON CONFLICT ({connection.ops.quote_name('idNo')}) DO UPDATE SET {updates}",
+                [timezone.now()],
+            )
+        return len(records)
+
+
+def get_loader():
+    """Return the fastest loader supported by the default database."""
+    if connection.vendor == "postgresql":
+        return PostgresCopyLoader()
+    return BulkCreateLoader()
+
+
+def write_batch(loader, batch):
+    """Write ``batch`` in its own transaction and return the rows written."""
+    if not batch.records:
+        return 0
+    with transaction.atomic():
+        return loader.load(list(batch.records.values()))
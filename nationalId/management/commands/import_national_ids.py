@@ -0,0 +1,71 @@
+"""Import national registry records from a CSV or NDJSON file."""
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nationalId.importers import get_loader, iter_batches, write_batch
+
+
+class Command(BaseCommand):
+    """Stream, validate and upsert ``NationalId`` records in batches."""
+
+    help = (
+        "Import national registry records from a CSV (with header) or NDJSON file, "
+        "upserting on idNo. Re-run with --offset to resume an interrupted import."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("path", help="CSV or NDJSON file to import.")
+        parser.add_argument("--format", dest="import_format", choices=["csv", "ndjson"],
+                            help="Input format (default: from the file extension).")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Lines per committed batch.")
+        parser.add_argument("--offset", type=int, default=0, help="Byte offset to resume from.")
+        parser.add_argument("--rejects", help="Write rejected lines to this NDJSON file.")
+
+    def handle(self, *args, **options):
+        """Run the import and report progress after every batch."""
+        path = options["path"]
+        import_format = options["import_format"] or ("csv" if path.lower().endswith(".csv") else "ndjson")
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be positive")
+
+        loader = get_loader()
+        rejects = open(options["rejects"], "a") if options["rejects"] else None
+        written = rejected = 0
+        offset = options["offset"]
+        started = time.perf_counter()
+        self.stdout.write(f"Importing {path} from offset {offset} using {loader.name}")
+
+        try:
+            with open(path, "rb") as stream:
+                for batch in iter_batches(stream, import_format, offset, options["batch_size"]):
+                    written += write_batch(loader, batch)
+                    rejected += len(batch.rejections)
+                    offset = batch.end_offset
+                    for rejection in batch.rejections:
+                        self._report_rejection(rejection, rejects)
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"{written} rows written, {rejected} rejected, "
+                        f"{written / elapsed if elapsed else 0:.0f} rows/sec, resume offset {offset}"
+                    )
+        finally:
+            if rejects:
+                rejects.close()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {written} rows ({rejected} rejected) in {elapsed:.1f}s, "
+            f"{written / elapsed if elapsed else 0:.0f} rows/sec, final offset {offset}"
+        ))
+
+    def _report_rejection(self, rejection, rejects):
+        """Record a rejected line in the rejects file, or on stderr."""
+        if rejects:
+            rejects.write(json.dumps(
+                {"offset": rejection.offset, "reason": rejection.reason, "line": rejection.line}
+            ) + "\n")
+        else:
+            self.stderr.write(f"Rejected line at offset {rejection.offset}: {rejection.reason}")
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:19
+
+from django.db import migrations
+import uploads.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nationalId', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='nationalid',
+            name='Passport',
+            field=uploads.fields.ImageField(blank=True, null=True, upload_to='passports/'),
+        ),
+    ]
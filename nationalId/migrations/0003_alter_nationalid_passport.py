@@ -0,0 +1,20 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:27
+
+from django.db import migrations
+import uploads.fields
+import uploads.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nationalId', '0002_alter_nationalid_passport'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='nationalid',
+            name='Passport',
+            field=uploads.fields.ImageField(blank=True, null=True, storage=uploads.storage.get_blob_storage, upload_to='passports/'),
+        ),
+    ]
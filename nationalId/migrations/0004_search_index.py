@@ -0,0 +1,33 @@
+# Generated by Django 4.2.8 on 2026-10-18 07:46
+
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    from nationalId.search import create_index
+
+    create_index(schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    from nationalId.search import drop_index
+
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    # The PostgreSQL trigram index is built CONCURRENTLY, outside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('nationalId', '0003_alter_nationalid_passport'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='nationalid',
+            index=models.Index(fields=['DOB'], name='nationalid_dob_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,4 +1,11 @@
 from django.db import models
+from django.db.backends.base.operations import BaseDatabaseOperations
+from uploads.fields import ImageField
+from uploads.storage import get_blob_storage
+
+# Largest idNo the column holds on every database (a 32-bit integer).
+ID_NO_MAX = BaseDatabaseOperations.integer_field_ranges['IntegerField'][1]
+
 
 class NationalId(models.Model):
     idNo = models.IntegerField(primary_key=True, null=False)
@@ -7,8 +14,15 @@ class NationalId(models.Model):
     lastName = models.CharField(max_length=255, null=True, blank=True)
     DOB = models.DateField(null=False)
     Sex = models.CharField(max_length=10, null=True, blank=True)
-    Passport = models.ImageField(upload_to='passports/', null=True, blank=True)
+    Passport = ImageField(upload_to='passports/', storage=get_blob_storage, null=True, blank=True)
     issuedAt = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Names are searched through the index created in migration
+        # 0004_search_index (see nationalId.search).
+        indexes = [
+            models.Index(fields=['DOB'], name='nationalid_dob_idx'),
+        ]
+
     def __str__(self):
         return f"{self.firstName} {self.lastName or ''}"
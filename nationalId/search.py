@@ -0,0 +1,225 @@
+"""
+Indexed name search over national ID records.
+
+Names are matched against ``first middle last`` in lower case, word by word:
+
+- On PostgreSQL, a trigram GIN index on that expression (``pg_trgm``) answers
+  substring matches and word similarity (``<%``), so prefixes and misspelt
+  names are found without scanning the table. Results are ranked by word
+  similarity.
+- On SQLite, an FTS5 table with the ``trigram`` tokenizer, kept in sync by
+  triggers, does the same: every query word must share a trigram with the
+  name, and results are ranked by ``bm25``.
+- Other databases fall back to ``icontains`` scans.
+
+Names that start with the query rank first, then names with a word starting
+with it. The index is created by migration ``0004_search_index``. A query made
+of digits only looks up that ``idNo`` (none when it is too large to be one).
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import ID_NO_MAX, NationalId
+
+FTS_TABLE = "nationalid_search"
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def name_sql(prefix=""):
+    """Return the SQL of the indexed name expression, with its columns qualified by ``prefix``."""
+    quote = connection.ops.quote_name
+    parts = [f"coalesce({prefix}{quote(name)}, '')" for name in ("firstName", "middleName", "lastName")]
+    separator = " || ' ' || "
+    return f"lower({separator.join(parts)})"
+
+
+def normalize(query):
+    """Return the lower-case words of ``query``."""
+    return _WORD.findall((query or "").lower())
+
+
+def trigrams(word):
+    """Return the distinct three-character substrings of ``word``, in order."""
+    return list(dict.fromkeys(word[i:i + 3] for i in range(len(word) - 2)))
+
+
+def _is_id_no(word):
+    """Return True if the digits ``word`` fit the ``idNo`` column; larger numbers can never match."""
+    return int(word) <= ID_NO_MAX
+
+
+def _prep_dob(dob):
+    """Return ``dob`` as a database parameter."""
+    return NationalId._meta.get_field("DOB").get_db_prep_value(dob, connection)
+
+
+def _ranking(text):
+    """Return the SQL ranking prefix matches first, and its parameters."""
+    return "(CASE WHEN name LIKE %s THEN 2 WHEN name LIKE %s THEN 1 ELSE 0 END)", [f"{text}%", f"% {text}%"]
+
+
+class PostgresSearch:
+    """Trigram search over the ``pg_trgm`` GIN index."""
+
+    name = "trigram"
+
+    def match(self, words, dob, limit, offset):
+        """Return ``(idNo, rank)`` of the best matches, best first."""
+        quote = connection.ops.quote_name
+        text = " ".join(words)
+        boost, boost_params = _ranking(text)
+        dob_sql, dob_params = (f"AND {quote('DOB')} = %s", [_prep_dob(dob)]) if dob else ("", [])
+        sql = (
+            f"SELECT id_no, {boost} + word_similarity(%s, name) AS score FROM ("
+            f"SELECT {quote('idNo')} AS id_no, {name_sql()} AS name FROM {quote(NationalId._meta.db_table)} "
+            f"WHERE ({name_sql()} LIKE %s OR %s <%% {name_sql()}) {dob_sql}"
+            f") AS matches ORDER BY score DESC, id_no LIMIT %s OFFSET %s"
+        )
+        params = [*boost_params, text, f"%{text}%", text, *dob_params, limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+class SqliteSearch:
+    """Trigram search over the FTS5 table."""
+
+    name = "fts5"
+
+    def match(self, words, dob, limit, offset):
+        """Return ``(idNo, rank)`` of the best matches, best first."""
+        quote = connection.ops.quote_name
+        text = " ".join(words)
+        boost, boost_params = _ranking(text)
+        conditions, params = [], []
+        # Words shorter than a trigram cannot be looked up in the index.
+        groups = [" OR ".join(f'"{trigram}"' for trigram in trigrams(word)) for word in words if len(word) >= 3]
+        if groups:
+            score = f"-bm25({FTS_TABLE})"
+            conditions.append(f"{FTS_TABLE} MATCH %s")
+            params.append(" AND ".join(f"({group})" for group in groups))
+        else:
+            score = "0"
+        for word in words:
+            if len(word) < 3:
+                conditions.append("name LIKE %s")
+                params.append(f"%{word}%")
+        join, join_params = "", []
+        if dob:
+            table = quote(NationalId._meta.db_table)
+            join = f"JOIN {table} ON {table}.{quote('idNo')} = {FTS_TABLE}.rowid AND {table}.{quote('DOB')} = %s"
+            join_params = [_prep_dob(dob)]
+        sql = (
+            f"SELECT {FTS_TABLE}.rowid, {boost} + {score} AS score FROM {FTS_TABLE} {join} "
+            f"WHERE {' AND '.join(conditions)} ORDER BY score DESC, {FTS_TABLE}.rowid LIMIT %s OFFSET %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*boost_params, *join_params, *params, limit, offset])
+            return cursor.fetchall()
+
+
+class ScanSearch:
+    """``icontains`` search for databases without a supported index."""
+
+    name = "scan"
+
+    def match(self, words, dob, limit, offset):
+        """Return ``(idNo, rank)`` of the matches, all ranked 0."""
+        queryset = NationalId.objects.order_by("idNo")
+        for word in words:
+            queryset = queryset.filter(
+                Q(firstName__icontains=word) | Q(middleName__icontains=word) | Q(lastName__icontains=word)
+            )
+        if dob:
+            queryset = queryset.filter(DOB=dob)
+        return [(pk, 0.0) for pk in queryset.values_list("idNo", flat=True)[offset:offset + limit]]
+
+
+def get_backend():
+    """Return the search backend for the default database."""
+    if connection.vendor == "postgresql":
+        return PostgresSearch()
+    if connection.vendor == "sqlite":
+        return SqliteSearch()
+    return ScanSearch()
+
+
+def search_ids(query, dob=None, limit=20, offset=0):
+    """Return ``(idNo, rank)`` of the records matching ``query`` (and born on ``dob``), best first."""
+    words = normalize(query)
+    if len(words) == 1 and words[0].isdecimal():
+        records = NationalId.objects.filter(idNo=int(words[0])) if _is_id_no(words[0]) else NationalId.objects.none()
+    elif not words:
+        records = NationalId.objects.all() if dob else NationalId.objects.none()
+    else:
+        return get_backend().match(words, dob, limit, offset)
+    if dob:
+        records = records.filter(DOB=dob)
+    return [(pk, 0.0) for pk in records.order_by("idNo").values_list("idNo", flat=True)[offset:offset + limit]]
+
+
+def search(query, dob=None, limit=20, offset=0):
+    """Return the records matching ``query``, best first, each with its ``rank``."""
+    hits = search_ids(query, dob, limit, offset)
+    records = NationalId.objects.in_bulk([pk for pk, _ in hits])
+    results = []
+    for pk, rank in hits:
+        if pk in records:
+            records[pk].rank = rank
+            results.append(records[pk])
+    return results
+
+
+_SQLITE_TRIGGERS = {
+    "insert": "AFTER INSERT ON {table} BEGIN {insert}; END",
+    "update": (
+        'AFTER UPDATE OF "idNo", "firstName", "middleName", "lastName" ON {table} '
+        "BEGIN {delete}; {insert}; END"
+    ),
+    "delete": "AFTER DELETE ON {table} BEGIN {delete}; END",
+}
+
+
+def create_index(schema_editor):
+    """
+    Create the search index for ``schema_editor``'s database.
+
+    On SQLite, migrations that rebuild the national ID table drop its
+    triggers; such a migration must call this again.
+    """
+    vendor = schema_editor.connection.vendor
+    quote = schema_editor.quote_name
+    table = quote(NationalId._meta.db_table)
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS nationalid_name_trgm_idx "
+            f"ON {table} USING gin (({name_sql()}) gin_trgm_ops)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(name, tokenize='trigram')")
+        schema_editor.execute(f"DELETE FROM {FTS_TABLE}")
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, name) SELECT {quote('idNo')}, {name_sql()} FROM {table}"
+        )
+        statements = {
+            "insert": f'INSERT INTO {FTS_TABLE} (rowid, name) VALUES (new."idNo", {name_sql("new.")})',
+            "delete": f'DELETE FROM {FTS_TABLE} WHERE rowid = old."idNo"',
+        }
+        for event, body in _SQLITE_TRIGGERS.items():
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{event}")
+            schema_editor.execute(f"CREATE TRIGGER {FTS_TABLE}_{event} {body.format(table=table, **statements)}")
+
+
+def drop_index(schema_editor):
+    """Drop the search index for ``schema_editor``'s database."""
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS nationalid_name_trgm_idx")
+    elif vendor == "sqlite":
+        for event in _SQLITE_TRIGGERS:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{event}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
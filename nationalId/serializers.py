@@ -0,0 +1,42 @@
+"""Serializers for the national ID search endpoint."""
+from django.conf import settings
+from rest_framework import serializers
+
+from config.middleware import TimedSerializerMixin
+
+from .models import NationalId
+
+
+class NationalIdSearchSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Query parameters of a national ID search."""
+
+    q = serializers.CharField(required=False, allow_blank=True, default='')
+    dob = serializers.DateField(required=False, default=None)
+    page = serializers.IntegerField(min_value=1, required=False, default=1)
+    page_size = serializers.IntegerField(
+        min_value=1, max_value=settings.NATIONAL_ID_SEARCH_MAX_PAGE_SIZE, required=False,
+        default=settings.NATIONAL_ID_SEARCH_PAGE_SIZE,
+    )
+
+    def validate(self, data):
+        """Require a term or a date of birth, and keep paging within NATIONAL_ID_SEARCH_MAX_RESULTS."""
+        if not data['q'].strip() and data['dob'] is None:
+            raise serializers.ValidationError("Provide a search term (q), a date of birth (dob) or both.")
+        if data['page'] * data['page_size'] > settings.NATIONAL_ID_SEARCH_MAX_RESULTS:
+            raise serializers.ValidationError(
+                f"Only the first {settings.NATIONAL_ID_SEARCH_MAX_RESULTS} results can be paged through; "
+                "narrow the search instead."
+            )
+        return data
+
+
+class NationalIdSearchResultSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """A matching national ID record with its search rank."""
+
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        """Serialize the identifying fields, not the passport photo."""
+
+        model = NationalId
+        fields = ['idNo', 'firstName', 'middleName', 'lastName', 'DOB', 'Sex', 'rank']
@@ -0,0 +1 @@
+"""National ID tests."""
@@ -0,0 +1,99 @@
+"""National ID import tests."""
+import io
+import json
+from datetime import date
+
+import pytest
+from django.core.management import call_command
+
+from nationalId.importers import (BulkCreateLoader, get_loader, iter_batches,
+                                  validate_record)
+from nationalId.models import NationalId
+
+pytestmark = pytest.mark.django_db
+
+CSV = (
+    "idNo,firstName,middleName,lastName,DOB,Sex\n"
+    "1,Jane,,Doe,1990-01-01,F\n"
+    "2,John,Q,Public,1985-05-17,M\n"
+    "x,Bad,,Row,1985-05-17,M\n"
+    "3,,,Nameless,1985-05-17,M\n"
+    "4,Ada,,Obi,not-a-date,F\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Return a CSV file with two valid and three invalid rows."""
+    path = tmp_path / "registry.csv"
+    path.write_text(CSV)
+    return path
+
+
+def test_validate_record():
+    """Test a valid record is cleaned."""
+    record = validate_record({"idNo": " 7 ", "firstName": "Jane", "middleName": "", "DOB": "1990-01-01"})
+    assert record == {
+        "idNo": 7, "firstName": "Jane", "middleName": None, "lastName": None, "DOB": date(1990, 1, 1), "Sex": None,
+    }
+
+
+@pytest.mark.parametrize("raw, reason", [
+    ({"idNo": "x", "firstName": "A", "DOB": "1990-01-01"}, "idNo must be an integer"),
+    ({"idNo": "-1", "firstName": "A", "DOB": "1990-01-01"}, "idNo must be positive"),
+    ({"idNo": "2147483648", "firstName": "A", "DOB": "1990-01-01"}, "idNo must be at most 2147483647"),
+    ({"idNo": "1", "firstName": "", "DOB": "1990-01-01"}, "firstName is required"),
+    ({"idNo": "1", "firstName": "A", "DOB": "01/01/1990"}, "DOB must be an ISO date"),
+    ({"idNo": "1", "firstName": "A", "DOB": "1990-01-01", "Sex": "X" * 11}, "Sex is longer"),
+])
+def test_validate_record_rejects(raw, reason):
+    """Test invalid records are rejected with a reason."""
+    with pytest.raises(ValueError, match=reason):
+        validate_record(raw)
+
+
+def test_sqlite_uses_bulk_create():
+    """Test the batched insert fallback is used off PostgreSQL."""
+    assert isinstance(get_loader(), BulkCreateLoader)
+
+
+def test_import_csv(csv_file, tmp_path):
+    """Test valid rows are imported and invalid ones written to the rejects file."""
+    rejects = tmp_path / "rejects.ndjson"
+    out = io.StringIO()
+    call_command("import_national_ids", str(csv_file), "--rejects", str(rejects), stdout=out)
+    assert set(NationalId.objects.values_list("idNo", flat=True)) == {1, 2}
+    assert set(NationalId.objects.values_list("Passport", flat=True)) == {""}
+    reasons = [json.loads(line)["reason"] for line in rejects.read_text().splitlines()]
+    assert reasons == ["idNo must be an integer", "firstName is required", "DOB must be an ISO date (YYYY-MM-DD)"]
+    assert "rows/sec" in out.getvalue()
+
+
+def test_import_upserts_on_id_no(tmp_path):
+    """Test existing records are updated in place."""
+    existing = NationalId.objects.create(idNo=1, firstName="Old", DOB=date(1990, 1, 1))
+    path = tmp_path / "registry.ndjson"
+    path.write_text('{"idNo": 1, "firstName": "New", "DOB": "1990-01-01"}\n')
+    call_command("import_national_ids", str(path), stdout=io.StringIO())
+    updated = NationalId.objects.get(idNo=1)
+    assert updated.firstName == "New"
+    assert updated.issuedAt == existing.issuedAt
+
+
+def test_batches_report_resumable_offsets(csv_file):
+    """Test resuming from a batch's end offset skips the lines already read."""
+    with open(csv_file, "rb") as stream:
+        first = next(iter_batches(stream, "csv", batch_size=2))
+        assert sorted(first.records) == [1, 2]
+        resumed = list(iter_batches(stream, "csv", offset=first.end_offset, batch_size=10))
+    assert len(resumed) == 1
+    assert resumed[0].lines == 3
+    assert resumed[0].end_offset == len(CSV)
+
+
+def test_import_resumes_from_offset(csv_file):
+    """Test --offset skips everything before it."""
+    offset = CSV.index("2,John")
+    call_command("import_national_ids", str(csv_file), "--offset", str(offset), stdout=io.StringIO(),
+                 stderr=io.StringIO())
+    assert list(NationalId.objects.values_list("idNo", flat=True)) == [2]
@@ -0,0 +1,139 @@
+"""National ID search tests."""
+from datetime import date
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from nationalId import search
+from nationalId.models import NationalId
+
+pytestmark = pytest.mark.django_db
+
+PEOPLE = [
+    (1, "Jane", None, "Doe", date(1990, 1, 1)),
+    (2, "Jonathan", "Ade", "Okafor", date(1985, 5, 17)),
+    (3, "Janet", "", "Smith", date(1990, 1, 1)),
+    (4, "Adebayo", None, "Jan", date(1979, 3, 3)),
+    (5, "Mary", None, "Public", date(1990, 1, 1)),
+]
+
+
+@pytest.fixture
+def people():
+    """Create the national ID records in ``PEOPLE``."""
+    for id_no, first, middle, last, dob in PEOPLE:
+        NationalId.objects.create(idNo=id_no, firstName=first, middleName=middle, lastName=last, DOB=dob)
+
+
+@pytest.fixture
+def staff_client():
+    """Return an API client authenticated as a staff user."""
+    user = get_user_model().objects.create_user(email="staff@example.com", password="testpassword", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _names(results):
+    return [record.firstName for record in results]
+
+
+def test_prefix_matches_rank_names_starting_with_the_query_first(people):
+    """Test a prefix finds every name containing it, names starting with it first."""
+    assert _names(search.search("jan")) == ["Jane", "Janet", "Adebayo"]
+    assert _names(search.search("ja")) == ["Jane", "Janet", "Adebayo"]
+
+
+def test_fuzzy_matches(people):
+    """Test a misspelt name still finds the record."""
+    assert _names(search.search("jonathon")) == ["Jonathan"]
+
+
+def test_every_word_must_match(people):
+    """Test each query word narrows the results."""
+    assert _names(search.search("doe jane")) == ["Jane"]
+
+
+def test_dob_filter(people):
+    """Test the date of birth narrows name matches, or lists everyone born that day."""
+    assert _names(search.search("jan", dob=date(1990, 1, 1))) == ["Jane", "Janet"]
+    assert _names(search.search("", dob=date(1990, 1, 1))) == ["Jane", "Janet", "Mary"]
+
+
+def test_id_number_lookup(people):
+    """Test a number looks up that ID."""
+    assert _names(search.search("4")) == ["Adebayo"]
+
+
+def test_id_number_out_of_range(staff_client, people):
+    """Test numbers too large for an ID match nothing instead of failing."""
+    assert search.search("99999999999999999999") == []
+
+    response = staff_client.get(reverse("national_id_search"), {"q": "99999999999999999999"})
+
+    assert response.status_code == 200
+    assert response.data["results"] == []
+
+
+def test_index_follows_updates_and_deletes(people):
+    """Test renamed and deleted records are found under their new names only."""
+    jane = NationalId.objects.get(idNo=1)
+    jane.firstName = "Grace"
+    jane.save()
+    NationalId.objects.filter(idNo=3).delete()
+
+    assert _names(search.search("jan")) == ["Adebayo"]
+    assert _names(search.search("grace")) == ["Grace"]
+
+
+def test_search_endpoint_pages_ranked_results(staff_client, people):
+    """Test the endpoint returns ranked pages with a next link."""
+    url = reverse("national_id_search")
+
+    first = staff_client.get(url, {"q": "jan", "page_size": 2})
+    second = staff_client.get(first.data["next"])
+
+    assert first.status_code == 200
+    assert [row["firstName"] for row in first.data["results"]] == ["Jane", "Janet"]
+    assert first.data["results"][0]["rank"] >= first.data["results"][1]["rank"]
+    assert [row["firstName"] for row in second.data["results"]] == ["Adebayo"]
+    assert second.data["next"] is None
+
+
+def test_search_endpoint_requires_a_term_or_dob(staff_client):
+    """Test a search without a term or date of birth returns 400."""
+    response = staff_client.get(reverse("national_id_search"))
+
+    assert response.status_code == 400
+
+
+def test_search_endpoint_requires_staff(people):
+    """Test non-staff users cannot search."""
+    client = APIClient()
+    client.force_authenticate(user=get_user_model().objects.create_user(email="u@example.com", password="x"))
+
+    response = client.get(reverse("national_id_search"), {"q": "jane"})
+
+    assert response.status_code == 403
+
+
+def test_admin_search_uses_the_index(client, admin_user, people):
+    """Test the admin changelist search matches prefixes and filters by a date in the term."""
+    client.force_login(admin_user)
+
+    response = client.get(reverse("admin:nationalId_nationalid_changelist"), {"q": "jan 1990-01-01"})
+
+    assert response.status_code == 200
+    assert {record.firstName for record in response.context["cl"].result_list} == {"Jane", "Janet"}
+
+
+def test_admin_search_out_of_range_id_number(client, admin_user, people):
+    """Test the admin search treats numbers too large for an ID as no match."""
+    client.force_login(admin_user)
+
+    response = client.get(reverse("admin:nationalId_nationalid_changelist"), {"q": "99999999999999999999"})
+
+    assert response.status_code == 200
+    assert list(response.context["cl"].result_list) == []
@@ -0,0 +1,8 @@
+"""URL patterns for the national ID app."""
+from django.urls import path
+
+from .views import NationalIdSearchView
+
+urlpatterns = [
+    path('national-ids/search/', NationalIdSearchView.as_view(), name='national_id_search'),
+]
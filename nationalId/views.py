@@ -1,3 +1,58 @@
-from django.shortcuts import render
+"""Views for the national ID app."""
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 
-# Create your views here.
+from . import search
+from .serializers import (NationalIdSearchResultSerializer,
+                          NationalIdSearchSerializer)
+
+
+class NationalIdSearchView(APIView):
+    """Search national ID records by name and date of birth (staff only)."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Search national ID records, best matches first.
+
+        Names are matched word by word through a search index: prefixes
+        ("jan" finds "Janet") and misspellings ("jonathon" finds "Jonathan")
+        match. A term made of digits only looks up that ID number.
+
+        Query parameters:
+        - q (string): Name words to search for
+        - dob (date): Only records born on this day
+        - page (integer): The page of results (default 1)
+        - page_size (integer): Results per page (default NATIONAL_ID_SEARCH_PAGE_SIZE)
+
+        At least one of q and dob is required. Only the first
+        NATIONAL_ID_SEARCH_MAX_RESULTS results can be paged through.
+
+        Returns:
+        - 200 OK: One page of results
+            {
+                "next": "string (URL) or null",
+                "results": [{"idNo": integer, "firstName": "string", "middleName": "string or null",
+                             "lastName": "string or null", "DOB": "date", "Sex": "string or null",
+                             "rank": number}]
+            }
+        - 400 Bad Request: Invalid parameters
+        - 403 Forbidden: The user is not staff
+        """
+        params = NationalIdSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        page, page_size = data['page'], data['page_size']
+
+        # One extra row tells whether there is a next page without counting.
+        results = search.search(data['q'], dob=data['dob'], limit=page_size + 1, offset=(page - 1) * page_size)
+        next_url = None
+        if len(results) > page_size:
+            next_url = replace_query_param(request.build_absolute_uri(), 'page', page + 1)
+        return Response({
+            "next": next_url,
+            "results": NationalIdSearchResultSerializer(results[:page_size], many=True).data,
+        }, status=status.HTTP_200_OK)
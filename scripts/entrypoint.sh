@@ -19,6 +19,10 @@ mkdir -p /app/static
 python manage.py collectstatic --noinput
 >&2 echo 'Collected static files...'
 
+# Pre-generate the OpenAPI schema so it is not rebuilt per request
+/opt/venv/bin/python manage.py generate_openapi_schema
+>&2 echo 'Generated OpenAPI schema...'
+
 # Run database migrations
 /opt/venv/bin/python manage.py migrate --noinput || true
 >&2 echo 'Ran database migrations...'
@@ -34,6 +38,13 @@ echo "from django.contrib.auth import get_user_model; User = get_user_model(); u
 # Set the application port, defaulting to 8000 if not set
 APP_PORT=${PORT:-8000}
 
+# Serve the WSGI application with sync workers (default) or the ASGI application with uvicorn workers
+SERVER_MODE=${SERVER_MODE:-wsgi}
+
 # Start the Gunicorn server to serve the Django application
->&2 echo 'About to run Gunicorn...'
-/opt/venv/bin/gunicorn --worker-tmp-dir /dev/shm config.wsgi:application --bind "0.0.0.0:${APP_PORT}" --timeout 600
+>&2 echo "About to run Gunicorn (${SERVER_MODE})..."
+if [ "$SERVER_MODE" = "asgi" ]; then
+    /opt/venv/bin/gunicorn --worker-tmp-dir /dev/shm config.asgi:application -k uvicorn.workers.UvicornWorker --bind "0.0.0.0:${APP_PORT}" --timeout 600
+else
+    /opt/venv/bin/gunicorn --worker-tmp-dir /dev/shm config.wsgi:application --bind "0.0.0.0:${APP_PORT}" --timeout 600
+fi
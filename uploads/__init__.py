@@ -0,0 +1 @@
+"""Streaming file uploads: size-capped, hashed on the fly, images checked from their headers."""
@@ -0,0 +1,15 @@
+"""Uploads app config."""
+from django.apps import AppConfig, apps
+
+
+class UploadsConfig(AppConfig):
+    """Uploads app config."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "uploads"
+
+    def ready(self):
+        """Count blob references from every model storing files as blobs."""
+        from . import signals
+
+        signals.connect(apps.get_models())
@@ -0,0 +1,210 @@
+"""
+Resized copies of stored images, rendered on demand and cached on local disk.
+
+A derivative is named after the SHA-256 of its source file and the preset's
+size and quality, so it never goes stale: a new photo has a new hash, and a
+changed preset a new name. That name is also the ETag served with it.
+
+Rendering runs in a pool of ``IMAGE_DERIVATIVE_WORKERS`` processes (or in the
+calling thread when it is 0), so decoding a large photo never holds the GIL of
+a web worker. Concurrent requests for the same derivative in one process share
+a single render.
+
+The cache directory is bounded: reading a derivative bumps its mtime, and once
+the files written push it past ``IMAGE_DERIVATIVE_CACHE_MAX_BYTES`` the least
+recently used ones are deleted until it is back to 90% of that. Each process
+counts its own writes between scans, so the cache can overshoot by what other
+processes wrote since their last scan.
+
+Blobs carry their hash in their name. For files stored before blobs, the hash
+is read from the file once and kept in the ``IMAGE_DERIVATIVE_CACHE_ALIAS``
+cache for ``IMAGE_DERIVATIVE_SOURCE_TIMEOUT`` seconds, keyed by storage name.
+"""
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from PIL import UnidentifiedImageError
+
+from .rendering import render
+from .storage import ContentAddressedStorage
+
+# URL extension -> (Pillow format, content type)
+FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpg": ("JPEG", "image/jpeg"),
+}
+SOURCE_KEY_PREFIX = "image-source:"
+LOW_WATER = 0.9
+
+_lock = threading.Lock()
+_executor = None
+_in_flight = {}
+_cache_size = None
+
+
+class DerivativeError(Exception):
+    """The source image could not be decoded."""
+
+
+def source_hash(field_file):
+    """Return the SHA-256 hex digest of ``field_file``, reading the file only on a cache miss."""
+    if isinstance(field_file.storage, ContentAddressedStorage):
+        digest = field_file.storage.digest(field_file.name)
+        if digest:
+            return digest
+    cache = caches[settings.IMAGE_DERIVATIVE_CACHE_ALIAS]
+    key = f"{SOURCE_KEY_PREFIX}{field_file.name}"
+    digest = cache.get(key)
+    if digest is None:
+        sha256 = hashlib.sha256()
+        with field_file.open("rb") as file:
+            for chunk in file.chunks():
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+        cache.set(key, digest, settings.IMAGE_DERIVATIVE_SOURCE_TIMEOUT)
+    return digest
+
+
+def derivative_name(digest, preset, extension):
+    """Return the cache file name (and ETag) of a derivative."""
+    width, height = settings.IMAGE_DERIVATIVE_PRESETS[preset]
+    return f"{digest}-{width}x{height}-q{settings.IMAGE_DERIVATIVE_QUALITY}.{extension}"
+
+
+def open_derivative(field_file, digest, preset, extension):
+    """Return the derivative of ``field_file`` open for reading, rendering it first if it is not cached."""
+    name = derivative_name(digest, preset, extension)
+    path = Path(settings.IMAGE_DERIVATIVE_CACHE_DIR) / digest[:2] / name
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        _wait_for_render(field_file, path, preset, extension)
+        return open(path, "rb")
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass  # Evicted since it was opened; the open file is still readable.
+    return file
+
+
+def _wait_for_render(field_file, path, preset, extension):
+    """Render the derivative at ``path``, or wait for a render already running in this process."""
+    with _lock:
+        future = _in_flight.get(path)
+        owner = future is None
+        if owner:
+            future = _in_flight[path] = Future()
+
+    if owner:
+        try:
+            future.set_result(_render(field_file, path, preset, extension))
+        except Exception as error:
+            future.set_exception(error)
+        finally:
+            with _lock:
+                del _in_flight[path]
+        if future.exception() is None:
+            _count(future.result())
+    try:
+        future.result()
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError) as error:
+        raise DerivativeError(f"{field_file.name} cannot be rendered: {error}") from error
+
+
+def _render(field_file, path, preset, extension):
+    """Render ``field_file`` to ``path`` and return the size written."""
+    try:
+        source = field_file.path
+    except NotImplementedError:
+        # Remote storage: read the source here and ship the bytes to the worker.
+        with field_file.open("rb") as file:
+            source = file.read()
+    args = (source, settings.IMAGE_DERIVATIVE_PRESETS[preset], FORMATS[extension][0],
+            settings.IMAGE_DERIVATIVE_QUALITY, str(path))
+    if not settings.IMAGE_DERIVATIVE_WORKERS:
+        return render(*args)
+    return _get_executor().submit(render, *args).result()
+
+
+def _get_executor():
+    """Return this process's render pool, starting it on first use."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+                # Not fork: the web worker may have threads (and open sockets) a child must not inherit.
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return _executor
+
+
+def _count(size):
+    """Count ``size`` newly written bytes, evicting when the cache is over its bound."""
+    global _cache_size
+    with _lock:
+        if _cache_size is not None:
+            _cache_size += size
+        over = _cache_size is None or _cache_size > settings.IMAGE_DERIVATIVE_CACHE_MAX_BYTES
+    if over:
+        evict()
+
+
+def evict(max_bytes=None):
+    """
+    Delete the least recently used derivatives if the cache holds more than ``max_bytes``.
+
+    Brings the cache down to 90% of ``max_bytes`` (``IMAGE_DERIVATIVE_CACHE_MAX_BYTES``
+    by default) and returns the number of bytes left.
+    """
+    global _cache_size
+    if max_bytes is None:
+        max_bytes = settings.IMAGE_DERIVATIVE_CACHE_MAX_BYTES
+    entries = []
+    try:
+        shards = list(os.scandir(settings.IMAGE_DERIVATIVE_CACHE_DIR))
+    except FileNotFoundError:
+        shards = []
+    for shard in shards:
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            if entry.name.startswith("."):
+                continue  # A render in progress.
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    if total > max_bytes:
+        entries.sort()
+        for _, size, path in entries:
+            if total <= max_bytes * LOW_WATER:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+    with _lock:
+        _cache_size = total
+    return total
+
+
+def reset():
+    """Shut down the render pool and forget the counted cache size in this process."""
+    global _executor, _cache_size
+    with _lock:
+        executor, _executor = _executor, None
+        _in_flight.clear()
+        _cache_size = None
+    if executor is not None:
+        executor.shutdown()
@@ -0,0 +1,28 @@
+"""Image fields that validate uploads from the file header (see :mod:`uploads.images`)."""
+from django import forms
+from django.db import models
+from PIL import Image
+
+from .images import inspect_image
+
+
+class ImageFormField(forms.ImageField):
+    """``forms.ImageField`` that checks the header instead of decoding the image."""
+
+    def to_python(self, data):
+        """Return the uploaded file once its header passes :func:`~uploads.images.inspect_image`."""
+        file = forms.FileField.to_python(self, data)
+        if file is None:
+            return None
+        image_format, _, _ = inspect_image(file)
+        if hasattr(file, "content_type"):
+            file.content_type = Image.MIME.get(image_format)
+        return file
+
+
+class ImageField(models.ImageField):
+    """``models.ImageField`` whose forms (and the admin) use :class:`ImageFormField`."""
+
+    def formfield(self, **kwargs):
+        """Return an :class:`ImageFormField`."""
+        return super().formfield(**{"form_class": ImageFormField, **kwargs})
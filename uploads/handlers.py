@@ -0,0 +1,68 @@
+"""
+Upload handler that streams every file to disk under a hard size cap.
+
+Registered through ``FILE_UPLOAD_HANDLERS``, so it serves Django forms, the
+admin and DRF's ``MultiPartParser`` alike. Each file is written to a temporary
+file in ``UPLOAD_CHUNK_SIZE`` chunks and hashed as the chunks arrive, so a
+request holds at most one chunk in memory whatever the file size, and the
+digest costs no second pass over the file. The finished file is a
+``TemporaryUploadedFile`` whose ``sha256`` attribute holds the hex digest;
+storage backends move or stream it from its temporary path.
+
+A file larger than ``UPLOAD_MAX_FILE_SIZE`` aborts the request as soon as the
+cap is crossed (or before any data is read, if the part declares its length).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+
+
+class FileTooLarge(RequestDataTooBig, MultiPartParserError):
+    """
+    An uploaded file exceeded ``UPLOAD_MAX_FILE_SIZE``.
+
+    A ``MultiPartParserError`` so that DRF answers with a 400 parse error, and a
+    ``RequestDataTooBig`` so that plain Django views (the admin) answer 400 too.
+    """
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """Stream each file to a temporary file, hashing it and enforcing the size cap."""
+
+    def __init__(self, request=None):
+        """Read the chunk size from ``UPLOAD_CHUNK_SIZE``."""
+        super().__init__(request)
+        self.chunk_size = settings.UPLOAD_CHUNK_SIZE
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        """Start a new temporary file, rejecting it outright if its declared length is over the cap."""
+        if content_length is not None and content_length > settings.UPLOAD_MAX_FILE_SIZE:
+            self._reject(field_name)
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.hash = hashlib.sha256()
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        """Hash and write ``raw_data``, aborting once the file grows past the cap."""
+        self.received += len(raw_data)
+        if self.received > settings.UPLOAD_MAX_FILE_SIZE:
+            # The parser only cleans up after StopUpload, so remove the partial file here.
+            self.upload_interrupted()
+            self._reject(self.field_name)
+        self.hash.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        """Return the finished file with its digest attached."""
+        file = super().file_complete(file_size)
+        file.sha256 = self.hash.hexdigest()
+        return file
+
+    def _reject(self, field_name):
+        """Raise :class:`FileTooLarge` for ``field_name``."""
+        raise FileTooLarge(
+            f"The file in '{field_name}' is larger than {settings.UPLOAD_MAX_FILE_SIZE} bytes."
+        )
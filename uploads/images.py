@@ -0,0 +1,49 @@
+"""
+Image validation from the file header alone.
+
+``forms.ImageField`` (and DRF's ``ImageField``, which wraps it) calls Pillow's
+``verify()``, which reads the whole file, and for in-memory uploads first copies
+it into a ``BytesIO``. ``Image.open`` on its own only parses the header: format,
+dimensions and mode, a few hundred bytes into the file. That is enough to reject
+non-images, unsupported formats and decompression bombs; pixel data is only
+decoded when a derivative is rendered.
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from PIL import Image, UnidentifiedImageError
+
+
+def inspect_image(file):
+    """
+    Return ``(format, width, height)`` read from the header of ``file``.
+
+    ``file`` is an uploaded file, a ``File`` or a path. Raises
+    ``ValidationError`` when it is not an image in ``UPLOAD_IMAGE_FORMATS`` or
+    has more than ``UPLOAD_IMAGE_MAX_PIXELS`` pixels.
+    """
+    if hasattr(file, "temporary_file_path"):
+        source = file.temporary_file_path()
+    else:
+        source = file
+        if hasattr(file, "seek"):
+            file.seek(0)
+    try:
+        with Image.open(source, formats=settings.UPLOAD_IMAGE_FORMATS) as image:
+            image_format, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError, ValueError):
+        raise ValidationError(
+            "Upload a valid image. Supported formats: %(formats)s.",
+            code="invalid_image",
+            params={"formats": ", ".join(settings.UPLOAD_IMAGE_FORMATS)},
+        )
+    finally:
+        if hasattr(file, "seek"):
+            file.seek(0)
+
+    if width * height > settings.UPLOAD_IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            "Images may have at most %(max)s pixels; this one has %(pixels)s.",
+            code="image_too_large",
+            params={"max": settings.UPLOAD_IMAGE_MAX_PIXELS, "pixels": width * height},
+        )
+    return image_format, width, height
@@ -0,0 +1 @@
+"""Uploads management."""
@@ -0,0 +1,42 @@
+"""Delete stored files that no model field references any more."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from uploads import blobs
+
+
+class Command(BaseCommand):
+    """Garbage-collect unreferenced blobs."""
+
+    help = (
+        "Delete content-addressed blobs whose reference count is zero and that no upload has reused "
+        "for --grace-hours (BLOB_GC_GRACE_HOURS by default). Schedule it (e.g. daily from cron)."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--grace-hours", type=float, default=settings.BLOB_GC_GRACE_HOURS,
+            help="Keep unreferenced blobs used more recently than this.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Blobs locked and checked per transaction.")
+        parser.add_argument(
+            "--recount", action="store_true",
+            help="First recompute every reference count from the file fields (after bulk updates or deletes).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many blobs would be deleted.")
+
+    def handle(self, *args, **options):
+        """Collect the garbage."""
+        if options["recount"]:
+            changed = blobs.recount()
+            self.stdout.write(f"Corrected {changed} reference counts.")
+        deleted = blobs.collect_garbage(
+            grace=timedelta(hours=options["grace_hours"]),
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {deleted} unreferenced blobs."))
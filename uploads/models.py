@@ -0,0 +1,33 @@
+"""Models for the uploads app."""
+from django.db import models
+from django.utils import timezone
+
+
+class Blob(models.Model):
+    """
+    A stored file, identified by the SHA-256 of its content.
+
+    Files saved through :class:`uploads.storage.ContentAddressedStorage` are
+    stored once per distinct content; ``refcount`` counts the model fields
+    pointing at it (see :mod:`uploads.signals`). Blobs left unreferenced are
+    deleted by ``manage.py gc_blobs``.
+    """
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Bumped whenever an upload reuses the blob, so garbage collection spares it.
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        """Index the garbage collection query."""
+
+        indexes = [
+            models.Index(fields=["refcount", "last_used_at"], name="blob_gc_idx"),
+        ]
+
+    def __str__(self):
+        """Return the storage name."""
+        return self.name
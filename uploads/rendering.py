@@ -0,0 +1,43 @@
+"""
+Pillow work for image derivatives, run in the worker processes of :mod:`uploads.derivatives`.
+
+Kept free of Django imports so the worker processes start quickly and never
+touch settings, the database or the cache.
+"""
+import io
+import os
+import tempfile
+
+from PIL import Image, ImageOps
+
+
+def render(source, size, image_format, quality, destination):
+    """
+    Write ``source`` scaled to fit within ``size`` as ``image_format`` to ``destination``; return its size in bytes.
+
+    ``source`` is a path or the image bytes. JPEG sources are decoded at a
+    reduced scale (``draft``) when that is still at least ``size``. The file is
+    written next to ``destination`` and renamed into place, so readers never
+    see a partial file.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        image.draft("RGB", size)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        if image_format == "JPEG" or image.mode not in ("RGB", "RGBA"):
+            keep_alpha = image_format == "WEBP" and image.has_transparency_data
+            image = image.convert("RGBA" if keep_alpha else "RGB")
+
+        directory = os.path.dirname(destination)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".render.")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                image.save(file, format=image_format, quality=quality)
+            os.replace(temp_path, destination)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    return os.path.getsize(destination)
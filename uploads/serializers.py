@@ -0,0 +1,13 @@
+"""DRF counterpart of :class:`uploads.fields.ImageField`."""
+from rest_framework import serializers
+
+from .fields import ImageFormField
+
+
+class ImageField(serializers.ImageField):
+    """``serializers.ImageField`` validating the header only, via :class:`~uploads.fields.ImageFormField`."""
+
+    def __init__(self, *args, **kwargs):
+        """Validate with :class:`~uploads.fields.ImageFormField` unless told otherwise."""
+        kwargs.setdefault("_DjangoImageField", ImageFormField)
+        super().__init__(*args, **kwargs)
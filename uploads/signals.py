@@ -0,0 +1,71 @@
+"""
+Reference counting of blobs from the model fields stored in them.
+
+Connected in :meth:`uploads.apps.UploadsConfig.ready` for every model with a
+``FileField`` using :class:`~uploads.storage.ContentAddressedStorage`. A save
+that changes such a field moves one reference from the old blob to the new one,
+a delete drops the references, both inside the saving transaction. Bulk
+``update()``/``delete()`` bypass the signals; ``manage.py gc_blobs --recount``
+repairs the counts.
+"""
+from collections import Counter
+
+from django.db.models import F, FileField
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import Blob
+from .storage import ContentAddressedStorage
+
+
+def blob_fields(model):
+    """Return the file fields of ``model`` stored as blobs."""
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def _names(instance, fields):
+    """Return the stored names of ``fields`` on ``instance``."""
+    return [getattr(instance, field.attname).name or None for field in fields]
+
+
+def _change_refcounts(names, delta):
+    """Add ``delta`` references to each blob in ``names`` (once per occurrence)."""
+    for name, count in Counter(name for name in names if name).items():
+        Blob.objects.filter(name=name).update(refcount=F("refcount") + delta * count)
+
+
+def remember_previous_blobs(sender, instance, update_fields=None, **kwargs):
+    """Read the blob names an existing row points at before it is overwritten."""
+    fields = blob_fields(sender)
+    if update_fields is not None:
+        fields = [field for field in fields if field.name in update_fields or field.attname in update_fields]
+    instance._previous_blobs = (fields, [None] * len(fields))
+    if fields and not instance._state.adding:
+        previous = sender._base_manager.filter(pk=instance.pk).values_list(*(f.attname for f in fields)).first()
+        if previous is not None:
+            instance._previous_blobs = (fields, [name or None for name in previous])
+
+
+def count_saved_blobs(sender, instance, **kwargs):
+    """Move references from the blobs a row pointed at to the ones it points at now."""
+    fields, previous = instance.__dict__.pop("_previous_blobs", ([], []))
+    current = _names(instance, fields)
+    changed = [(old, new) for old, new in zip(previous, current) if old != new]
+    _change_refcounts([new for _, new in changed], 1)
+    _change_refcounts([old for old, _ in changed], -1)
+
+
+def count_deleted_blobs(sender, instance, **kwargs):
+    """Drop the references of a deleted row."""
+    _change_refcounts(_names(instance, blob_fields(sender)), -1)
+
+
+def connect(models):
+    """Connect the reference counting handlers for each of ``models`` that stores blobs."""
+    for model in models:
+        if blob_fields(model):
+            pre_save.connect(remember_previous_blobs, sender=model)
+            post_save.connect(count_saved_blobs, sender=model)
+            post_delete.connect(count_deleted_blobs, sender=model)
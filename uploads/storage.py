@@ -0,0 +1,133 @@
+"""
+Storage for uploaded files.
+
+:class:`ContentAddressedStorage` stores each distinct file once, named after
+the SHA-256 of its content, on top of the default storage backend
+(``DEFAULT_FILE_STORAGE``, S3 in production). Saving a file whose content is
+already stored costs two queries and no upload. Stored files are tracked as
+:class:`~uploads.models.Blob` rows, reference-counted from the model fields
+using the storage and deleted by ``manage.py gc_blobs`` once unreferenced.
+"""
+import hashlib
+import os
+import re
+
+from django.core.files import File
+from django.core.files.storage import Storage, default_storage
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+BLOB_PREFIX = "blobs"
+BLOB_NAME = re.compile(rf"^{BLOB_PREFIX}/[0-9a-f]{{2}}/(?P<digest>[0-9a-f]{{64}})(\.[A-Za-z0-9]+)?$")
+
+
+def file_hash(content):
+    """Return the SHA-256 hex digest of ``content``, reusing the one computed while it was uploaded."""
+    digest = getattr(content, "sha256", None)
+    if digest is None:
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        digest = sha256.hexdigest()
+        content.seek(0)
+    return digest
+
+
+def blob_name(digest, name):
+    """Return the storage name of content ``digest`` uploaded as ``name``."""
+    extension = os.path.splitext(name)[1].lower()
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest}{extension}"
+
+
+@deconstructible
+class ContentAddressedStorage(Storage):
+    """
+    Store files under ``blobs/<xx>/<sha256><ext>`` in the default storage, once per distinct content.
+
+    Reads, URLs and sizes go straight to the default storage, so files saved
+    before this storage was introduced keep working. Deleting a blob only
+    happens in garbage collection, which knows whether it is still referenced.
+    """
+
+    @property
+    def backend(self):
+        """The storage the blobs are kept in."""
+        return default_storage
+
+    def save(self, name, content, max_length=None):
+        """Store ``content`` unless identical content is already stored; return the blob's name."""
+        from .models import Blob
+
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        digest = file_hash(content)
+        # Touching the row first means a concurrent garbage collection either
+        # already deleted it (and we upload again) or waits for our transaction.
+        if Blob.objects.filter(sha256=digest).update(last_used_at=timezone.now()):
+            return Blob.objects.values_list("name", flat=True).get(sha256=digest)
+
+        stored = self.backend.save(blob_name(digest, name), content, max_length=max_length)
+        blob, created = Blob.objects.get_or_create(sha256=digest, defaults={"name": stored, "size": content.size})
+        if not created and blob.name != stored:
+            # Another request stored the same content at the same time.
+            self.backend.delete(stored)
+        return blob.name
+
+    def digest(self, name):
+        """Return the content hash encoded in blob ``name``, or None for files stored before blobs."""
+        match = BLOB_NAME.match(name or "")
+        return match and match["digest"]
+
+    def delete(self, name):
+        """Delete a file stored before blobs; blobs are left to garbage collection."""
+        if not self.digest(name):
+            self.backend.delete(name)
+
+    def _open(self, name, mode="rb"):
+        return self.backend.open(name, mode)
+
+    def exists(self, name):
+        """Return True if ``name`` exists in the default storage."""
+        return self.backend.exists(name)
+
+    def listdir(self, path):
+        """List ``path`` in the default storage."""
+        return self.backend.listdir(path)
+
+    def size(self, name):
+        """Return the size of ``name``."""
+        return self.backend.size(name)
+
+    def url(self, name):
+        """Return the URL of ``name``."""
+        return self.backend.url(name)
+
+    def path(self, name):
+        """Return the local path of ``name``, if the default storage has one."""
+        return self.backend.path(name)
+
+    def get_modified_time(self, name):
+        """Return the last modification time of ``name``."""
+        return self.backend.get_modified_time(name)
+
+
+blob_storage = ContentAddressedStorage()
+
+
+def get_blob_storage():
+    """Return the content-addressed storage (a callable, so migrations do not embed the instance)."""
+    return blob_storage
+
+
+def save_upload(field, upload, instance=None):
+    """
+    Store ``upload`` where ``field`` (a model ``FileField``) would, and return the stored name.
+
+    Lets a caller write the file before opening a transaction, so a slow
+    backend (S3) never runs while row locks are held. ``FileSystemStorage``
+    moves a ``TemporaryUploadedFile`` into place instead of copying it; remote
+    backends stream it from disk. Assign the returned name to the field; delete
+    it with ``field.storage.delete(name)`` if the row is never saved.
+    """
+    name = field.generate_filename(instance, upload.name)
+    return field.storage.save(name, upload, max_length=field.max_length)
@@ -0,0 +1,87 @@
+"""Test fixtures for uploads app."""
+import io
+import os
+import struct
+import zlib
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+from rest_framework.test import APIClient
+
+from license.models import License
+from nationalId.models import NationalId
+from uploads import derivatives
+
+User = get_user_model()
+
+
+@pytest.fixture
+def make_png():
+    """Return a factory for PNGs of random noise."""
+    return png_bytes
+
+
+def png_bytes(width, height):
+    """Return an uncompressed PNG of random noise, about ``3 * width * height`` bytes long."""
+    image = Image.frombytes("RGB", (width, height), os.urandom(3 * width * height))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=0)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def make_png_header():
+    """Return a factory for PNG headers without real pixel data."""
+    return png_header
+
+
+def png_header(width, height):
+    """Return a PNG header claiming ``width`` x ``height`` pixels, followed by garbage pixel data."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", b"not really pixels")
+
+
+@pytest.fixture(autouse=True)
+def upload_dirs(settings, tmp_path):
+    """Store media, temporary uploads and derivatives under ``tmp_path``."""
+    settings.MEDIA_ROOT = tmp_path / "media"
+    settings.FILE_UPLOAD_TEMP_DIR = tmp_path / "tmp"
+    settings.FILE_UPLOAD_TEMP_DIR.mkdir()
+    settings.IMAGE_DERIVATIVE_CACHE_DIR = tmp_path / "derivatives"
+    settings.IMAGE_DERIVATIVE_WORKERS = 0
+    cache.clear()
+    yield tmp_path
+    derivatives.reset()
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client authenticated as a new user."""
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create_user(email="test@example.com", password="testpassword"))
+    return client
+
+
+@pytest.fixture
+def national_id():
+    """Return a national id without a passport image."""
+    return NationalId.objects.create(idNo=12345678, firstName="Jane", lastName="Doe", DOB=date(1990, 1, 1))
+
+
+@pytest.fixture
+def license(national_id, make_png):
+    """Return a license with a 1200x900 passport photo."""
+    return License.objects.create(
+        IdNo=national_id,
+        licenseId="DL-0001",
+        expiry_date=date.today() + timedelta(days=365),
+        passport_photo=default_storage.save("passport_photos/jane.png", ContentFile(make_png(1200, 900))),
+    )
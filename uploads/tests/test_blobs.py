@@ -0,0 +1,105 @@
+"""Tests for content-addressed storage and blob garbage collection."""
+import hashlib
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.utils import timezone
+
+from license.models import License
+from uploads import derivatives
+from uploads.blobs import collect_garbage
+from uploads.models import Blob
+from uploads.storage import blob_storage
+
+pytestmark = pytest.mark.django_db
+
+
+def age(blob_name, days=2):
+    """Make the blob named ``blob_name`` look last used ``days`` ago."""
+    Blob.objects.filter(name=blob_name).update(last_used_at=timezone.now() - timedelta(days=days))
+
+
+def test_identical_content_is_stored_once(django_assert_num_queries, upload_dirs):
+    """Test saving content that is already stored costs two queries and no upload."""
+    content = b"%PDF-1.7 police report"
+    digest = hashlib.sha256(content).hexdigest()
+
+    name = blob_storage.save("police_reports/Report.PDF", ContentFile(content))
+    with django_assert_num_queries(2):
+        again = blob_storage.save("passports/copy.pdf", ContentFile(content))
+
+    assert name == again == f"blobs/{digest[:2]}/{digest}.pdf"
+    assert blob_storage.open(name).read() == content
+    assert Blob.objects.get().size == len(content)
+    assert len(list((upload_dirs / "media" / "blobs" / digest[:2]).iterdir())) == 1
+
+
+def test_refcounts_follow_the_file_fields(license, national_id):
+    """Test references are counted across fields and moved when a field changes or its row is deleted."""
+    license.passport_photo.save("jane.png", ContentFile(b"photo"))
+    national_id.Passport.save("jane.png", ContentFile(b"photo"))
+    photo = Blob.objects.get()
+    assert photo.refcount == 2
+
+    license.passport_photo.save("new.png", ContentFile(b"new photo"))
+    assert Blob.objects.get(pk=photo.pk).refcount == 1
+    assert Blob.objects.get(name=license.passport_photo.name).refcount == 1
+
+    License.objects.filter(pk=license.pk).update(expiry_date=timezone.now().date())
+    national_id.save(update_fields=["firstName"])
+    assert Blob.objects.get(pk=photo.pk).refcount == 1
+
+    national_id.delete()
+    assert not Blob.objects.filter(refcount__gt=0).exists()
+
+
+def test_collect_garbage(license, upload_dirs):
+    """Test unreferenced blobs past the grace period are deleted, and referenced ones kept."""
+    unreferenced = blob_storage.save("old.pdf", ContentFile(b"old"))
+    recent = blob_storage.save("recent.pdf", ContentFile(b"recent"))
+    license.passport_photo.save("jane.png", ContentFile(b"photo"))
+    referenced = license.passport_photo.name
+    Blob.objects.filter(name=referenced).update(refcount=0)  # A drifted count.
+    age(unreferenced)
+    age(referenced)
+
+    assert collect_garbage(dry_run=True) == 1
+    assert Blob.objects.count() == 3
+
+    assert collect_garbage() == 1
+    assert not Blob.objects.filter(name=unreferenced).exists()
+    assert not (upload_dirs / "media" / unreferenced).exists()
+    assert Blob.objects.get(name=recent).refcount == 0
+    assert Blob.objects.get(name=referenced).refcount == 1
+    assert (upload_dirs / "media" / referenced).exists()
+
+
+def test_reused_blob_is_spared(upload_dirs):
+    """Test uploading content again makes an unreferenced blob recent."""
+    name = blob_storage.save("report.pdf", ContentFile(b"report"))
+    age(name)
+
+    blob_storage.save("report.pdf", ContentFile(b"report"))
+
+    assert collect_garbage() == 0
+
+
+def test_gc_blobs_command_recounts(license, capsys):
+    """Test --recount corrects drifted counts before collecting."""
+    license.passport_photo.save("jane.png", ContentFile(b"photo"))
+    Blob.objects.update(refcount=5)
+
+    call_command("gc_blobs", "--recount", "--grace-hours", "0")
+
+    assert Blob.objects.get().refcount == 1
+    assert "Corrected 1 reference counts." in capsys.readouterr().out
+
+
+def test_blob_names_carry_the_source_hash(license):
+    """Test derivatives get the hash of a blob from its name instead of reading it."""
+    license.passport_photo.save("jane.png", ContentFile(b"photo"))
+    blob_storage.backend.delete(license.passport_photo.name)  # Reading the file would fail.
+
+    assert derivatives.source_hash(license.passport_photo) == hashlib.sha256(b"photo").hexdigest()
@@ -0,0 +1,136 @@
+"""Tests for resized passport photos."""
+import io
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image
+
+from uploads import derivatives
+
+pytestmark = pytest.mark.django_db
+
+
+def photo_url(license, preset="thumbnail", extension="webp"):
+    """Return the URL of a derivative of ``license``'s photo."""
+    return reverse("license_photo", kwargs={"pk": license.licenseId, "preset": preset, "extension": extension})
+
+
+def read_image(response):
+    """Return the Pillow image in a streamed response."""
+    return Image.open(io.BytesIO(b"".join(response.streaming_content)))
+
+
+@pytest.mark.parametrize("extension, image_format", [("webp", "WEBP"), ("jpg", "JPEG")])
+def test_derivative_is_resized_and_encoded(api_client, license, extension, image_format):
+    """Test a photo is scaled to fit the preset, keeping its aspect ratio."""
+    response = api_client.get(photo_url(license, "small", extension))
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == f"image/{image_format.lower()}"
+    assert response["Cache-Control"] == "private, no-cache"
+    image = read_image(response)
+    assert (image.format, image.size) == (image_format, (240, 180))
+
+
+def test_conditional_get_returns_304(api_client, license, django_assert_num_queries):
+    """Test a repeated view with the ETag costs one query and no file access."""
+    etag = api_client.get(photo_url(license))["ETag"]
+
+    with django_assert_num_queries(1):
+        response = api_client.get(photo_url(license), HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+def test_derivative_is_rendered_once(api_client, license, monkeypatch):
+    """Test a cached derivative is served from disk without rendering it again."""
+    first = api_client.get(photo_url(license))
+    content = b"".join(first.streaming_content)
+    monkeypatch.setattr(derivatives, "render", lambda *args: pytest.fail("rendered twice"))
+
+    second = api_client.get(photo_url(license))
+
+    assert b"".join(second.streaming_content) == content
+    assert second["ETag"] == first["ETag"]
+
+
+def test_new_photo_gets_a_new_etag(api_client, license, make_png):
+    """Test the ETag follows the content of the photo."""
+    etag = api_client.get(photo_url(license))["ETag"]
+    license.passport_photo = default_storage.save("passport_photos/new.png", ContentFile(make_png(300, 300)))
+    license.save()
+
+    response = api_client.get(photo_url(license), HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert read_image(response).size == (96, 96)
+
+
+def test_national_id_passport(api_client, national_id, make_png):
+    """Test derivatives of national ID passports, converting transparent images for JPEG."""
+    buffer = io.BytesIO()
+    Image.new("RGBA", (500, 400), (255, 0, 0, 128)).save(buffer, format="PNG")
+    national_id.Passport = default_storage.save("passports/jane.png", ContentFile(buffer.getvalue()))
+    national_id.save()
+    url = reverse("national_id_passport", kwargs={"pk": national_id.idNo, "preset": "medium", "extension": "jpg"})
+
+    response = api_client.get(url)
+
+    assert response.status_code == 200
+    assert read_image(response).size == (480, 384)
+
+
+def test_render_in_worker_process(api_client, license, settings):
+    """Test derivatives are rendered by the process pool."""
+    settings.IMAGE_DERIVATIVE_WORKERS = 1
+
+    response = api_client.get(photo_url(license, "medium", "jpg"))
+
+    assert response.status_code == 200
+    assert read_image(response).size == (480, 360)
+
+
+@pytest.mark.parametrize("url_kwargs", [{"preset": "huge"}, {"pk": "DL-9999"}])
+def test_unknown_preset_or_license_returns_404(api_client, license, url_kwargs):
+    """Test unknown presets and licenses are not found."""
+    kwargs = {"pk": license.licenseId, "preset": "thumbnail", "extension": "webp", **url_kwargs}
+    assert api_client.get(reverse("license_photo", kwargs=kwargs)).status_code == 404
+
+
+def test_missing_or_broken_image_returns_404(api_client, national_id, license, make_png_header):
+    """Test an object without an image, or with an image that cannot be decoded, is not found."""
+    url = reverse("national_id_passport", kwargs={"pk": national_id.idNo, "preset": "small", "extension": "webp"})
+    assert api_client.get(url).status_code == 404
+
+    license.passport_photo = default_storage.save("passport_photos/broken.png", ContentFile(make_png_header(64, 64)))
+    license.save()
+    response = api_client.get(photo_url(license))
+    assert response.status_code == 404
+    assert response.data == {"error": "The image cannot be rendered."}
+
+
+def test_requires_authentication(client, license):
+    """Test anonymous requests are rejected."""
+    assert client.get(photo_url(license)).status_code == 401
+
+
+def test_evict_removes_least_recently_used(upload_dirs):
+    """Test eviction deletes the oldest derivatives until the cache is at 90% of its bound."""
+    shard = upload_dirs / "derivatives" / "ab"
+    shard.mkdir(parents=True)
+    for age in range(10):
+        path = shard / f"derivative-{age}.webp"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1_000_000 - age, 1_000_000 - age))
+    (shard / ".render.tmp").write_bytes(b"x" * 100)
+
+    assert derivatives.evict(max_bytes=1000) == 1000
+    assert derivatives.evict(max_bytes=500) == 400
+    assert sorted(path.name for path in shard.iterdir()) == [
+        ".render.tmp", "derivative-0.webp", "derivative-1.webp", "derivative-2.webp", "derivative-3.webp",
+    ]
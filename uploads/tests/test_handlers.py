@@ -0,0 +1,67 @@
+"""Tests for the streaming upload handler."""
+import hashlib
+import os
+import time
+import tracemalloc
+
+import pytest
+from django.core.files.uploadedfile import (SimpleUploadedFile,
+                                            TemporaryUploadedFile)
+from django.test import RequestFactory
+
+from uploads.handlers import FileTooLarge
+
+pytestmark = pytest.mark.django_db
+
+MB = 1024 * 1024
+
+
+def parse_upload(content, name="report.pdf"):
+    """Parse a multipart request carrying ``content``; return the file, seconds taken and peak bytes allocated."""
+    request = RequestFactory().post("/upload/", {"file": SimpleUploadedFile(name, content)})
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        upload = request.FILES["file"]
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return upload, elapsed, peak
+
+
+@pytest.mark.parametrize("size_mb", [2, 8])
+def test_upload_streams_to_disk_and_is_hashed(settings, size_mb, record_property):
+    """Test a multi-megabyte file is streamed to disk in chunks and hashed as it arrives."""
+    content = os.urandom(size_mb * MB)
+
+    upload, elapsed, peak = parse_upload(content)
+
+    assert isinstance(upload, TemporaryUploadedFile)
+    assert upload.size == len(content)
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    with open(upload.temporary_file_path(), "rb") as file:
+        assert file.read() == content
+    # Memory is bounded by the chunk size, not the file size.
+    assert peak < 4 * settings.UPLOAD_CHUNK_SIZE
+    record_property("throughput_mb_s", round(size_mb / elapsed, 1))
+    record_property("peak_memory_kb", peak // 1024)
+
+
+def test_oversized_upload_is_rejected_and_cleaned_up(settings, upload_dirs):
+    """Test a file over the cap aborts parsing and leaves no temporary file behind."""
+    settings.UPLOAD_MAX_FILE_SIZE = 1 * MB
+
+    with pytest.raises(FileTooLarge):
+        parse_upload(os.urandom(2 * MB))
+
+    assert list((upload_dirs / "tmp").iterdir()) == []
+
+
+def test_upload_at_the_cap_is_accepted(settings):
+    """Test a file exactly at the cap is accepted."""
+    settings.UPLOAD_MAX_FILE_SIZE = 1 * MB
+
+    upload, _, _ = parse_upload(os.urandom(1 * MB))
+
+    assert upload.size == 1 * MB
@@ -0,0 +1,81 @@
+"""Tests for header-only image validation."""
+import io
+import time
+
+import pytest
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from license.models import License
+from uploads.fields import ImageFormField
+from uploads.images import inspect_image
+from uploads.serializers import ImageField
+
+
+class CountingBytesIO(io.BytesIO):
+    """A ``BytesIO`` that counts the bytes read from it."""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        """Read and count."""
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def test_inspect_image_reads_only_the_header(make_png):
+    """Test a multi-megabyte image is validated from its first few kilobytes."""
+    file = CountingBytesIO(make_png(1200, 1000))
+
+    assert inspect_image(file) == ("PNG", 1200, 1000)
+    assert file.bytes_read < 64 * 1024
+    assert file.tell() == 0
+
+
+def test_inspect_image_does_not_decode_pixels(make_png_header):
+    """Test an image is accepted from its header even though its pixel data is garbage."""
+    upload = SimpleUploadedFile("photo.png", make_png_header(640, 480))
+
+    assert inspect_image(upload) == ("PNG", 640, 480)
+    with pytest.raises(ValidationError):
+        forms.ImageField().clean(SimpleUploadedFile("photo.png", make_png_header(640, 480)))
+
+
+@pytest.mark.parametrize("content", [b"%PDF-1.7 not an image", b"GIF89a\x01\x00\x01\x00\x00\x00\x00;"])
+def test_inspect_image_rejects_unsupported_files(content):
+    """Test files that are not images in a supported format are rejected."""
+    with pytest.raises(ValidationError) as error:
+        inspect_image(SimpleUploadedFile("photo.png", content))
+
+    assert error.value.code == "invalid_image"
+
+
+def test_inspect_image_rejects_too_many_pixels(settings, make_png_header):
+    """Test images over UPLOAD_IMAGE_MAX_PIXELS are rejected before any pixel is decoded."""
+    settings.UPLOAD_IMAGE_MAX_PIXELS = 1000 * 1000
+
+    with pytest.raises(ValidationError) as error:
+        inspect_image(SimpleUploadedFile("photo.png", make_png_header(1001, 1000)))
+
+    assert error.value.code == "image_too_large"
+
+
+def test_form_and_serializer_fields_validate_headers(make_png, record_property):
+    """Test the form, model and serializer fields use header validation, and compare it with a full verify."""
+    content = make_png(1500, 1500)
+
+    started = time.perf_counter()
+    forms.ImageField().clean(SimpleUploadedFile("photo.png", content))
+    verify_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    upload = ImageFormField().clean(SimpleUploadedFile("photo.png", content, content_type="text/plain"))
+    header_seconds = time.perf_counter() - started
+
+    assert upload.content_type == "image/png"
+    assert isinstance(License._meta.get_field("passport_photo").formfield(), ImageFormField)
+    assert ImageField().run_validation(SimpleUploadedFile("photo.png", content)).size == len(content)
+    record_property("verify_ms", round(verify_seconds * 1000, 2))
+    record_property("header_ms", round(header_seconds * 1000, 2))
@@ -0,0 +1,22 @@
+"""Routes for resized passport photos."""
+from django.urls import re_path
+
+from license.models import License
+from nationalId.models import NationalId
+
+from .views import ImageDerivativeView
+
+PRESET = r"(?P<preset>[a-z0-9_-]+)\.(?P<extension>webp|jpg)"
+
+urlpatterns = [
+    re_path(
+        rf"^licenses/(?P<pk>[^/]+)/photo/{PRESET}/$",
+        ImageDerivativeView.as_view(model=License, lookup_field="licenseId", image_field="passport_photo"),
+        name="license_photo",
+    ),
+    re_path(
+        rf"^national-ids/(?P<pk>[0-9]+)/passport/{PRESET}/$",
+        ImageDerivativeView.as_view(model=NationalId, lookup_field="idNo", image_field="Passport"),
+        name="national_id_passport",
+    ),
+]
@@ -0,0 +1,78 @@
+"""Views serving resized passport photos (see :mod:`uploads.derivatives`)."""
+from django.conf import settings
+from django.http import FileResponse, HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import permissions, status
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .derivatives import (FORMATS, DerivativeError, derivative_name,
+                          open_derivative, source_hash)
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Always pick the first renderer: successful responses are images, whatever ``Accept`` says."""
+
+    def select_parser(self, request, parsers):
+        """Return the first parser."""
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        """Return the first renderer."""
+        return renderers[0], renderers[0].media_type
+
+
+class ImageDerivativeView(APIView):
+    """
+    Serve a resized copy of a stored image.
+
+    Configured per image field through ``as_view(model=..., lookup_field=..., image_field=...)``.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = IgnoreClientContentNegotiation
+    model = None
+    lookup_field = None
+    image_field = None
+
+    def get(self, request, pk, preset, extension):
+        """
+        Return the image of the object ``pk`` resized to ``preset`` and encoded as ``extension``.
+
+        The image is scaled to fit within the preset's size, keeping its aspect
+        ratio. Responses carry a strong ETag derived from the source image and
+        the preset and must be revalidated, so an unchanged image costs a 304.
+
+        Parameters:
+        - pk (path): The license id or national ID number
+        - preset (path): One of IMAGE_DERIVATIVE_PRESETS, e.g. "thumbnail"
+        - extension (path): "webp" or "jpg"
+
+        Returns:
+        - 200 OK: The resized image
+        - 304 Not Modified: If-None-Match matches the current image
+        - 404 Not Found: Unknown object or preset, no image, or an image that cannot be decoded
+        """
+        if preset not in settings.IMAGE_DERIVATIVE_PRESETS:
+            return Response({'error': 'Unknown image preset.'}, status=status.HTTP_404_NOT_FOUND)
+        instance = get_object_or_404(self.model.objects.only(self.image_field), **{self.lookup_field: pk})
+        image = getattr(instance, self.image_field)
+        if not image:
+            return Response({'error': 'No image has been uploaded.'}, status=status.HTTP_404_NOT_FOUND)
+
+        digest = source_hash(image)
+        etag = f'"{derivative_name(digest, preset, extension)}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            try:
+                file = open_derivative(image, digest, preset, extension)
+            except DerivativeError:
+                return Response({'error': 'The image cannot be rendered.'}, status=status.HTTP_404_NOT_FOUND)
+            response = FileResponse(file, content_type=FORMATS[extension][1])
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response